@@ -0,0 +1,114 @@
+"""Inference throughput of SimpleGNN against SimpleCNN on the same jets.
+
+Random jets of particles are turned into the inputs of both networks: 33x33
+pt images of (eta, phi) for SimpleCNN, and (eta, phi, log pt) features with
+the k nearest neighbours in (eta, phi) for SimpleGNN, as a GraphDataset gives.
+Each network predicts all jets after a warm-up call, and the best of several
+runs is reported in jets per second.
+
+    $ python benchmarks/simple_networks.py --n-jets 8192 --particles 100 --k 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from hml.approaches import SimpleCNN, SimpleGNN
+
+IMAGE_SIZE = 33
+IMAGE_RANGE = 1.6
+
+
+def make_jets(n_jets, n_particles, seed=42):
+    rng = np.random.default_rng(seed)
+    counts = rng.integers(n_particles // 4, n_particles + 1, n_jets)
+    masks = np.arange(n_particles) < counts[:, None]
+
+    eta = rng.normal(0, 0.4, (n_jets, n_particles))
+    phi = rng.normal(0, 0.4, (n_jets, n_particles))
+    pt = rng.exponential(10, (n_jets, n_particles)) + 1
+
+    return eta, phi, pt, masks
+
+
+def to_images(eta, phi, pt, masks):
+    bins = np.linspace(-IMAGE_RANGE, IMAGE_RANGE, IMAGE_SIZE + 1)
+    rows = np.digitize(phi, bins) - 1
+    columns = np.digitize(eta, bins) - 1
+    is_inside = masks & (rows >= 0) & (rows < IMAGE_SIZE)
+    is_inside &= (columns >= 0) & (columns < IMAGE_SIZE)
+
+    jets = np.broadcast_to(np.arange(len(eta))[:, None], eta.shape)
+    images = np.zeros((len(eta), IMAGE_SIZE, IMAGE_SIZE, 1), dtype="float32")
+    np.add.at(
+        images,
+        (jets[is_inside], rows[is_inside], columns[is_inside], 0),
+        pt[is_inside],
+    )
+
+    return images
+
+
+def to_graphs(eta, phi, pt, masks, k):
+    features = np.stack([eta, phi, np.log(pt)], axis=-1).astype("float32")
+    features[~masks] = 0
+
+    # Nearest real particles in (eta, phi), padded particles are their own
+    distances = (eta[:, :, None] - eta[:, None]) ** 2
+    distances += (phi[:, :, None] - phi[:, None]) ** 2
+    distances = np.where(masks[:, None, :], distances, np.inf)
+    np.einsum("nii->ni", distances)[...] = np.inf
+    edges = np.argsort(distances, axis=-1)[:, :, :k]
+    own = np.broadcast_to(np.arange(masks.shape[1])[None, :, None], edges.shape)
+    edges = np.where(masks[:, :, None], edges, own).astype("int32")
+
+    return [features, masks.astype("float32"), edges]
+
+
+def throughput(model, inputs, n_jets, batch_size, repeats):
+    model.predict(inputs, batch_size=batch_size, verbose=0)
+
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(inputs, batch_size=batch_size, verbose=0)
+        best = min(best, time.perf_counter() - start)
+
+    return n_jets / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-jets", type=int, default=8192)
+    parser.add_argument("--particles", type=int, default=100)
+    parser.add_argument("--k", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=2048)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    eta, phi, pt, masks = make_jets(args.n_jets, args.particles)
+    images = to_images(eta, phi, pt, masks)
+    graphs = to_graphs(eta, phi, pt, masks, args.k)
+
+    models = {
+        "SimpleCNN": (SimpleCNN(input_shape=images.shape[1:]), images),
+        "SimpleGNN": (SimpleGNN(input_shape=graphs[0].shape[1:], k=args.k), graphs),
+        "SimpleGNN, dynamic": (
+            SimpleGNN(input_shape=graphs[0].shape[1:], k=args.k, dynamic=True),
+            graphs,
+        ),
+    }
+
+    print(f"{args.n_jets} jets, {args.particles} particles, k={args.k}")
+    for name, (model, inputs) in models.items():
+        jets_per_second = throughput(
+            model, inputs, args.n_jets, args.batch_size, args.repeats
+        )
+        print(f"{name:<20} {jets_per_second:>10.0f} jets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,47 @@
-import fastjet
-
-from hml import (
-    approaches,
-    datasets,
-    generators,
-    metrics,
-    observables,
-    operations,
-    physics_objects,
-    representations,
-)
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from hml import (
+        approaches,
+        config,
+        datasets,
+        generators,
+        metrics,
+        observables,
+        operations,
+        physics_objects,
+        representations,
+    )
 
 __version__ = "0.4.3"
+
+__all__ = [
+    "__version__",
+    "approaches",
+    "config",
+    "datasets",
+    "generators",
+    "metrics",
+    "observables",
+    "operations",
+    "physics_objects",
+    "representations",
+]
+
+# Subpackages are imported on first access (PEP 562) so that `import hml` does
+# not pull in keras, sklearn or fastjet when only a few of them are needed.
+SUBPACKAGES = __all__[1:]
+
+
+def __getattr__(name):
+    if name in SUBPACKAGES:
+        return import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(SUBPACKAGES))
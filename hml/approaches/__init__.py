@@ -5,7 +5,7 @@ from keras.saving import load_model
 
 from .cuts import Cut, CutAndCount, CutLayer
 from .networks import SimpleCNN, SimpleGNN, SimpleMLP
-from .trees import GradientBoostedDecisionTree
+from .trees import GradientBoostedDecisionTree, TreeEnsemble
 
 
 def load_approach(filepath):
@@ -18,5 +18,8 @@ def load_approach(filepath):
         with open(filepath, "rb") as f:
             return pickle.load(f)
 
+    elif filepath.suffix == ".npz":
+        return TreeEnsemble.load(filepath)
+
     else:
         raise ValueError("Unknown file format")
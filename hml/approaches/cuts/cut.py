@@ -4,7 +4,10 @@ import re
 
 import awkward as ak
 
-from hml.observables import parse_observable
+from hml.observables import Planner, parse_observable
+
+# Any word that is not a number, e.g. "Jet0.Pt" in "Jet0.Pt > 50"
+OBSERVABLE_PATTERN = re.compile(r"\b(?!\d+\b)(?!\d*\.\d+\b)\S+\b")
 
 
 class Cut:
@@ -33,10 +36,9 @@ class Cut:
         cuts = [c.strip() for cut in cuts for c in cut]
         cuts = [cut.replace("(", "").replace(")", "") for cut in cuts]
 
-        obs_pattern = r"\b(?!\d+\b)(?!\d*\.\d+\b)\S+\b"
         cuts_dict = {}
         for cut in cuts:
-            all_obs = re.findall(obs_pattern, cut)
+            all_obs = OBSERVABLE_PATTERN.findall(cut)
             # for the case value1 < obs < value2
             if len(all_obs) == 1 and "" not in cut.split(all_obs[0]):
                 obs = all_obs[0]
@@ -49,22 +51,30 @@ class Cut:
 
         self._cuts_dict = cuts_dict  # single expression and its obs name
         self._observables_dict = {}
+        unique = {}
         for all_obs in cuts_dict.values():
             for obs in all_obs:
-                self._observables_dict[obs] = parse_observable(obs)
+                if obs not in self._observables_dict:
+                    observable = parse_observable(obs)
+                    # Names of the same observable share one instance
+                    observable = unique.setdefault(observable, observable)
+                    self._observables_dict[obs] = observable
         self._expr = expr
 
     def read(self, events):
-        for obs in self._observables_dict.values():
-            obs.read(events)
+        unique = list(dict.fromkeys(self._observables_dict.values()))
+        Planner(unique).read(events)
         observables_dict = self._observables_dict
+        # Missing objects are None and fail every comparison, including "!=",
+        # while NaN values are kept as they are
+        values = {k: v.value for k, v in observables_dict.items()}
 
         cuts_results = {}
         for cut, all_obs in self._cuts_dict.items():
             temp_cut = cut
             for obs in all_obs:
-                temp_cut = temp_cut.replace(obs, f"observables_dict['{obs}'].value")
-            result = eval(temp_cut)
+                temp_cut = temp_cut.replace(obs, f"values['{obs}']")
+            result = eval(temp_cut, {"values": values})
             cuts_results[cut] = result
 
         # Validate the type
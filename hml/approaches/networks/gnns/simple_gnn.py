@@ -1,2 +1,137 @@
-class SimpleGNN:
-    ...
+from __future__ import annotations
+
+import keras
+from keras import Model, ops
+from keras.layers import Dense, Input, Layer
+
+
+@keras.saving.register_keras_serializable()
+class EdgeConv(Layer):
+    """Edge convolution over a fixed number of neighbours per particle.
+
+    The neighbours of each particle are gathered from dense tensors, which
+    keeps every operation a regular batched one. An edge from particle i to
+    its neighbour j has the features relu(phi(x_i) + theta(x_j - x_i)). Both
+    maps are linear, so they are applied to the particles before gathering,
+    and the edges only cost an addition. The edges are averaged over the
+    neighbours and passed through a dense layer per particle.
+
+    Parameters
+    ----------
+    units : int
+        Number of output features.
+    k : int, optional
+        Number of neighbours to find in the space of the input features. When
+        None, the neighbours are given to `call`, e.g. those of a Graph.
+    """
+
+    def __init__(self, units, k=None, **kwargs):
+        super().__init__(**kwargs)
+        self.units = units
+        self.k = k
+        self.phi = Dense(units)
+        self.theta = Dense(units, use_bias=False)
+        self.dense = Dense(units)
+        self.shortcut = Dense(units, use_bias=False)
+
+    def call(self, x, masks, edges=None):
+        if edges is None:
+            edges = self.knn(x, masks)
+
+        theta = self.theta(x)
+        centers = self.phi(x) - theta
+
+        # Gather from all particles of the batch, a plain gather of rows
+        batch_size, n_particles, k = ops.shape(edges)
+        offsets = ops.arange(batch_size, dtype=edges.dtype) * n_particles
+        indices = edges + ops.reshape(offsets, (-1, 1, 1))
+        theta = ops.reshape(theta, (-1, self.units))
+        neighbours = ops.take(theta, ops.reshape(indices, (-1,)), axis=0)
+        neighbours = ops.reshape(neighbours, (-1, n_particles, k, self.units))
+
+        h = ops.relu(ops.expand_dims(centers, 2) + neighbours)
+        h = self.dense(ops.mean(h, axis=2)) + self.shortcut(x)
+
+        return ops.relu(h) * ops.expand_dims(masks, -1)
+
+    def knn(self, x, masks):
+        # Squared distances of all pairs, with padded particles out of reach
+        squares = ops.sum(x**2, axis=-1, keepdims=True)
+        distances = squares - 2 * ops.matmul(x, ops.transpose(x, (0, 2, 1)))
+        distances = distances + ops.transpose(squares, (0, 2, 1))
+        far = (1 - ops.expand_dims(masks, 1)) * 1e9
+        distances = distances + far + ops.eye(ops.shape(x)[1]) * 1e9
+
+        _, edges = ops.top_k(-distances, self.k)
+        return edges
+
+    def get_config(self):
+        base_config = super().get_config()
+        config = {"units": self.units, "k": self.k}
+        return {**base_config, **config}
+
+
+@keras.saving.register_keras_serializable()
+class SimpleGNN(Model):
+    """A small EdgeConv network on padded point clouds.
+
+    The inputs are the samples, masks and edges of a GraphDataset, i.e.
+    features of shape (max_particles, n_features), masks of shape
+    (max_particles,) and the indices of k neighbours of shape (max_particles,
+    k). Both convolutions use the given neighbours, unless the second one finds
+    them in the learned feature space.
+
+    Parameters
+    ----------
+    input_shape : tuple
+        Shape of the features of one sample, (max_particles, n_features).
+    k : int
+        Number of neighbours of each particle.
+    dynamic : bool
+        Find the neighbours of the second convolution in the learned feature
+        space, as in DGCNN, which sorts the distances of all pairs and costs
+        about half of the throughput.
+    """
+
+    def __init__(self, input_shape, k=16, dynamic=False, name="simple_gnn", **kwargs):
+        super().__init__(name=name, **kwargs)
+        self.input_shape = input_shape
+        self.k = k
+        self.dynamic = dynamic
+        self.edge_conv1 = EdgeConv(32)
+        self.edge_conv2 = EdgeConv(64, k=k if dynamic else None)
+        self.dense1 = Dense(2, activation="softmax")
+
+        n_particles = input_shape[0]
+        self.call(
+            [
+                Input(shape=input_shape),
+                Input(shape=(n_particles,)),
+                Input(shape=(n_particles, k), dtype="int32"),
+            ]
+        )
+
+    def call(self, inputs):
+        x, masks, edges = inputs
+        masks = ops.cast(masks, x.dtype)
+
+        x = self.edge_conv1(x, masks, edges)
+        x = self.edge_conv2(x, masks, None if self.dynamic else edges)
+
+        # Average over the real particles only
+        counts = ops.maximum(ops.sum(masks, axis=1, keepdims=True), 1)
+        x = ops.sum(x, axis=1) / counts
+        return self.dense1(x)
+
+    def build_from_config(self, config):
+        # Built in __init__, the default cannot build from a list of inputs
+        pass
+
+    def get_config(self):
+        base_config = super().get_config()
+        config = {
+            "input_shape": self.input_shape,
+            "k": self.k,
+            "dynamic": self.dynamic,
+        }
+        return {**base_config, **config}
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from inspect import signature
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Literal, NamedTuple
 
 import dill as pickle
 import keras
+import numpy as np
 from numpy import ndarray
 from numpy.random import RandomState
+from scipy.special import expit, logit
 from sklearn.base import BaseEstimator
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier
+from sklearn.metrics import log_loss
+from sklearn.utils.extmath import softmax
+from threadpoolctl import threadpool_limits
+
+from .tree_ensemble import TreeEnsemble
 
 KERAS_METRICS = {
     "binary_accuracy": keras.metrics.BinaryAccuracy,
@@ -64,6 +73,10 @@ class GradientBoostedDecisionTree(GradientBoostingClassifier):
         n_iter_no_change: int | None = None,
         tol: float = 0.0001,
         ccp_alpha: float = 0,
+        backend: Literal["exact", "hist"] = "exact",
+        max_bins: int = 255,
+        l2_regularization: float = 0,
+        n_threads: int | None = None,
     ) -> None:
         super().__init__(
             loss=loss,
@@ -89,6 +102,10 @@ class GradientBoostedDecisionTree(GradientBoostingClassifier):
         )
         self.name = name
         self.metrics = []
+        self.backend = backend
+        self.max_bins = max_bins
+        self.l2_regularization = l2_regularization
+        self.n_threads = n_threads
 
     def compile(self, optimizer=None, loss="log_loss", metrics=None):
         self.optimizer = optimizer
@@ -134,19 +151,32 @@ class GradientBoostedDecisionTree(GradientBoostingClassifier):
             else:
                 raise ValueError(f"Unknown metric: {metric}")
 
+        has_validation = validation_split != 0.0 or validation_data is not None
+        if self.backend == "hist":
+            y = y if not is_categorical else y.argmax(axis=1)
+            self._fit_hist(
+                x, y, sample_weight, has_validation, is_categorical, pb, history
+            )
+            return history
+
+        elif self.backend != "exact":
+            raise ValueError(f"Unknown backend: {self.backend}")
+
+        # Raw predictions on the validation set are cached and updated with only
+        # the newest stage of trees, so monitoring costs O(n_val) per iteration
+        if has_validation:
+            x_val = np.ascontiguousarray(self.x_val, dtype=np.float32)
+            y_val = self.y_val if self.y_val.ndim == 1 else self.y_val.argmax(axis=1)
+        self._val_raw_predictions = None
+
         def _monitor(i, model, local_variables):
             y_true = local_variables["y"]
             raw_pred = local_variables["raw_predictions"]
 
-            if hasattr(model._loss, "predict_proba"):
-                # This works in 1.4.2
-                y_prob = model._loss.predict_proba(raw_pred)
-            else:
-                # This works in 1.3.0
-                y_prob = model._loss._raw_prediction_to_proba(raw_pred)
+            y_prob = _raw_to_proba(model, raw_pred)
             sample_weight = local_variables["sample_weight"]
 
-            loss = model._loss(y_true, raw_pred, sample_weight)
+            loss = _loss(model, y_true, raw_pred, y_prob, sample_weight)
 
             y_true = (
                 y_true if not is_categorical else keras.utils.to_categorical(y_true)
@@ -154,45 +184,33 @@ class GradientBoostedDecisionTree(GradientBoostingClassifier):
 
             # Train metrics
             train_values = [("loss", loss)]
-            history.history["loss"].append(loss)
-            for name, i in self.metric_pairs:
-                i.reset_state()
-                i.update_state(y_true, y_prob, sample_weight=sample_weight)
-                train_values.append((name, i.result().numpy()))
-                history.history[name].append(i.result().numpy())
+            train_values += self._evaluate_metrics(y_true, y_prob, sample_weight)
 
             # Validation metrics
             val_values = []
-            if validation_split != 0.0 or validation_data is not None:
-                # Reshape y_val and change dtype to match the previous one
-                y_true = (
-                    self.y_val if self.y_val.ndim == 1 else self.y_val.argmax(axis=1)
-                ).astype(y_true.dtype)  # (n_samples,)
-                raw_pred = next(model._staged_raw_predict(self.x_val))  # (n_samples, 1)
-                if hasattr(model._loss, "predict_proba"):
-                    # This works in 1.4.2
-                    y_prob = model._loss.predict_proba(raw_pred)
-                else:
-                    # This works in 1.3.0
-                    y_prob = model._loss._raw_prediction_to_proba(raw_pred)
-                # y_prob = model._loss._raw_prediction_to_proba(
-                #     raw_pred
-                # )  # (n_samples, n_classes)
+            if has_validation:
+                if self._val_raw_predictions is None:
+                    # Stages before i exist only when warm starting
+                    self._val_raw_predictions = _init_raw_predictions(model, x_val)
+                    for stage in range(i):
+                        _add_stage(model, stage, x_val, self._val_raw_predictions)
+
+                _add_stage(model, i, x_val, self._val_raw_predictions)
+                raw_pred = self._val_raw_predictions  # (n_samples, n_trees)
+                y_prob = _raw_to_proba(model, raw_pred)
 
                 # ! sample_weight: (n_samples x (1 - validation_fraction),)
                 # here the validation_fraction is a parameter of the parent class
-                # print(y_true.shape, raw_pred.shape, y_prob.shape, sample_weight.shape)
-                val_loss = model._loss(y_true, raw_pred)  # , sample_weight)
+                val_loss = _loss(model, y_val, raw_pred, y_prob)
                 val_values.append(("val_loss", val_loss))
-                history.history["val_loss"].append(val_loss)
-
-                for name, i in self.metric_pairs:
-                    i.reset_state()
-                    i.update_state(self.y_val, y_prob)
-                    val_values.append(("val_" + name, i.result().numpy()))
-                    history.history["val_" + name].append(i.result().numpy())
+                val_values += [
+                    ("val_" + name, value)
+                    for name, value in self._evaluate_metrics(self.y_val, y_prob)
+                ]
 
-            pb.add(1, values=[("loss", loss)] + train_values + val_values)
+            for name, value in train_values + val_values:
+                history.history[name].append(value)
+            pb.add(1, values=train_values + val_values)
 
             return False
 
@@ -200,9 +218,116 @@ class GradientBoostedDecisionTree(GradientBoostingClassifier):
         _ = super().fit(x, y, sample_weight, _monitor)
         return history
 
+    def _fit_hist(
+        self,
+        x: ndarray,
+        y: ndarray,
+        sample_weight: ndarray | None,
+        has_validation: bool,
+        is_categorical: bool,
+        pb: keras.utils.Progbar,
+        history: History,
+    ) -> None:
+        # The histogram-based estimator bins the features once and grows trees
+        # with OpenMP threads, which scales to millions of events.
+        if self.loss not in ["log_loss", "deviance"]:
+            raise ValueError(f"Loss {self.loss} is not supported by the hist backend")
+
+        # The hist backend only takes a number of samples, so a fraction is
+        # converted the same way as the exact backend does
+        min_samples_leaf = self.min_samples_leaf
+        if isinstance(min_samples_leaf, float):
+            if not 0 < min_samples_leaf < 1:
+                raise ValueError(
+                    "min_samples_leaf should be an integer or a fraction in (0, 1), "
+                    f"got {min_samples_leaf}"
+                )
+            min_samples_leaf = max(1, int(np.ceil(min_samples_leaf * len(x))))
+
+        self.estimator_ = HistGradientBoostingClassifier(
+            learning_rate=self.learning_rate,
+            max_iter=self.n_estimators,
+            max_leaf_nodes=self.max_leaf_nodes,
+            max_depth=self.max_depth,
+            min_samples_leaf=min_samples_leaf,
+            l2_regularization=self.l2_regularization,
+            max_bins=self.max_bins,
+            early_stopping=self.n_iter_no_change is not None,
+            validation_fraction=self.validation_fraction,
+            n_iter_no_change=self.n_iter_no_change or 10,
+            tol=self.tol,
+            random_state=self.random_state,
+        )
+
+        fit_kwargs = {}
+        if has_validation:
+            y_val = self.y_val if self.y_val.ndim == 1 else self.y_val.argmax(axis=1)
+            # Early stopping on the given validation data needs sklearn >= 1.7,
+            # otherwise it uses an internal split of `validation_fraction`.
+            if (
+                self.estimator_.early_stopping
+                and "X_val" in signature(HistGradientBoostingClassifier.fit).parameters
+            ):
+                fit_kwargs = {"X_val": self.x_val, "y_val": y_val}
+
+        with threadpool_limits(limits=self.n_threads, user_api="openmp"):
+            self.estimator_.fit(x, y, sample_weight, **fit_kwargs)
+
+            # Replay the boosting stages to record the history
+            classes = self.estimator_.classes_
+            y_true = y if not is_categorical else keras.utils.to_categorical(y)
+            train_stages = self.estimator_.staged_predict_proba(x)
+            val_stages = (
+                self.estimator_.staged_predict_proba(self.x_val)
+                if has_validation
+                else repeat(None)
+            )
+            pb.target = self.estimator_.n_iter_
+
+            for y_prob, val_prob in zip(train_stages, val_stages):
+                loss = log_loss(y, y_prob, sample_weight=sample_weight, labels=classes)
+                values = [("loss", loss)]
+                values += self._evaluate_metrics(y_true, y_prob, sample_weight)
+
+                if val_prob is not None:
+                    val_loss = log_loss(y_val, val_prob, labels=classes)
+                    values.append(("val_loss", val_loss))
+                    values += [
+                        ("val_" + name, value)
+                        for name, value in self._evaluate_metrics(self.y_val, val_prob)
+                    ]
+
+                for name, value in values:
+                    history.history[name].append(value)
+                pb.add(1, values=values)
+
+    def _evaluate_metrics(
+        self,
+        y_true: ndarray,
+        y_prob: ndarray,
+        sample_weight: ndarray | None = None,
+    ) -> list[tuple[str, Any]]:
+        values = []
+        for name, metric in self.metric_pairs:
+            metric.reset_state()
+            metric.update_state(y_true, y_prob, sample_weight=sample_weight)
+            values.append((name, keras.ops.convert_to_numpy(metric.result())))
+
+        return values
+
     def predict(self, x: ndarray, **kwargs) -> ndarray:
+        if self.backend == "hist":
+            return self.estimator_.predict_proba(x)
+
         return super().predict_proba(x)
 
+    def export(self, filepath=None, overwrite=True) -> TreeEnsemble:
+        ensemble = TreeEnsemble.from_model(self)
+        if filepath is not None:
+            ensemble.save(filepath, overwrite=overwrite)
+
+        return ensemble
+
     def summary(self, deep=False, **kwargs):
         output = [f'Model: "{self.name}"']
         for name, value in self.get_params(deep=deep, **kwargs).items():
@@ -229,3 +354,49 @@ class GradientBoostedDecisionTree(GradientBoostingClassifier):
                 pickle.dump(self, f)
             else:
                 raise ValueError(f"save_format {save_format} not supported")
+
+
+def _init_raw_predictions(model, x):
+    # The same as the private _raw_predict_init of sklearn, from the public
+    # init_ estimator and the link functions of the losses
+    n_trees = model.estimators_.shape[1]
+    if model.init_ == "zero":
+        return np.zeros((len(x), n_trees), dtype=np.float64)
+
+    eps = np.finfo(np.float64).eps
+    proba = np.clip(model.init_.predict_proba(x), eps, 1 - eps, dtype=np.float64)
+    if n_trees > 1:
+        # Symmetric multinomial logit, centered over the classes
+        log_proba = np.log(proba)
+        return log_proba - log_proba.mean(axis=1, keepdims=True)
+
+    raw_predictions = logit(proba[:, 1:])
+    if model.loss == "exponential":
+        raw_predictions /= 2
+    return raw_predictions
+
+
+def _raw_to_proba(model, raw_predictions):
+    if raw_predictions.shape[1] > 1:
+        return softmax(raw_predictions)
+
+    factor = 2 if model.loss == "exponential" else 1
+    proba = expit(factor * raw_predictions[:, 0])
+    return np.stack([1 - proba, proba], axis=1)
+
+
+def _loss(model, y, raw_predictions, proba, sample_weight=None):
+    # The training loss of sklearn, averaged over the sample weights
+    if model.loss == "exponential":
+        losses = np.exp(-(2 * y - 1) * raw_predictions[:, 0])
+        return np.average(losses, weights=sample_weight)
+
+    labels = np.arange(proba.shape[1])
+    return log_loss(y, proba, sample_weight=sample_weight, labels=labels)
+
+
+def _add_stage(model, stage, x, raw_predictions):
+    # The same as the private predict_stage of sklearn, through the public
+    # predict of the regression trees of one stage, one per class
+    for k, tree in enumerate(model.estimators_[stage]):
+        raw_predictions[:, k] += model.learning_rate * tree.predict(x)
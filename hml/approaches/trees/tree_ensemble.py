@@ -0,0 +1,485 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numba as nb
+import numpy as np
+from numpy import ndarray
+from scipy.special import expit
+from sklearn.utils.extmath import softmax
+
+LOSSES = {
+    "HalfBinomialLoss": "binomial",
+    "BinomialDeviance": "binomial",
+    "HalfMultinomialLoss": "multinomial",
+    "MultinomialDeviance": "multinomial",
+    "ExponentialLoss": "exponential",
+}
+
+
+# Nodes are padded to 32 bytes so that each one sits in a single cache line
+NODE_DTYPE = np.dtype(
+    {
+        "names": ["threshold", "value", "left", "right", "feature", "missing_left"],
+        "formats": [np.float64, np.float64, np.uint32, np.uint32, np.uint32, np.uint8],
+        "offsets": [0, 8, 16, 20, 24, 28],
+        "itemsize": 32,
+    }
+)
+
+# Trees up to this depth are padded to complete binary trees and evaluated
+# without branches, deeper ones are traversed node by node
+MAX_COMPLETE_DEPTH = 5
+
+
+class TreeEnsemble:
+    """A flat array-of-nodes export of a GradientBoostedDecisionTree.
+
+    All trees are stored in one record array of `NODE_DTYPE` nodes. Children
+    indices are global, and leaves have `left == 0` since the first node is the
+    root of the first tree and never a child. Trees are ordered by boosting
+    stage and then by class, and `tree_class` records the output column each
+    tree adds to.
+
+    The raw predictions are accumulated in the same order and precision as in
+    sklearn, so the probabilities are bit-identical to `model.predict`.
+
+    Shallow trees, e.g. those of depth 3 of the exact backend, are also padded
+    to complete binary trees for prediction. Every node of a complete tree is
+    evaluated for a block of samples at once, which vectorizes, so depth 3 is
+    about 10x faster than sklearn on one core, depth 5 about 2x. The cost
+    doubles with each level, so trees deeper than `MAX_COMPLETE_DEPTH`, e.g.
+    those of the hist backend without `max_depth`, are traversed node by node
+    instead, which is only about 1.3x faster than sklearn on one core. Both are
+    parallel over samples.
+    """
+
+    ARRAYS = ("nodes", "roots", "tree_class", "init", "classes")
+
+    def __init__(
+        self,
+        nodes: ndarray,
+        roots: ndarray,
+        tree_class: ndarray,
+        init: ndarray,
+        classes: ndarray,
+        scale: float = 1.0,
+        loss: str = "binomial",
+        input_dtype: str = "float32",
+        name: str = "tree_ensemble",
+    ) -> None:
+        self.nodes = np.ascontiguousarray(nodes, dtype=NODE_DTYPE)
+        self.roots = np.ascontiguousarray(roots, dtype=np.uint32)
+        self.tree_class = np.ascontiguousarray(tree_class, dtype=np.uint32)
+        self.init = np.ascontiguousarray(init, dtype=np.float64)
+        self.classes = np.asarray(classes)
+        self.scale = scale
+        self.loss = loss
+        self.input_dtype = input_dtype
+        self.name = name
+        self._complete_trees = _complete_trees(self.nodes, self.roots)
+
+    @classmethod
+    def from_model(cls, model) -> TreeEnsemble:
+        """Export a fitted GradientBoostedDecisionTree of either backend."""
+        if getattr(model, "backend", "exact") == "hist":
+            return cls._from_hist(model)
+
+        return cls._from_exact(model)
+
+    @classmethod
+    def _from_exact(cls, model) -> TreeEnsemble:
+        if model.init not in [None, "zero"]:
+            raise ValueError("Only the default init estimator can be exported")
+
+        # The default init estimator predicts the same raw value for all samples
+        dummy = np.zeros((1, model.n_features_in_), dtype=np.float32)
+        init = model._raw_predict_init(dummy)[0]
+
+        trees = [
+            (estimator.tree_, k)
+            for stage in model.estimators_
+            for k, estimator in enumerate(stage)
+        ]
+
+        nodes = []
+        for tree, _ in trees:
+            missing_left = getattr(
+                tree, "missing_go_to_left", np.zeros(tree.node_count, np.uint8)
+            )
+            nodes.append(
+                (
+                    tree.feature,
+                    tree.threshold,
+                    tree.children_left,
+                    tree.children_right,
+                    tree.value[:, 0, 0],
+                    missing_left,
+                    tree.children_left == -1,
+                )
+            )
+
+        return cls(
+            *_concatenate_nodes(nodes),
+            tree_class=[k for _, k in trees],
+            init=init,
+            classes=model.classes_,
+            scale=model.learning_rate,
+            loss=LOSSES[model._loss.__class__.__name__],
+            input_dtype="float32",
+            name=model.name,
+        )
+
+    @classmethod
+    def _from_hist(cls, model) -> TreeEnsemble:
+        estimator = model.estimator_
+        trees = [
+            (predictor, k)
+            for stage in estimator._predictors
+            for k, predictor in enumerate(stage)
+        ]
+
+        nodes = []
+        for predictor, _ in trees:
+            tree = predictor.nodes
+            if np.any(tree["is_categorical"]):
+                raise ValueError("Categorical features can not be exported")
+
+            nodes.append(
+                (
+                    tree["feature_idx"],
+                    tree["num_threshold"],
+                    tree["left"],
+                    tree["right"],
+                    tree["value"],
+                    tree["missing_go_to_left"],
+                    tree["is_leaf"].astype(bool),
+                )
+            )
+
+        return cls(
+            *_concatenate_nodes(nodes),
+            tree_class=[k for _, k in trees],
+            init=estimator._baseline_prediction.ravel(),
+            classes=estimator.classes_,
+            scale=1.0,
+            loss=LOSSES[estimator._loss.__class__.__name__],
+            input_dtype="float64",
+            name=model.name,
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def decision_function(self, x: ndarray) -> ndarray:
+        x = np.ascontiguousarray(x, dtype=self.input_dtype)
+        raw_predictions = np.empty((len(x), len(self.init)), dtype=np.float64)
+
+        if self._complete_trees is not None:
+            predict_complete_trees(
+                x,
+                *self._complete_trees,
+                self.tree_class,
+                self.init,
+                self.scale,
+                bool(np.isnan(x).any()),
+                raw_predictions,
+            )
+            return raw_predictions
+
+        predict_tree_ensemble(
+            x,
+            self.nodes,
+            self.roots,
+            self.tree_class,
+            self.init,
+            self.scale,
+            bool(np.isnan(x).any()),
+            raw_predictions,
+        )
+
+        return raw_predictions
+
+    def predict(self, x: ndarray, **kwargs) -> ndarray:
+        raw_predictions = self.decision_function(x)
+
+        if self.loss == "multinomial":
+            return softmax(raw_predictions)
+
+        raw_predictions = raw_predictions[:, 0]
+        if self.loss == "exponential":
+            raw_predictions = 2 * raw_predictions
+
+        proba = np.empty((len(raw_predictions), 2), dtype=raw_predictions.dtype)
+        proba[:, 1] = expit(raw_predictions)
+        proba[:, 0] = 1 - proba[:, 1]
+        return proba
+
+    @property
+    def config(self) -> dict:
+        return {
+            "name": self.name,
+            "scale": self.scale,
+            "loss": self.loss,
+            "input_dtype": self.input_dtype,
+        }
+
+    def save(self, filepath, overwrite=True):
+        filepath = Path(filepath).with_suffix(".npz")
+        if not overwrite and filepath.exists():
+            raise FileExistsError(f"File already exists: {filepath}")
+
+        with filepath.open("wb") as f:
+            np.savez(
+                f,
+                configs=json.dumps(self.config),
+                **{i: getattr(self, i) for i in self.ARRAYS},
+            )
+
+    @classmethod
+    def load(cls, filepath) -> TreeEnsemble:
+        with np.load(filepath) as data:
+            config = json.loads(str(data["configs"]))
+            arrays = {i: data[i] for i in cls.ARRAYS}
+
+        return cls(**arrays, **config)
+
+
+def _concatenate_nodes(trees):
+    roots = np.cumsum([0] + [len(i[0]) for i in trees[:-1]])
+    nodes = np.zeros(sum(len(i[0]) for i in trees), dtype=NODE_DTYPE)
+
+    for root, (feature, threshold, left, right, value, missing, is_leaf) in zip(
+        roots, trees
+    ):
+        tree = nodes[root : root + len(feature)]
+        tree["feature"] = np.where(is_leaf, 0, feature)
+        tree["threshold"] = threshold
+        tree["left"] = np.where(is_leaf, 0, left + root)
+        tree["right"] = np.where(is_leaf, 0, right + root)
+        tree["value"] = value
+        tree["missing_left"] = missing
+
+    return nodes, roots
+
+
+def _complete_trees(nodes, roots):
+    # Depth of the deepest tree, without padding
+    depth = 0
+    current = roots.astype(np.intp)
+    while True:
+        current = current[nodes["left"][current] != 0]
+        if len(current) == 0:
+            break
+
+        depth += 1
+        if depth > MAX_COMPLETE_DEPTH:
+            return None
+
+        current = np.concatenate([nodes["left"][current], nodes["right"][current]])
+
+    # Node p of a level has the children 2p + 1 and 2p + 2 of the next level.
+    # Leaves above the last level are repeated as both of their children, so
+    # either branch of their padded nodes gives the same value.
+    depth = max(depth, 1)
+    n_internal = 2**depth - 1
+    feature = np.zeros((len(roots), n_internal), dtype=np.intp)
+    threshold = np.zeros((len(roots), n_internal), dtype=np.float64)
+    missing_right = np.zeros((len(roots), n_internal), dtype=np.int64)
+
+    current = roots.astype(np.intp)[:, None]
+    for level in range(depth):
+        start, stop = 2**level - 1, 2 ** (level + 1) - 1
+        node = nodes[current]
+        is_leaf = node["left"] == 0
+
+        feature[:, start:stop] = np.where(is_leaf, 0, node["feature"])
+        threshold[:, start:stop] = np.where(is_leaf, 0, node["threshold"])
+        missing_right[:, start:stop] = np.where(is_leaf, 0, 1 - node["missing_left"])
+
+        left = np.where(is_leaf, current, node["left"])
+        right = np.where(is_leaf, current, node["right"])
+        current = np.stack([left, right], axis=-1).reshape(len(roots), -1)
+
+    # Leaf values are selected by their bits, which keeps them exact
+    leaves = np.ascontiguousarray(nodes["value"][current]).view(np.int64)
+
+    return feature, threshold, missing_right, leaves
+
+
+@nb.njit(parallel=True, cache=True)
+def predict_tree_ensemble(
+    x, nodes, roots, tree_class, init, scale, has_nan, out
+):  # pragma: no cover
+    """Accumulate raw predictions of all trees, one sample per thread.
+
+    The trees of each sample are summed sequentially in the stage order, which
+    is the same order as in sklearn, so the results are bit-identical. Missing
+    values are only checked when `has_nan` is set, which keeps the common
+    traversal free of extra branches.
+    """
+    for i in nb.prange(x.shape[0]):
+        for k in range(init.shape[0]):
+            out[i, k] = init[k]
+
+        for t in range(roots.shape[0]):
+            node = nodes[roots[t]]
+
+            if has_nan:
+                while node.left != 0:
+                    x_value = x[i, node.feature]
+                    if np.isnan(x_value):
+                        go_left = node.missing_left == 1
+                    else:
+                        go_left = x_value <= node.threshold
+                    node = nodes[node.left] if go_left else nodes[node.right]
+
+            else:
+                while node.left != 0:
+                    if x[i, node.feature] <= node.threshold:
+                        node = nodes[node.left]
+                    else:
+                        node = nodes[node.right]
+
+            out[i, tree_class[t]] += scale * node.value
+
+
+@nb.njit(parallel=True, cache=True)
+def predict_complete_trees(
+    x, feature, threshold, missing_right, leaves, tree_class, init, scale, has_nan, out
+):  # pragma: no cover
+    """Accumulate raw predictions of complete trees, one block per thread.
+
+    Each block is predicted by `predict_complete_blocks`, which is compiled on
+    its own since the loops of a parallel function do not vectorize.
+    """
+    n_blocks = _n_blocks(x.shape[0], feature.shape[1])
+    for block in nb.prange(n_blocks):
+        predict_complete_blocks(
+            x,
+            feature,
+            threshold,
+            missing_right,
+            leaves,
+            tree_class,
+            init,
+            scale,
+            has_nan,
+            out,
+            block,
+            block + 1,
+        )
+
+
+@nb.njit(cache=True)
+def _block_size(n_internal):  # pragma: no cover
+    # The values of all nodes of a block fit in the L1 cache
+    return min(128, 4096 // n_internal)
+
+
+@nb.njit(cache=True)
+def _n_blocks(n_samples, n_internal):  # pragma: no cover
+    block_size = _block_size(n_internal)
+    return (n_samples + block_size - 1) // block_size
+
+
+@nb.njit(cache=True)
+def predict_complete_blocks(
+    x,
+    feature,
+    threshold,
+    missing_right,
+    leaves,
+    tree_class,
+    init,
+    scale,
+    has_nan,
+    out,
+    first_block,
+    last_block,
+):  # pragma: no cover
+    """Accumulate raw predictions of complete trees for a range of blocks.
+
+    Samples are transposed into blocks, so that a node compares a contiguous
+    row of feature values. The value of each node, starting from the leaves, is
+    the value of its left or right child selected by the comparison with bit
+    masks, so there are no branches and all loops over a block vectorize. The
+    trees of each sample are still summed in the stage order of sklearn.
+    """
+    n_samples, n_features = x.shape
+    n_trees, n_internal = feature.shape
+    n_classes = init.shape[0]
+    first_leaf_parent = (n_internal - 1) // 2
+    block_size = _block_size(n_internal)
+
+    for block in range(first_block, last_block):
+        start = block * block_size
+        size = min(block_size, n_samples - start)
+
+        # Buffers of each block are allocated in the loop, which lets the
+        # compiler vectorize the loops over them
+        xt = np.zeros((n_features, block_size), dtype=x.dtype)
+        values = np.empty((n_internal, block_size), dtype=np.int64)
+        root_values = values[0].view(np.float64)
+        raw = np.empty((n_classes, block_size), dtype=np.float64)
+
+        for j in range(size):
+            for f in range(n_features):
+                xt[f, j] = x[start + j, f]
+        for k in range(n_classes):
+            for j in range(block_size):
+                raw[k, j] = init[k]
+
+        for t in range(n_trees):
+            for p in range(n_internal - 1, -1, -1):
+                f = feature[t, p]
+                h = threshold[t, p]
+                m = missing_right[t, p]
+
+                if p >= first_leaf_parent:
+                    c = 2 * p + 1 - n_internal
+                    left = leaves[t, c]
+                    diff = left ^ leaves[t, c + 1]
+                    if has_nan:
+                        for j in range(block_size):
+                            value = xt[f, j]
+                            go_right = np.int64(value > h) | (
+                                np.int64(np.isnan(value)) & m
+                            )
+                            values[p, j] = left ^ (diff & -go_right)
+                    else:
+                        for j in range(block_size):
+                            go_right = np.int64(xt[f, j] > h)
+                            values[p, j] = left ^ (diff & -go_right)
+
+                else:
+                    c = 2 * p + 1
+                    if has_nan:
+                        for j in range(block_size):
+                            value = xt[f, j]
+                            go_right = np.int64(value > h) | (
+                                np.int64(np.isnan(value)) & m
+                            )
+                            left = values[c, j]
+                            diff = left ^ values[c + 1, j]
+                            values[p, j] = left ^ (diff & -go_right)
+                    else:
+                        for j in range(block_size):
+                            go_right = np.int64(xt[f, j] > h)
+                            left = values[c, j]
+                            diff = left ^ values[c + 1, j]
+                            values[p, j] = left ^ (diff & -go_right)
+
+            k = tree_class[t]
+            for j in range(block_size):
+                raw[k, j] += scale * root_values[j]
+
+        for j in range(size):
+            for k in range(n_classes):
+                out[start + j, k] = raw[k, j]
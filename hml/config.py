@@ -0,0 +1,79 @@
+"""Global configurations of hml.
+
+The float type policy decides the precision of the arrays produced from
+branch read to saved datasets: momenta built from branches, observables on
+the fixed-shape path, set values and images. It defaults to "float32" and
+can be changed for the whole program or within a context:
+
+    >>> import hml.config
+    >>> hml.config.set_floatx("float64")
+    >>> with hml.config.floatx_scope("float16"):
+    ...     dataset.read(events, target=1)
+
+The scope is a context variable, so it does not reach processes spawned by
+hml itself unless it is passed to them, as `JetClustering` does for its
+workers.
+
+numba and vector do not support float16. With "float16", momenta are
+computed in float32 and only the final values are stored in float16, so the
+peak memory of a read is that of float32 momenta. Images are filled in
+float32 by chunks of events and cast chunk by chunk, which keeps their peak
+memory close to that of the float16 output.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+FLOATX_CHOICES = ("float16", "float32", "float64")
+
+_FLOATX = "float32"
+_SCOPED_FLOATX = ContextVar("floatx", default=None)
+
+
+def floatx() -> str:
+    """Return the current float type, e.g. "float32"."""
+    scoped = _SCOPED_FLOATX.get()
+    return scoped if scoped is not None else _FLOATX
+
+
+def _validate_floatx(value: str) -> str:
+    value = str(value)
+    if value not in FLOATX_CHOICES:
+        raise ValueError(
+            f"Unknown float type: {value}, expected one of {FLOATX_CHOICES}"
+        )
+
+    return value
+
+
+def set_floatx(value: str) -> None:
+    """Set the default float type of the program.
+
+    Parameters
+    ----------
+    value: str
+        One of "float16", "float32" and "float64".
+    """
+    global _FLOATX
+    _FLOATX = _validate_floatx(value)
+
+
+@contextmanager
+def floatx_scope(value: str):
+    """Use another float type within a context.
+
+    The scope only affects the current thread or task, so readers in parallel
+    can use different float types.
+
+    Parameters
+    ----------
+    value: str
+        One of "float16", "float32" and "float64".
+    """
+    token = _SCOPED_FLOATX.set(_validate_floatx(value))
+    try:
+        yield
+    finally:
+        _SCOPED_FLOATX.reset(token)
@@ -2,10 +2,34 @@ from __future__ import annotations
 
 import json
 import zipfile
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .graph_dataset import GraphDataset
-from .image_dataset import ImageDataset
-from .set_dataset import SetDataset
+if TYPE_CHECKING:
+    from .graph_dataset import GraphDataset
+    from .image_dataset import ImageDataset
+    from .set_dataset import SetDataset
+
+__all__ = ["GraphDataset", "ImageDataset", "SetDataset", "load_dataset"]
+
+# Datasets are imported on first access (PEP 562), as in hml/__init__.py, so
+# that `import hml.datasets` does not pull in awkward, keras or sklearn
+DATASETS = {
+    "GraphDataset": "graph_dataset",
+    "ImageDataset": "image_dataset",
+    "SetDataset": "set_dataset",
+}
+
+
+def __getattr__(name):
+    if name in DATASETS:
+        return getattr(import_module(f"{__name__}.{DATASETS[name]}"), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(DATASETS))
 
 
 def load_dataset(filepath, lazy=True):
@@ -15,8 +39,10 @@ def load_dataset(filepath, lazy=True):
         configs = json.load(json_file)
 
     if configs["class_name"] == "SetDataset":
-        ds = SetDataset.load(filepath, lazy=lazy)
+        ds = __getattr__("SetDataset").load(filepath, lazy=lazy)
+    elif configs["class_name"] == "GraphDataset":
+        ds = __getattr__("GraphDataset").load(filepath, lazy=lazy)
     else:
-        ds = ImageDataset.load(filepath, lazy=lazy)
+        ds = __getattr__("ImageDataset").load(filepath, lazy=lazy)
 
     return ds
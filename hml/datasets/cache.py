@@ -0,0 +1,339 @@
+"""On-disk cache of dataset arrays.
+
+Each entry is a directory named by the hash of what its arrays are built
+from, e.g. the config of a dataset and the files of its events. The arrays
+are saved as .npy files next to a manifest of their sizes and SHA-256
+checksums, so they are loaded back as memory-mapped arrays without copying.
+The cache lives in $HML_CACHE_DIR, $XDG_CACHE_HOME/hml or ~/.cache/hml.
+
+Entries are grouped by namespace, e.g. "datasets" or "sets". The least
+recently used ones are evicted once the cache exceeds $HML_CACHE_MAX_SIZE
+bytes, 10 GiB by default. Entries are listed and removed by `list_entries` and
+`clear`:
+
+    >>> from hml.datasets import cache
+    >>> cache.list_entries()
+    [{'namespace': 'sets', 'key': '3bed7b2f...', 'size': 1228, ...}]
+    >>> cache.clear("sets")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+DEFAULT_MAX_SIZE = 10 * 2**30
+
+
+def cache_dir() -> Path:
+    """Return the root directory of the cache."""
+    if "HML_CACHE_DIR" in os.environ:
+        return Path(os.environ["HML_CACHE_DIR"]).expanduser()
+
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+    return Path(xdg_cache_home).expanduser() / "hml"
+
+
+def hash_config(config) -> str:
+    """Return the SHA-256 hex digest of a JSON-serializable config."""
+    text = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def file_identity(filepath) -> dict:
+    """Return the absolute path, size and modification time of a file.
+
+    A file that is replaced or modified changes its identity, which changes the
+    keys of the entries built from it.
+    """
+    stat = os.stat(filepath)
+    return {
+        "path": os.path.abspath(filepath),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def events_identity(events) -> dict | None:
+    """Return the identity of events opened by uproot.
+
+    The identity is that of their file, with the path of the tree and the
+    entry range of `CachedEvents`. It is None for events without a local
+    file, e.g. arrays in memory or remote files.
+    """
+    try:
+        identity = file_identity(events.file.file_path)
+    except (AttributeError, OSError):
+        return None
+
+    identity["object_path"] = events.object_path
+    identity["entry_start"] = getattr(events, "entry_start", None)
+    identity["entry_stop"] = getattr(events, "entry_stop", None)
+    return identity
+
+
+def cuts_config(cuts) -> list[str] | None:
+    """Return the expressions of cuts given as strings or Cut objects."""
+    if cuts is None:
+        return None
+
+    return [i if isinstance(i, str) else i.expression for i in cuts]
+
+
+def _checksum(filepath, chunk_size=1 << 20) -> str:
+    sha256 = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def save_arrays(directory, arrays: dict[str, np.ndarray], config=None) -> Path:
+    """Save arrays as an entry of the cache.
+
+    The entry is written to a temporary directory first and then renamed, so
+    readers never see a partial entry.
+
+    Parameters
+    ----------
+    directory: str | Path
+        Directory of the entry, e.g. cache_dir() / "datasets" / key.
+    arrays: dict[str, np.ndarray]
+        Arrays to save by name.
+    config: dict, optional
+        JSON-serializable config saved in the manifest, e.g. that of the
+        dataset to rebuild around the arrays.
+
+    Return
+    ------
+    directory: Path
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{directory.name}-", dir=directory.parent))
+
+    try:
+        files = {}
+        for name, array in arrays.items():
+            filepath = tmp / f"{name}.npy"
+            np.save(filepath, np.ascontiguousarray(array), allow_pickle=False)
+            stat = filepath.stat()
+            files[name] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": _checksum(filepath),
+            }
+
+        manifest = {"config": config, "files": files}
+        with open(tmp / MANIFEST, "w") as f:
+            json.dump(manifest, f)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            # Another process has built the same entry in the meantime
+            pass
+
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return directory
+
+
+def load_arrays(directory, verify: bool = False):
+    """Load the arrays of an entry as read-only memory maps.
+
+    Files whose size or modification time differ from the manifest are
+    verified against their checksums. With `verify`, all files are.
+
+    Parameters
+    ----------
+    directory: str | Path
+        Directory of the entry.
+    verify: bool
+        Compute the checksums of all files.
+
+    Return
+    ------
+    arrays: dict[str, np.memmap] | None
+        None if the entry is missing or corrupted.
+    config: dict | None
+        The config saved with the arrays.
+    """
+    directory = Path(directory)
+    try:
+        with open(directory / MANIFEST) as f:
+            manifest = json.load(f)
+
+        arrays = {}
+        for name, expected in manifest["files"].items():
+            filepath = directory / f"{name}.npy"
+            stat = filepath.stat()
+            is_changed = (
+                stat.st_size != expected["size"]
+                or stat.st_mtime_ns != expected["mtime_ns"]
+            )
+            if (verify or is_changed) and _checksum(filepath) != expected["sha256"]:
+                return None, None
+
+            arrays[name] = np.load(filepath, mmap_mode="r", allow_pickle=False)
+
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+    return arrays, manifest["config"]
+
+
+def cached_arrays(namespace: str, config, build, verify: bool = False, root=None):
+    """Load the arrays of a config from the cache, or build and save them.
+
+    Parameters
+    ----------
+    namespace: str
+        Group of the entry, e.g. "sets".
+    config: dict
+        JSON-serializable config that fully describes the arrays. The version
+        of hml is part of the key, since it changes how arrays are computed.
+    build: callable
+        Return the arrays by name on a miss.
+    verify: bool
+        Verify the checksums of all cached arrays before loading them.
+    root: str | Path, optional
+        Root directory of the cache, cache_dir() by default.
+
+    Return
+    ------
+    arrays: dict[str, np.ndarray]
+        Memory-mapped arrays, unless the entry cannot be written or is evicted
+        right away, then the built arrays in memory.
+    """
+    from hml import __version__
+
+    root = Path(root) if root is not None else cache_dir()
+    directory = root / namespace / hash_config({**config, "version": __version__})
+
+    arrays, _ = load_arrays(directory, verify=verify)
+    if arrays is not None:
+        # The time of the manifest is the last use of an entry
+        os.utime(directory / MANIFEST)
+        return arrays
+
+    built = build()
+    try:
+        save_arrays(directory, built, config)
+        evict(root=root)
+    except OSError:
+        # The cache is not writable, e.g. a read-only home directory
+        return built
+
+    arrays, _ = load_arrays(directory)
+    return arrays if arrays is not None else built
+
+
+def list_entries(namespace: str | None = None, root=None) -> list[dict]:
+    """List the entries of the cache, the least recently used first.
+
+    Parameters
+    ----------
+    namespace: str, optional
+        Only list the entries of a namespace.
+    root: str | Path, optional
+        Root directory of the cache, cache_dir() by default.
+
+    Return
+    ------
+    entries: list[dict]
+        Namespace, key, path, size in bytes, time of last use and config of
+        each entry.
+    """
+    root = Path(root) if root is not None else cache_dir()
+    pattern = f"{namespace or '*'}/[!.]*/{MANIFEST}"
+
+    entries = []
+    for manifest_path in root.glob(pattern):
+        directory = manifest_path.parent
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+            size = sum(i.stat().st_size for i in directory.iterdir())
+            last_used = manifest_path.stat().st_mtime
+        except (OSError, ValueError):
+            continue
+
+        entries.append(
+            {
+                "namespace": directory.parent.name,
+                "key": directory.name,
+                "path": str(directory),
+                "size": size,
+                "last_used": last_used,
+                "config": manifest.get("config"),
+            }
+        )
+
+    return sorted(entries, key=lambda i: i["last_used"])
+
+
+def evict(max_size: int | None = None, root=None) -> list[dict]:
+    """Remove the least recently used entries until the cache fits a size.
+
+    Parameters
+    ----------
+    max_size: int, optional
+        Size limit in bytes, $HML_CACHE_MAX_SIZE or 10 GiB by default.
+    root: str | Path, optional
+        Root directory of the cache, cache_dir() by default.
+
+    Return
+    ------
+    evicted: list[dict]
+        The removed entries.
+    """
+    if max_size is None:
+        max_size = int(os.environ.get("HML_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE))
+
+    entries = list_entries(root=root)
+    total = sum(i["size"] for i in entries)
+
+    evicted = []
+    for entry in entries:
+        if total <= max_size:
+            break
+
+        shutil.rmtree(entry["path"], ignore_errors=True)
+        total -= entry["size"]
+        evicted.append(entry)
+
+    return evicted
+
+
+def clear(namespace: str | None = None, root=None) -> int:
+    """Remove all entries of the cache, or those of a namespace.
+
+    Parameters
+    ----------
+    namespace: str, optional
+        Only remove the entries of a namespace.
+    root: str | Path, optional
+        Root directory of the cache, cache_dir() by default.
+
+    Return
+    ------
+    n_entries: int
+        Number of removed entries.
+    """
+    entries = list_entries(namespace, root)
+    for entry in entries:
+        shutil.rmtree(entry["path"], ignore_errors=True)
+
+    return len(entries)
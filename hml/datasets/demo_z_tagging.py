@@ -1,2 +1,134 @@
-def load_data():
-    ...
+"""The Z tagging demo dataset: boosted Z bosons against QCD jets.
+
+The dataset is built from local Delphes events once, e.g. the outputs of
+MadGraph in the layout of tests/data, and cached on disk. Later calls load the
+cached arrays as memory maps instead of reading the events again.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+
+import uproot
+
+from hml.config import floatx
+from hml.representations import Image
+
+from .cache import cached_arrays, file_identity
+from .image_dataset import ImageDataset
+from .set_dataset import SetDataset
+
+CUTS = ["fatjet.size > 0 and jet.size > 1"]
+
+
+def _set_dataset():
+    return SetDataset(["FatJet0.Mass", "FatJet0.Tau21", "Jet0,Jet1.DeltaR"])
+
+
+def _image_dataset():
+    image = (
+        Image(
+            height="FatJet0.Constituents.Phi",
+            width="FatJet0.Constituents.Eta",
+            channel="FatJet0.Constituents.Pt",
+        )
+        .with_subjets("FatJet0.Constituents", "kt", 0.3, 0)
+        .translate(origin="SubJet0")
+        .rotate(axis="SubJet1", orientation=-90)
+        .pixelate(size=(33, 33), range=[(-1.6, 1.6), (-1.6, 1.6)])
+    )
+    return ImageDataset(image)
+
+
+REPRESENTATIONS = {"set": _set_dataset, "image": _image_dataset}
+
+
+def _find_events(path) -> list[str]:
+    # A ROOT file, or the output of MadGraph with Events/run_*/*.root
+    if os.path.isfile(path):
+        return [path]
+
+    filepaths = sorted(glob.glob(os.path.join(path, "Events", "*", "*delphes*.root")))
+    if not filepaths:
+        raise FileNotFoundError(f"No Delphes events found in {path}")
+
+    return filepaths
+
+
+def load_data(
+    signal,
+    background,
+    representation: str = "set",
+    cache_dir=None,
+    verify: bool = False,
+):
+    """Load the Z tagging dataset, building it from events on the first call.
+
+    Signal events are labeled 1 and background events 0. The events are cut
+    by "fatjet.size > 0 and jet.size > 1". The set has the mass and tau21 of
+    the leading fat jet and the distance of the two leading jets, the image is
+    the 33x33 pt image of the constituents of the leading fat jet.
+
+    The cache key depends on the dataset config, the float type and the path,
+    size and modification time of each ROOT file, so modified events are read
+    again.
+
+    Parameters
+    ----------
+    signal: str | list[str]
+        Delphes ROOT files of the signal, e.g. pp -> zz, or MadGraph output
+        directories that contain them.
+    background: str | list[str]
+        Delphes ROOT files of the background, e.g. pp -> jj, or MadGraph
+        output directories that contain them.
+    representation: str
+        "set" or "image".
+    cache_dir: str, optional
+        Directory of the cache, hml.datasets.cache.cache_dir() by default.
+    verify: bool
+        Verify the checksums of all cached arrays before loading them.
+
+    Return
+    ------
+    dataset: SetDataset | ImageDataset
+        The dataset with memory-mapped samples and targets.
+    """
+    if representation not in REPRESENTATIONS:
+        raise ValueError(
+            f"Unknown representation: {representation}, "
+            f"expected one of {list(REPRESENTATIONS)}"
+        )
+
+    samples = {}
+    for target, paths in [(1, signal), (0, background)]:
+        paths = [paths] if isinstance(paths, (str, os.PathLike)) else paths
+        samples[target] = [i for path in paths for i in _find_events(path)]
+
+    dataset = REPRESENTATIONS[representation]()
+    config = {
+        "dataset": dataset.config,
+        "cuts": CUTS,
+        "floatx": floatx(),
+        "events": {
+            target: [file_identity(i) for i in filepaths]
+            for target, filepaths in samples.items()
+        },
+    }
+
+    def build():
+        for target, filepaths in samples.items():
+            for filepath in filepaths:
+                with uproot.open(filepath) as f:
+                    dataset.read(f["Delphes"], target, CUTS)
+
+        return {"samples": dataset.samples, "targets": dataset.targets}
+
+    # The arrays are memory maps of the cache, or those of build() in memory
+    # when the cache is not writable
+    arrays = cached_arrays("datasets", config, build, verify, cache_dir)
+    dataset._samples = arrays["samples"]
+    dataset._targets = arrays["targets"]
+    dataset._been_read = True
+
+    return dataset
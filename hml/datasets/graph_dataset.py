@@ -1,2 +1,273 @@
+from __future__ import annotations
+
+import json
+import zipfile
+from functools import reduce
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from hml.config import floatx
+from hml.operations import cache_events
+from hml.representations import Graph
+
+if TYPE_CHECKING:
+    from hml.approaches import Cut
+
+
 class GraphDataset:
-    ...
+    """A dataset of point clouds, e.g. jet constituents for SimpleGNN.
+
+    Samples are the padded features of the particles, shape (n, max_particles,
+    n_features), together with their masks and, when the graph has `k`, the
+    indices of the nearest neighbours.
+
+    Parameters
+    ----------
+    representation : Graph
+        The graph to read from events.
+    """
+
+    def __init__(self, representation: Graph):
+        self.graph = representation
+        self.been_split = False
+        self.seed = None
+
+        self._samples = []
+        self._masks = []
+        self._edges = []
+        self._targets = []
+        self.train = None
+        self.test = None
+        self.val = None
+
+        self._data = None
+        self._been_read = False
+
+    def read(
+        self,
+        events,
+        target,
+        cuts: list[str | Cut] | None = None,
+        step_size: int | None = None,
+    ):
+        """Read the graphs of events and append them to the dataset.
+
+        With `step_size`, events are read that many at a time, so only the
+        padded arrays of the dataset grow with the number of events.
+        """
+        if step_size is None:
+            return self._read_chunk(cache_events(events), target, cuts)
+
+        n_entries = events.num_entries
+        for start in range(0, n_entries, step_size):
+            chunk = cache_events(events, start, min(start + step_size, n_entries))
+            self._read_chunk(chunk, target, cuts)
+
+    def _read_chunk(self, events, target, cuts):
+        from hml.approaches import Cut
+
+        # Share branches and intermediate arrays between the graph and cuts
+        self.graph.read(events)
+        arrays = [self.graph.values, self.graph.masks, self.graph.edges]
+
+        if cuts is not None:
+            compiled_cuts = []
+            for i in cuts:
+                if isinstance(i, str):
+                    compiled_cuts.append(Cut(i).read(events).value)
+                else:
+                    compiled_cuts.append(i.read(events).value)
+
+            mask = np.asarray(reduce(np.logical_and, compiled_cuts))
+            arrays = [i[mask] if i is not None else None for i in arrays]
+
+        values, masks, edges = arrays
+        self._append("_samples", values)
+        self._append("_masks", masks)
+        if edges is not None:
+            self._append("_edges", edges)
+        self._append("_targets", np.full(len(values), target, dtype=np.int32))
+
+    def _append(self, name, array):
+        # Chunks are concatenated once when the arrays are accessed
+        chunks = getattr(self, name)
+        if not isinstance(chunks, list):
+            chunks = [chunks]
+        chunks.append(array)
+        setattr(self, name, chunks)
+
+    def _concatenate(self, name, dtype):
+        chunks = getattr(self, name)
+        if isinstance(chunks, list):
+            if len(chunks) == 0:
+                return np.empty(0, dtype=dtype)
+
+            chunks = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+            setattr(self, name, chunks)
+
+        return np.asarray(chunks, dtype=dtype)
+
+    def _load(self):
+        if not self._been_read and self._data is not None:
+            data = np.load(BytesIO(self._data.read()))
+            self._samples = data["samples"]
+            self._masks = data["masks"]
+            self._edges = data.get("edges", [])
+            self._targets = data["targets"]
+            self._data.seek(0)
+            self._been_read = True
+
+    def split(self, train, test, val=None, seed=None):
+        from sklearn.model_selection import train_test_split
+
+        train *= 10
+        test *= 10
+        self.seed = seed
+
+        if val is None and train + test != 10:
+            raise ValueError("train + test must be 1")
+
+        arrays = [self.samples, self.masks, self.targets]
+        if self.edges is not None:
+            arrays.append(self.edges)
+
+        outputs = train_test_split(*arrays, test_size=test / 10, random_state=seed)
+        train_arrays, test_arrays = outputs[::2], outputs[1::2]
+
+        if val is not None:
+            val *= 10
+            if train + test + val != 10:
+                raise ValueError("train + test + val must be 1")
+
+            outputs = train_test_split(
+                *train_arrays,
+                test_size=val / (train + val),
+                random_state=seed,
+            )
+            train_arrays, val_arrays = outputs[::2], outputs[1::2]
+
+            self.val = self._subset(val_arrays)
+
+        self.train = self._subset(train_arrays)
+        self.test = self._subset(test_arrays)
+
+        self.been_split = True
+
+    def _subset(self, arrays):
+        dataset = GraphDataset(self.graph)
+        dataset._samples, dataset._masks, dataset._targets = arrays[:3]
+        dataset._edges = arrays[3] if len(arrays) > 3 else []
+        return dataset
+
+    def save(self, filepath="dataset.ds"):
+        configs = self.config
+        configs_json = json.dumps(configs)
+
+        arrays = {"samples": self.samples, "masks": self.masks}
+        if self.edges is not None:
+            arrays["edges"] = self.edges
+        arrays["targets"] = self.targets
+
+        npz_data = BytesIO()
+        np.savez(npz_data, **arrays)
+        npz_data.seek(0)
+
+        with zipfile.ZipFile(filepath, "w") as zf:
+            zf.writestr("configs.json", configs_json)
+            zf.writestr("data.npz", npz_data.read())
+
+            if self.been_split:
+                npz_train = BytesIO()
+                self.train.save(npz_train)
+                npz_train.seek(0)
+                zf.writestr("train.ds", npz_train.read())
+
+                npz_test = BytesIO()
+                self.test.save(npz_test)
+                npz_test.seek(0)
+                zf.writestr("test.ds", npz_test.read())
+
+                if self.val is not None:
+                    npz_val = BytesIO()
+                    self.val.save(npz_val)
+                    npz_val.seek(0)
+                    zf.writestr("val.ds", npz_val.read())
+
+    @classmethod
+    def load(cls, filepath, lazy=True):
+        zf = zipfile.ZipFile(filepath)
+        # Extract and read configs JSON
+        with zf.open("configs.json") as json_file:
+            configs = json.load(json_file)
+
+        dataset = cls.from_config(configs)
+        dataset._filepath = filepath
+        dataset._data = zf.open("data.npz")
+
+        if not lazy:
+            dataset._load()
+
+        # Extract and load train, test, and val .npz files
+        if configs["been_split"]:
+            dataset.train = cls.load(zf.open("train.ds"), lazy=lazy)
+            dataset.test = cls.load(zf.open("test.ds"), lazy=lazy)
+
+            if "val.ds" in [i.filename for i in zf.filelist]:
+                dataset.val = cls.load(zf.open("val.ds"), lazy=lazy)
+
+        return dataset
+
+    @property
+    def samples(self):
+        """Features of the particles, shape (n, max_particles, n_features)."""
+        self._load()
+        return self._concatenate("_samples", floatx())
+
+    @property
+    def masks(self):
+        """Whether each particle is a real one, shape (n, max_particles)."""
+        self._load()
+        return self._concatenate("_masks", bool)
+
+    @property
+    def edges(self):
+        """Indices of the nearest neighbours, shape (n, max_particles, k)."""
+        self._load()
+        if self.graph.k is None:
+            return None
+
+        return self._concatenate("_edges", np.int32)
+
+    @property
+    def targets(self):
+        self._load()
+        return self._concatenate("_targets", np.int32)
+
+    @property
+    def feature_names(self):
+        return self.graph.names
+
+    @property
+    def config(self):
+        config = self.graph.config
+        config.update(
+            {
+                "class_name": self.__class__.__name__,
+                "been_split": self.been_split,
+                "seed": self.seed,
+            }
+        )
+
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        graph = Graph.from_config(config)
+
+        instance = cls(graph)
+        instance.been_split = config["been_split"]
+        instance.seed = config["seed"]
+
+        return instance
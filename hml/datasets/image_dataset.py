@@ -4,15 +4,20 @@ import json
 import zipfile
 from functools import reduce
 from io import BytesIO
+from typing import TYPE_CHECKING
 
 import awkward as ak
 import numpy as np
-from matplotlib import pyplot as plt
-from sklearn.model_selection import train_test_split
 
-from hml.approaches import Cut
+from hml.config import floatx
+from hml.operations import cache_events
 from hml.representations import Image
 
+from .cache import cached_arrays, cuts_config, events_identity
+
+if TYPE_CHECKING:
+    from hml.approaches import Cut
+
 
 class ImageDataset:
     def __init__(self, representation: Image):
@@ -28,25 +33,38 @@ class ImageDataset:
         self._data = None
         self._been_read = None
 
-    def read(self, events, target, cuts: list[str | Cut] | None = None):
-        self.image.read(events)
-        if cuts is not None:
-            compiled_cuts = []
-            for i in cuts:
-                if isinstance(i, str):
-                    compiled_cuts.append(Cut(i).read(events).value)
-                else:
-                    compiled_cuts.append(i.read(events).value)
-            mask = reduce(np.logical_and, compiled_cuts)
+    def read(
+        self,
+        events,
+        target,
+        cuts: list[str | Cut] | None = None,
+        cache: bool = False,
+    ):
+        """Read the images of events and append them to the dataset.
+
+        With `cache`, pixelated images are cached on disk by the file of the
+        events, the definition of the image and the cuts, see
+        hml.datasets.cache.
+        Later reads of the same events load them without reading any branch.
+        """
+        # Share branches and intermediate arrays between the image and cuts
+        events = cache_events(events)
+        identity = events_identity(events) if cache else None
+        if identity is None or not self.image.been_pixelated:
+            image_values = self._read_values(events, cuts)
 
-            if self.image.been_pixelated:
-                image_values = self.image.values[mask]
-            else:
-                image_values = [self.image.values[0][mask], self.image.values[1][mask]]
         else:
-            image_values = self.image.values
+            config = {
+                "events": identity,
+                "image": self.image.definition,
+                "cuts": cuts_config(cuts),
+                "floatx": floatx(),
+            }
+            image_values = cached_arrays(
+                "images", config, lambda: {"samples": self._read_pixels(events, cuts)}
+            )["samples"]
 
-        if self.image.status:
+        if image_values is not None:
             if isinstance(self._samples, list):
                 self._samples = image_values
             else:
@@ -94,7 +112,41 @@ class ImageDataset:
         #         self._samples[0] = self._samples[0][cut]
         #         self._samples[1] = self._samples[1][cut]
 
+    def _read_values(self, events, cuts):
+        from hml.approaches import Cut
+
+        self.image.read(events)
+        if not self.image.status:
+            return None
+
+        if cuts is None:
+            return self.image.values
+
+        compiled_cuts = []
+        for i in cuts:
+            if isinstance(i, str):
+                compiled_cuts.append(Cut(i).read(events).value)
+            else:
+                compiled_cuts.append(i.read(events).value)
+        mask = reduce(np.logical_and, compiled_cuts)
+
+        if self.image.been_pixelated:
+            return self.image.values[mask]
+        else:
+            return [self.image.values[0][mask], self.image.values[1][mask]]
+
+    def _read_pixels(self, events, cuts):
+        # Images that fail to read are cached as none of them
+        pixels = self._read_values(events, cuts)
+        if pixels is None:
+            shape = (0, len(self.image.w_bins) - 1, len(self.image.h_bins) - 1)
+            return np.empty(shape, dtype=floatx())
+
+        return np.asarray(pixels)
+
     def split(self, train, test, val=None, seed=None):
+        from sklearn.model_selection import train_test_split
+
         train *= 10
         test *= 10
         samples = self.samples
@@ -208,7 +260,7 @@ class ImageDataset:
                 self._been_read = True
 
         if self.image.been_pixelated:
-            return np.array(self._samples, dtype=np.float32)
+            return np.asarray(self._samples, dtype=floatx())
         else:
             height = ak.from_iter(self._samples[0])
             width = ak.from_iter(self._samples[1])
@@ -254,6 +306,8 @@ class ImageDataset:
         n_samples=-1,
         target=None,
     ):
+        from matplotlib import pyplot as plt
+
         if target is not None and self.image.been_pixelated:
             samples = self.samples[np.squeeze(self.targets) == target]
 
@@ -4,18 +4,21 @@ import json
 import zipfile
 from functools import reduce
 from io import BytesIO
+from typing import TYPE_CHECKING
 
 import awkward as ak
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-import seaborn as sns
-from sklearn.model_selection import train_test_split
 
-from hml.approaches import Cut
+from hml.config import floatx
 from hml.observables import Observable
+from hml.operations import cache_events
 from hml.representations import Set
 
+from .cache import cached_arrays, cuts_config, events_identity
+
+if TYPE_CHECKING:
+    from hml.approaches import Cut
+
 
 class SetDataset:
     def __init__(self, observables: list[str | Observable]):
@@ -32,20 +35,37 @@ class SetDataset:
         self._data = None
         self._been_read = False
 
-    def read(self, events, target, cuts: list[str | Cut] | None = None):
-        self.set.read(events)
-        if cuts is not None:
-            compiled_cuts = []
-            for i in cuts:
-                if isinstance(i, str):
-                    compiled_cuts.append(Cut(i).read(events).value)
-                else:
-                    compiled_cuts.append(i.read(events).value)
-
-            mask = reduce(np.logical_and, compiled_cuts)
-            set_values = self.set.values[mask]
+    def read(
+        self,
+        events,
+        target,
+        cuts: list[str | Cut] | None = None,
+        cache: bool = False,
+    ):
+        """Read the set of events and append it to the dataset.
+
+        With `cache`, the values are cached on disk by the file of the events,
+        the config of the set and the cuts, see hml.datasets.cache. Later reads
+        of the same events load them without reading any branch.
+        """
+        # Share branches and intermediate arrays between the set and cuts
+        events = cache_events(events)
+        identity = events_identity(events) if cache else None
+        if identity is None:
+            set_values = self._read_values(events, cuts)
+
         else:
-            set_values = self.set.values
+            config = {
+                "events": identity,
+                "set": self.set.config,
+                "cuts": cuts_config(cuts),
+                "floatx": floatx(),
+            }
+            set_values = cached_arrays(
+                "sets",
+                config,
+                lambda: {"samples": self._to_numpy(self._read_values(events, cuts))},
+            )["samples"]
 
         if isinstance(self._samples, list):
             self._samples = set_values
@@ -64,7 +84,32 @@ class SetDataset:
                 ]
             )
 
+    def _read_values(self, events, cuts):
+        from hml.approaches import Cut
+
+        self.set.read(events)
+        if cuts is None:
+            return self.set.values
+
+        compiled_cuts = []
+        for i in cuts:
+            if isinstance(i, str):
+                compiled_cuts.append(Cut(i).read(events).value)
+            else:
+                compiled_cuts.append(i.read(events).value)
+
+        mask = reduce(np.logical_and, compiled_cuts)
+        return self.set.values[mask]
+
+    @staticmethod
+    def _to_numpy(values):
+        nan = np.array(np.nan, dtype=floatx())
+        samples = ak.to_numpy(ak.fill_none(values, nan))
+        return samples.astype(floatx(), copy=False)
+
     def split(self, train, test, val=None, seed=None):
+        from sklearn.model_selection import train_test_split
+
         train *= 10
         test *= 10
         samples = self.samples
@@ -176,8 +221,7 @@ class SetDataset:
             self._been_read = True
 
         # return np.array(self._samples, dtype=np.float32)
-        nan_float32 = np.array(np.nan, dtype=np.float32)
-        return ak.to_numpy(ak.fill_none(self._samples, nan_float32))
+        return self._to_numpy(self._samples)
         # return ak.to_numpy(self._samples, allow_missing=False)
 
     @property
@@ -203,6 +247,8 @@ class SetDataset:
         return np.hstack([self.samples, self.targets[:, None]])
 
     def to_pandas(self):
+        import pandas as pd
+
         df = pd.DataFrame(self.samples.tolist(), columns=self.feature_names)
         df["Target"] = self.targets
         return df
@@ -231,6 +277,9 @@ class SetDataset:
         return instance
 
     def show(self, n_feature_per_line=3, n_samples=-1, target=None):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         df = self.to_pandas()
         df = df.sample(n=n_samples) if n_samples != -1 else df
 
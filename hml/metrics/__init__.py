@@ -1,2 +1,6 @@
 from .max_significance import MaxSignificance, max_significance
-from .rejection_at_efficiency import RejectionAtEfficiency, rejection_at_efficiency
+from .rejection_at_efficiency import (
+    RejectionAtEfficiency,
+    ROCAccumulator,
+    rejection_at_efficiency,
+)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from typing import NamedTuple
+
+import numpy as np
 from keras import ops
 from keras.config import epsilon
 from keras.metrics import (
@@ -111,7 +114,178 @@ class MaxSignificance(Metric):
         return max_significance
 
 
-def max_significance(): ...
+class SignificanceScan(NamedTuple):
+    significance: np.ndarray
+    thresholds: np.ndarray
+    signal_efficiency: np.ndarray
+    background_efficiency: np.ndarray
+    max_significance: np.ndarray
+    best_thresholds: np.ndarray
+
+
+def max_significance(
+    y_true,
+    y_pred,
+    cross_sections=None,
+    luminosity=None,
+    weights=None,
+    sample_weight=None,
+    class_id=1,
+) -> SignificanceScan:
+    """Scan the significance of many models over luminosities and cross sections.
+
+    Scores of each model are sorted only once. The cumulative counts of every
+    class along the sorted scores are then shared by all luminosity and cross
+    section scenarios, so the grid of one model is evaluated in one vectorized
+    pass. Models are scanned one by one, so the memory beyond the outputs only
+    grows with the number of samples.
+
+    Parameters
+    ----------
+    y_true: array-like, shape (n_samples,) or (n_samples, n_classes)
+        Integer labels or one-hot encoded labels shared by all models.
+    y_pred: array-like or list of array-like
+        Scores of one model with shape (n_samples,) or (n_samples, n_classes),
+        or a list of them (or an array with a leading model axis) for many
+        models. When the scores have a class axis, the column `class_id` is used.
+    cross_sections: array-like, shape (n_classes,) or (n_scenarios, n_classes)
+        Cross sections of each class. If None, the raw weighted counts of
+        signal and background are used and the luminosity is ignored, the same
+        as `MaxSignificance`.
+    luminosity: float or array-like, shape (n_luminosities,)
+        Integrated luminosities to scan. Default is 1.0.
+    weights: array-like, shape (n_classes,)
+        Extra weight of each class, e.g. a pre-selection efficiency.
+    sample_weight: array-like, shape (n_samples,)
+        Weight of each sample.
+    class_id: int
+        Index of the signal class. All other classes are background.
+
+    Return
+    ------
+    scan: SignificanceScan
+        - significance: (n_models, n_luminosities, n_scenarios, n_samples)
+        - thresholds: (n_models, n_samples), scores sorted in descending order.
+          Selecting `score >= threshold` gives the corresponding point.
+        - signal_efficiency: (n_models, n_samples)
+        - background_efficiency: (n_models, n_samples)
+        - max_significance: (n_models, n_luminosities, n_scenarios)
+        - best_thresholds: (n_models, n_luminosities, n_scenarios)
+    """
+    y_true = np.asarray(y_true)
+    labels = y_true.argmax(-1) if y_true.ndim == 2 else y_true.astype(np.int64)
+    n_samples = len(labels)
+
+    # Stack scores into (n_models, n_samples)
+    if isinstance(y_pred, (list, tuple)):
+        scores = np.stack([_take_class_scores(i, class_id) for i in y_pred])
+    else:
+        y_pred = np.asarray(y_pred)
+        if y_pred.ndim == 1 or (y_pred.ndim == 2 and len(y_pred) == n_samples):
+            scores = _take_class_scores(y_pred, class_id)[None]
+        else:
+            scores = np.stack([_take_class_scores(i, class_id) for i in y_pred])
+
+    if scores.shape[1] != n_samples:
+        raise ValueError(
+            f"y_pred has {scores.shape[1]} samples while y_true has {n_samples}"
+        )
+
+    n_models = len(scores)
+    n_classes = max(int(labels.max()) + 1, class_id + 1)
+    if cross_sections is not None:
+        cross_sections = np.atleast_2d(np.asarray(cross_sections, dtype=np.float64))
+        n_classes = max(n_classes, cross_sections.shape[1])
+
+    sample_weight = (
+        np.ones(n_samples) if sample_weight is None else np.asarray(sample_weight)
+    )
+    luminosity = np.atleast_1d(
+        np.asarray(luminosity if luminosity is not None else 1.0, dtype=np.float64)
+    )
+    weights = np.ones(n_classes) if weights is None else np.asarray(weights, np.float64)
+
+    n_luminosities = len(luminosity)
+    n_scenarios = 1 if cross_sections is None else len(cross_sections)
+    significance = np.empty((n_models, n_luminosities, n_scenarios, n_samples))
+    thresholds = np.empty((n_models, n_samples))
+    signal_efficiency = np.empty((n_models, n_samples))
+    background_efficiency = np.empty((n_models, n_samples))
+
+    # One model at a time, so memory only grows with the size of the outputs
+    is_bkg = np.arange(n_classes) != class_id
+    for i, model_scores in enumerate(scores):
+        # Sort once per model in descending order of scores
+        order = np.argsort(-model_scores, kind="stable")
+        thresholds[i] = model_scores[order]
+        sorted_labels = labels[order]
+        sorted_weight = sample_weight[order]
+
+        # Samples sharing the same score can not be separated by a threshold,
+        # so each position takes the counts at the end of its group of ties
+        is_last = np.ones(n_samples, dtype=bool)
+        is_last[:-1] = thresholds[i, 1:] != thresholds[i, :-1]
+        ends = np.where(is_last, np.arange(n_samples), n_samples - 1)
+        ends = np.minimum.accumulate(ends[::-1])[::-1]
+
+        # Cumulative weighted counts of each class: (n_samples, n_classes)
+        counts = np.empty((n_samples, n_classes))
+        for k in range(n_classes):
+            counts[:, k] = np.cumsum(np.where(sorted_labels == k, sorted_weight, 0))
+        counts = counts[ends]
+
+        totals = counts[-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiencies = np.where(totals > 0, counts / totals, 0.0)
+            bkg_counts = counts[:, is_bkg].sum(-1)
+            bkg_total = totals[is_bkg].sum()
+            signal_efficiency[i] = efficiencies[:, class_id]
+            background_efficiency[i] = (
+                bkg_counts / bkg_total if bkg_total > 0 else np.zeros(n_samples)
+            )
+
+        if cross_sections is None:
+            # (1, 1, n_samples)
+            s = counts[None, None, :, class_id]
+            b = bkg_counts[None, None, :]
+        else:
+            rates = cross_sections * weights  # (n_scenarios, n_classes)
+            # (n_luminosities, n_scenarios, n_samples)
+            s = rates[:, class_id, None] * signal_efficiency[i]
+            b = rates[:, is_bkg] @ efficiencies[:, is_bkg].T
+            s = luminosity[:, None, None] * s
+            b = luminosity[:, None, None] * b
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            significance[i] = s / np.sqrt(s + b)
+
+        if cross_sections is not None:
+            # Points without any background are not physical, skip them
+            significance[i][np.broadcast_to(b <= 0, significance[i].shape)] = np.nan
+
+    significance[~np.isfinite(significance)] = np.nan
+    filled = np.where(np.isnan(significance), -np.inf, significance)
+    best_index = filled.argmax(-1)
+    max_significance = np.take_along_axis(significance, best_index[..., None], -1)
+    best_thresholds = np.take_along_axis(
+        np.broadcast_to(thresholds[:, None, None, :], significance.shape),
+        best_index[..., None],
+        -1,
+    )
+
+    return SignificanceScan(
+        significance=significance,
+        thresholds=thresholds,
+        signal_efficiency=signal_efficiency,
+        background_efficiency=background_efficiency,
+        max_significance=max_significance[..., 0],
+        best_thresholds=best_thresholds[..., 0],
+    )
+
+
+def _take_class_scores(y_pred, class_id):
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    return y_pred[:, class_id] if y_pred.ndim == 2 else y_pred
 
 
 def calculate_thresholds(y_score):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 from keras import ops
 from keras.metrics import Metric, SpecificityAtSensitivity
 
@@ -36,4 +37,188 @@ class RejectionAtEfficiency(Metric):
         return rejection
 
 
-def rejection_at_efficiency(): ...
+class ROCAccumulator:
+    """Histogram-based ROC accumulator for streaming evaluation.
+
+    Scores of each class are filled into fixed-width histograms in [0, 1],
+    separately for the samples of this class (signal) and of the others
+    (background). The histograms are all the state there is, so partial
+    results from different chunks or workers are combined by `merge`.
+
+    Parameters
+    ----------
+    num_thresholds: int
+        Number of bins in [0, 1], i.e. the number of thresholds on the scores.
+    """
+
+    def __init__(self, num_thresholds: int = 200):
+        self.num_thresholds = num_thresholds
+        self.histograms = None  # (n_classes, 2, num_thresholds)
+
+    def update(self, y_true, y_pred, sample_weight=None) -> ROCAccumulator:
+        """Fill a chunk of samples into the histograms.
+
+        Parameters
+        ----------
+        y_true: array-like, shape (n_samples,) or (n_samples, n_classes)
+            Integer labels or one-hot encoded labels.
+        y_pred: array-like, shape (n_samples,) or (n_samples, n_classes)
+            Probabilities. One dimensional inputs are the probabilities of
+            class 1 in a binary classification.
+        sample_weight: array-like, shape (n_samples,)
+            Weight of each sample.
+        """
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred, dtype=np.float64)
+        labels = y_true.argmax(-1) if y_true.ndim == 2 else y_true.astype(np.int64)
+
+        if y_pred.ndim == 1:
+            y_pred = np.stack([1 - y_pred, y_pred], axis=1)
+
+        n_samples, n_classes = y_pred.shape
+        if self.histograms is None:
+            self.histograms = np.zeros((n_classes, 2, self.num_thresholds))
+        elif len(self.histograms) != n_classes:
+            raise ValueError(
+                f"Expected {len(self.histograms)} classes but got {n_classes}"
+            )
+
+        sample_weight = (
+            np.ones(n_samples)
+            if sample_weight is None
+            else np.asarray(sample_weight, dtype=np.float64)
+        )
+
+        # Flat index of (class, is_signal, bin) for every sample and class
+        bins = np.clip(
+            (y_pred * self.num_thresholds).astype(np.int64), 0, self.num_thresholds - 1
+        )
+        is_signal = labels[:, None] == np.arange(n_classes)
+        index = (np.arange(n_classes) * 2 + is_signal) * self.num_thresholds + bins
+        self.histograms += np.bincount(
+            index.ravel(),
+            weights=np.repeat(sample_weight, n_classes),
+            minlength=self.histograms.size,
+        ).reshape(self.histograms.shape)
+
+        return self
+
+    def merge(self, *others: ROCAccumulator) -> ROCAccumulator:
+        """Merge the states of other accumulators into this one."""
+        for other in others:
+            if other.num_thresholds != self.num_thresholds:
+                raise ValueError("Cannot merge accumulators with different bins")
+
+            if other.histograms is None:
+                continue
+            elif self.histograms is None:
+                self.histograms = other.histograms.copy()
+            else:
+                self.histograms = self.histograms + other.histograms
+
+        return self
+
+    def reset(self) -> None:
+        self.histograms = None
+
+    @property
+    def thresholds(self) -> np.ndarray:
+        return np.arange(self.num_thresholds) / self.num_thresholds
+
+    def efficiencies(self) -> tuple[np.ndarray, np.ndarray]:
+        """Signal and background efficiencies at each threshold.
+
+        Return
+        ------
+        signal_efficiency, background_efficiency: ndarray
+            Efficiencies of selecting `score >= threshold` for each class with
+            the shape (n_classes, n_thresholds).
+        """
+        if self.histograms is None:
+            raise ValueError("No samples have been accumulated yet")
+
+        # Reversed cumulative sums: number of samples above each threshold
+        passed = np.cumsum(self.histograms[..., ::-1], axis=-1)[..., ::-1]
+        total = passed[..., :1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            efficiencies = np.where(total > 0, passed / total, 0.0)
+
+        return efficiencies[:, 1], efficiencies[:, 0]
+
+    def result(self, efficiency, class_id: int | None = None) -> np.ndarray:
+        """Background rejection at the given signal efficiencies.
+
+        The threshold is the highest one whose signal efficiency is at least the
+        target, the same as `keras.metrics.SpecificityAtSensitivity`.
+
+        Parameters
+        ----------
+        efficiency: float or array-like, shape (n_efficiencies,)
+            Target signal efficiencies.
+        class_id: int
+            The class taken as signal. If None, all classes are evaluated.
+
+        Return
+        ------
+        rejection: ndarray, shape (n_classes, n_efficiencies)
+            The class axis is dropped when `class_id` is given and the
+            efficiency axis is dropped when `efficiency` is a scalar.
+        """
+        signal_efficiency, background_efficiency = self.efficiencies()
+        targets = np.atleast_1d(np.asarray(efficiency, dtype=np.float64))
+
+        # Efficiencies decrease with thresholds, so the last passing index is
+        # the highest threshold that reaches the target
+        passed = signal_efficiency[:, None, :] >= targets[None, :, None]
+        index = np.maximum(passed.sum(-1) - 1, 0)  # (n_classes, n_efficiencies)
+        fpr = np.take_along_axis(background_efficiency, index, axis=-1)
+
+        with np.errstate(divide="ignore"):
+            rejection = 1 / fpr
+
+        if class_id is not None:
+            rejection = rejection[class_id]
+        if np.ndim(efficiency) == 0:
+            rejection = rejection[..., 0]
+
+        return rejection
+
+
+def rejection_at_efficiency(
+    y_true,
+    y_pred,
+    efficiency,
+    sample_weight=None,
+    class_id: int | None = None,
+    num_thresholds: int = 200,
+) -> np.ndarray:
+    """Calculate the background rejection at several signal efficiencies.
+
+    Parameters
+    ----------
+    y_true: array-like, shape (n_samples,) or (n_samples, n_classes)
+        Integer labels or one-hot encoded labels.
+    y_pred: array-like, shape (n_samples,) or (n_samples, n_classes)
+        Probabilities. One dimensional inputs are the probabilities of class 1.
+    efficiency: float or array-like, shape (n_efficiencies,)
+        Target signal efficiencies.
+    sample_weight: array-like, shape (n_samples,)
+        Weight of each sample.
+    class_id: int
+        The class taken as signal. If None, it is class 1 for one dimensional
+        `y_pred` and all classes otherwise.
+    num_thresholds: int
+        Number of thresholds on the scores.
+
+    Return
+    ------
+    rejection: ndarray
+        See `ROCAccumulator.result`.
+    """
+    if class_id is None and np.ndim(y_pred) == 1:
+        class_id = 1
+
+    accumulator = ROCAccumulator(num_thresholds)
+    accumulator.update(y_true, y_pred, sample_weight)
+
+    return accumulator.result(efficiency, class_id)
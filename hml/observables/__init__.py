@@ -4,13 +4,25 @@ import re
 
 from .angular_distance import AngularDistance
 from .charge import Charge
+from .grooming import (
+    EnergyCorrelation,
+    Groomed,
+    PrunedMass,
+    SoftDropMass,
+    TrimmedMass,
+)
 from .invariant_mass import InvariantMass
 from .kinematics import E, Eta, M, Phi, Pt, Px, Py, Pz
+from .matching import IsolationSum, MinDeltaR, OverlapRemoval
 from .n_subjettiness import NSubjettiness, NSubjettinessRatio, TauMN, TauN
 from .observable import Observable
+from .planner import Planner
 from .size import Size
 from .tag import BTag, TauTag
 
+TAU_N_PATTERN = re.compile(r"^tau\d$", re.IGNORECASE)
+TAU_MN_PATTERN = re.compile(r"^tau\d\d$", re.IGNORECASE)
+
 
 def get(identifier: str | None) -> Observable | None:
     if identifier is None or identifier == "None":
@@ -33,11 +45,11 @@ def parse_observable(name: str | None, **kwargs) -> Observable | None:
         kwargs["class_name"] = class_name
         return Observable.aliases[class_name].from_name(name, **kwargs)
 
-    elif re.match(r"^tau\d$", class_name.lower()):
+    elif TAU_N_PATTERN.match(class_name):
         kwargs["class_name"] = class_name
         return TauN.from_name(name, **kwargs)
 
-    elif re.match(r"^tau\d\d$", class_name.lower()):
+    elif TAU_MN_PATTERN.match(class_name):
         kwargs["class_name"] = class_name
         return TauMN.from_name(name, **kwargs)
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 import awkward as ak
 import numpy as np
 
+from hml.operations import cache_events, delta_r
 from hml.physics_objects.physics_object import PhysicsObject
 
 from .kinematics import Eta, Phi
@@ -22,11 +23,19 @@ class AngularDistance(Observable):
         ), "Two physics objects are required for angular distance"
 
     def read(self, events) -> None:
-        obj0_eta = Eta(self.physics_object.all[0]).read(events).value
-        obj0_phi = Phi(self.physics_object.all[0]).read(events).value
+        # Both objects share the branch reads and, for constituents, the
+        # matching of eflow objects
+        events = cache_events(events)
+        obj0, obj1 = self.physics_object.all
 
-        obj1_eta = Eta(self.physics_object.all[1]).read(events).value
-        obj1_phi = Phi(self.physics_object.all[1]).read(events).value
+        obj0_eta = Eta(obj0).read(events).value
+        obj0_phi = Phi(obj0).read(events).value
+
+        if obj1 == obj0:
+            obj1_eta, obj1_phi = obj0_eta, obj0_phi
+        else:
+            obj1_eta = Eta(obj1).read(events).value
+            obj1_phi = Phi(obj1).read(events).value
 
         if obj0_eta.ndim == 3:
             obj0_eta = ak.flatten(obj0_eta, axis=-1)
@@ -36,9 +45,13 @@ class AngularDistance(Observable):
             obj1_eta = ak.flatten(obj1_eta, axis=-1)
             obj1_phi = ak.flatten(obj1_phi, axis=-1)
 
-        delta_eta = obj0_eta[:, :, None] - obj1_eta[:, None, :]
-        delta_phi = obj0_phi[:, :, None] - obj1_phi[:, None, :]
-        self._value = np.sqrt(delta_eta**2 + delta_phi**2)
+        value = delta_r(obj0_eta, obj0_phi, obj1_eta, obj1_phi)
+
+        # Pairs with a missing object are None, as the missing object itself
+        if np.any(np.isnan(ak.flatten(value, axis=None))):
+            value = ak.nan_to_none(value)
+
+        self._value = value
 
         return self
 
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import awkward as ak
+
+from hml.operations import pad_slices, slice_to_numpy
+from hml.physics_objects.physics_object import PhysicsObject
+
+from .observable import Observable
+
+
+class Groomed(Observable):
+    """Observable of jets reclustered and groomed from their constituents.
+
+    The physics object is the constituents of jets, e.g. `FatJet0.Constituents`
+    or `FatJet:2.Constituents`, which gives one value per jet. All groomed
+    observables of a jet branch share the reclustering of its constituents,
+    and those of the same groomer share the grooming too.
+
+    Parameters
+    ----------
+    algorithm: str
+        Name of the reclustering algorithm.
+    r: float
+        Radius of the jets, e.g. the R0 of soft drop.
+    chunk_size: int
+        Number of jets reclustered at a time.
+    n_workers: int
+        Number of worker processes that recluster the chunks, see
+        `JetClustering`. It is 1 by default, which reclusters in this process,
+        so the pool is opt-in.
+    """
+
+    groomer = None
+    field = None
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        algorithm: str = "cambridge",
+        r: float = 0.8,
+        chunk_size: int = 10_000,
+        n_workers: int = 1,
+    ) -> None:
+        supported_objects = ["nested"]
+        super().__init__(physics_object, class_name, supported_objects)
+        self.algorithm = algorithm
+        self.r = r
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
+
+        if self.physics_object.slices[1] != slice(None):
+            raise ValueError("Jets are groomed from all of their constituents")
+
+    @property
+    def params(self) -> dict:
+        """Parameters of the groomer."""
+        return {}
+
+    def read(self, events) -> Groomed:
+        from hml.operations import cache_events, find_branch, groom_constituents
+
+        events = cache_events(events)
+        branch = find_branch(events, self.physics_object.branch)
+
+        array = groom_constituents(
+            events,
+            branch,
+            self.algorithm,
+            self.r,
+            self.groomer,
+            chunk_size=self.chunk_size,
+            n_workers=self.n_workers,
+            **self.params,
+        )
+        if self.field is not None:
+            array = getattr(array, self.field)
+
+        slice_ = self.physics_object.slices[0]
+        if slice_.stop is not None:
+            padded = slice_to_numpy(array, slice_, masked=True)
+            if padded is not None:
+                self._value = ak.from_numpy(padded)
+                return self
+
+        self._value = pad_slices(array[:, slice_], [slice_])
+
+        return self
+
+    @property
+    def config(self):
+        config = super().config
+        config.update(
+            {
+                "algorithm": self.algorithm,
+                "r": self.r,
+                "chunk_size": self.chunk_size,
+                "n_workers": self.n_workers,
+                **self.params,
+            }
+        )
+        return config
+
+
+class SoftDropMass(Groomed):
+    """Mass of jets groomed by soft drop.
+
+    Parameters
+    ----------
+    z_cut: float
+        Symmetry cut of the soft drop condition.
+    beta: float
+        Angular exponent, 0 for the modified mass drop tagger.
+    """
+
+    groomer = "soft_drop"
+    field = "mass"
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        algorithm: str = "cambridge",
+        r: float = 0.8,
+        z_cut: float = 0.1,
+        beta: float = 0.0,
+        chunk_size: int = 10_000,
+        n_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            physics_object, class_name, algorithm, r, chunk_size, n_workers
+        )
+        self.z_cut = z_cut
+        self.beta = beta
+
+    @property
+    def params(self) -> dict:
+        return {"beta": self.beta, "z_cut": self.z_cut}
+
+
+SoftDropMass.with_aliases("soft_drop_mass", "MSoftDrop", "m_sd")
+
+
+class TrimmedMass(Groomed):
+    """Mass of jets trimmed of their soft subjets.
+
+    Parameters
+    ----------
+    r_trim: float
+        Radius of the subjets, taken from the reclustering of the jet, which
+        is why only the cambridge algorithm is supported.
+    f_cut: float
+        Minimum fraction of the jet pt kept by a subjet.
+    """
+
+    groomer = "trimming"
+    field = "mass"
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        algorithm: str = "cambridge",
+        r: float = 0.8,
+        r_trim: float = 0.2,
+        f_cut: float = 0.03,
+        chunk_size: int = 10_000,
+        n_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            physics_object, class_name, algorithm, r, chunk_size, n_workers
+        )
+        self.r_trim = r_trim
+        self.f_cut = f_cut
+
+        if algorithm != "cambridge":
+            raise ValueError(f"Trimming needs the cambridge algorithm, got {algorithm}")
+
+    @property
+    def params(self) -> dict:
+        return {"f_cut": self.f_cut, "r_trim": self.r_trim}
+
+
+TrimmedMass.with_aliases("trimmed_mass", "MTrimmed", "m_trim")
+
+
+class PrunedMass(Groomed):
+    """Mass of jets pruned during their reclustering.
+
+    Parameters
+    ----------
+    z_cut: float
+        Minimum pt fraction of a merging.
+    r_cut_factor: float
+        Factor of 2 m / pt of the jet above which soft mergings are pruned.
+    """
+
+    groomer = "pruning"
+    field = "mass"
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        algorithm: str = "cambridge",
+        r: float = 0.8,
+        z_cut: float = 0.1,
+        r_cut_factor: float = 0.5,
+        chunk_size: int = 10_000,
+        n_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            physics_object, class_name, algorithm, r, chunk_size, n_workers
+        )
+        self.z_cut = z_cut
+        self.r_cut_factor = r_cut_factor
+
+    @property
+    def params(self) -> dict:
+        return {"r_cut_factor": self.r_cut_factor, "z_cut": self.z_cut}
+
+
+PrunedMass.with_aliases("pruned_mass", "MPruned", "m_prune")
+
+
+class EnergyCorrelation(Groomed):
+    """Energy correlation function ratio of jets, e.g. D2 or C2.
+
+    Parameters
+    ----------
+    ratio: str
+        Name of the ratio in FastJet, e.g. "d2", "c2" or "n2".
+    beta: float
+        Angular exponent.
+    """
+
+    groomer = "energy_correlator"
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        algorithm: str = "cambridge",
+        r: float = 0.8,
+        ratio: str = "d2",
+        beta: float = 1.0,
+        chunk_size: int = 10_000,
+        n_workers: int = 1,
+    ) -> None:
+        super().__init__(
+            physics_object, class_name, algorithm, r, chunk_size, n_workers
+        )
+        self.ratio = ratio
+        self.beta = beta
+
+    @property
+    def params(self) -> dict:
+        return {"beta": self.beta, "ratio": self.ratio}
+
+    @classmethod
+    def from_name(cls, name: str, **kwargs) -> EnergyCorrelation:
+        *parts, class_name = name.split(".")
+        physics_object = ".".join(parts) if len(parts) > 0 else None
+
+        # The ratio can be given by its name, e.g. "FatJet0.Constituents.D2"
+        if class_name.lower() in ["c2", "d2", "n2"]:
+            kwargs.setdefault("ratio", class_name.lower())
+        kwargs.setdefault("class_name", class_name)
+
+        return cls(physics_object, **kwargs)
+
+
+EnergyCorrelation.with_aliases(
+    "energy_correlation", "ECF", "C2", "D2", "N2", "c2", "d2", "n2"
+)
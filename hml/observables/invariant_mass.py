@@ -7,7 +7,7 @@ import vector
 
 from hml.physics_objects.physics_object import PhysicsObject
 
-from ..operations import branch_to_momentum4d
+from ..operations import branch_to_momentum4d, find_branch
 from .observable import Observable
 
 vector.register_awkward()
@@ -23,14 +23,21 @@ class InvariantMass(Observable):
         super().__init__(physics_object, class_name, supported_objects)
 
     def read(self, events):
-        all_keys = {i.lower(): i for i in events.keys(full_paths=False)}
-
-        momenta = []
+        # Objects of the same branch are sliced from one padded momentum array
+        branches = {}
         for obj in self.physics_object.all:
-            momentum4d = branch_to_momentum4d(events, all_keys[obj.branch.lower()])
-            padded_momentum4d = ak.pad_none(momentum4d[:, obj.slices[0]], 1)
-            momenta.append(padded_momentum4d)
+            branches.setdefault(find_branch(events, obj.branch), []).append(obj)
+
+        components = {}
+        for branch, objects in branches.items():
+            momentum4d = branch_to_momentum4d(events, branch)
+            length = max(obj.index for obj in objects) + 1
+            padded = ak.pad_none(momentum4d[:, :length], length, clip=True)
+
+            for obj in objects:
+                components[obj] = padded[:, obj.slices[0]]
 
+        momenta = [components[obj] for obj in self.physics_object.all]
         total = reduce(lambda x, y: x + y, momenta)
         self._value = total.mass
 
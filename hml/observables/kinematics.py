@@ -57,6 +57,8 @@ E.with_aliases("Energy", "energy", "e")
 
 
 class Pt(Observable):
+    component = "pt"
+
     def __init__(
         self,
         physics_object: str | PhysicsObject,
@@ -70,6 +72,8 @@ Pt.with_aliases("TransverseMomentum", "transverse_momentum", "pt", "PT", "pT")
 
 
 class Eta(Observable):
+    component = "eta"
+
     def __init__(
         self,
         physics_object: str | PhysicsObject,
@@ -83,6 +87,8 @@ Eta.with_aliases("Pseudorapidity", "pseudorapidity", "eta")
 
 
 class Phi(Observable):
+    component = "phi"
+
     def __init__(
         self,
         physics_object: str | PhysicsObject,
@@ -96,6 +102,8 @@ Phi.with_aliases("AzimuthalAngle", "azimuthal_angle", "phi")
 
 
 class M(Observable):
+    component = "mass"
+
     def __init__(
         self,
         physics_object: str | PhysicsObject,
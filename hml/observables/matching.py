@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import awkward as ak
+import numpy as np
+
+from hml.operations import cache_events, delta_r
+from hml.physics_objects.physics_object import PhysicsObject
+
+from .kinematics import Eta, Phi, Pt
+from .observable import Observable
+
+
+class MinDeltaR(Observable):
+    """Angular distance of each first object to the nearest second object.
+
+    For example, `Jet,Electron.MinDeltaR` is the distance of each jet to its
+    nearest electron, shape (n, var). Objects of the same branch are matched
+    against the other objects only, e.g. `Jet0,Jet.MinDeltaR` skips the
+    leading jet itself. Without any second object, the distance is None.
+    """
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+    ) -> None:
+        supported_objects = ["single", "collective", "multiple"]
+        super().__init__(physics_object, class_name, supported_objects)
+        assert (
+            len(self.physics_object.all) == 2
+        ), "Two physics objects are required for matching"
+
+    def read(self, events) -> MinDeltaR:
+        events = cache_events(events)
+        eta0, phi0, eta1, phi1 = _read_coordinates(self.physics_object, events)
+        kwargs = _self_matching(self.physics_object)
+
+        value = delta_r(eta0, phi0, eta1, phi1, mode="min", **kwargs)
+        self._value = ak.nan_to_none(value)
+
+        return self
+
+
+MinDeltaR.with_aliases("min_delta_r", "MinDR", "min_dr")
+
+
+class IsolationSum(Observable):
+    """Sum of the pt of second objects within `r` of each first object.
+
+    For example, `Muon,EFlowTrack.IsolationSum` is the track isolation of each
+    muon, shape (n, var). Missing first objects give None.
+
+    Parameters
+    ----------
+    r: float
+        Radius of the isolation cone.
+    """
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        r: float = 0.4,
+    ) -> None:
+        supported_objects = ["single", "collective", "multiple"]
+        super().__init__(physics_object, class_name, supported_objects)
+        assert (
+            len(self.physics_object.all) == 2
+        ), "Two physics objects are required for isolation"
+        self.r = r
+
+    def read(self, events) -> IsolationSum:
+        events = cache_events(events)
+        eta0, phi0, eta1, phi1 = _read_coordinates(self.physics_object, events)
+        pt1 = Pt(self.physics_object.all[1]).read(events).value
+        kwargs = _self_matching(self.physics_object)
+
+        value = delta_r(eta0, phi0, eta1, phi1, "sum", self.r, pt1, **kwargs)
+        self._value = _mask_missing(value, eta0)
+
+        return self
+
+    @property
+    def config(self):
+        config = super().config
+        config.update({"r": self.r})
+        return config
+
+
+IsolationSum.with_aliases("isolation_sum", "Isolation", "isolation")
+
+
+class OverlapRemoval(Observable):
+    """Whether each first object has no second object within `r`.
+
+    For example, `Jet,Electron.OverlapRemoval` is True for jets that do not
+    overlap with any electron, shape (n, var). Missing first objects give None.
+
+    Parameters
+    ----------
+    r: float
+        Radius within which objects overlap.
+    """
+
+    def __init__(
+        self,
+        physics_object: str | PhysicsObject,
+        class_name: str | None = None,
+        r: float = 0.4,
+    ) -> None:
+        supported_objects = ["single", "collective", "multiple"]
+        super().__init__(physics_object, class_name, supported_objects)
+        assert (
+            len(self.physics_object.all) == 2
+        ), "Two physics objects are required for overlap removal"
+        self.r = r
+
+    def read(self, events) -> OverlapRemoval:
+        events = cache_events(events)
+        eta0, phi0, eta1, phi1 = _read_coordinates(self.physics_object, events)
+        kwargs = _self_matching(self.physics_object)
+
+        counts = delta_r(eta0, phi0, eta1, phi1, "count", self.r, **kwargs)
+        self._value = _mask_missing(counts == 0, eta0)
+
+        return self
+
+    @property
+    def config(self):
+        config = super().config
+        config.update({"r": self.r})
+        return config
+
+
+OverlapRemoval.with_aliases("overlap_removal")
+
+
+def _read_coordinates(physics_object: PhysicsObject, events) -> tuple[ak.Array, ...]:
+    obj0, obj1 = physics_object.all
+
+    eta0 = Eta(obj0).read(events).value
+    phi0 = Phi(obj0).read(events).value
+
+    if obj1 == obj0:
+        eta1, phi1 = eta0, phi0
+    else:
+        eta1 = Eta(obj1).read(events).value
+        phi1 = Phi(obj1).read(events).value
+
+    return eta0, phi0, eta1, phi1
+
+
+def _self_matching(physics_object: PhysicsObject) -> dict:
+    # Objects of the same branch are not matched to themselves, which needs
+    # the shift between the indices of the two slices
+    obj0, obj1 = physics_object.all
+    if obj0.branch != obj1.branch:
+        return {}
+
+    offset = (obj0.slices[0].start or 0) - (obj1.slices[0].start or 0)
+    return {"exclude_self": True, "self_offset": offset}
+
+
+def _mask_missing(value: ak.Array, eta: ak.Array) -> ak.Array:
+    # Missing first objects, either None or NaN padding, are None
+    is_present = ak.fill_none(~np.isnan(eta), False)
+    if ak.all(is_present):
+        return value
+
+    return ak.mask(value, is_present)
@@ -2,61 +2,91 @@ from __future__ import annotations
 
 import awkward as ak
 
+from hml.operations import (
+    constituents_to_n_subjettiness,
+    find_branch,
+    pad_slices,
+    slice_to_numpy,
+)
 from hml.physics_objects.physics_object import PhysicsObject
 
 from .observable import Observable
 
 
 class NSubjettiness(Observable):
+    """N-subjettiness tau_n of jets.
+
+    It is read from the "Tau[5]" branch of Delphes when it exists, otherwise
+    computed from the jet constituents with exclusive kt axes. Setting `beta`
+    or `r0` always computes it from the constituents, with defaults of 1.0 and
+    0.8 for the other one. Objects without either branch, like the subjets of
+    `Image.with_subjets`, raise a ValueError.
+
+    Parameters
+    ----------
+    n: int
+        Number of subjet axes.
+    beta: float, optional
+        Angular exponent.
+    r0: float, optional
+        Characteristic jet radius of the normalization.
+    """
+
     def __init__(
         self,
         n: int,
         physics_object: str | PhysicsObject,
         class_name: str | None = None,
+        beta: float | None = None,
+        r0: float | None = None,
     ) -> None:
         supported_objects = ["single", "collective"]
         super().__init__(physics_object, class_name, supported_objects)
         self.n = n
+        self.beta = beta
+        self.r0 = r0
 
     def read(self, events):
-        all_keys = {i.lower(): i for i in events.keys(full_paths=False)}
-        branch = self.physics_object.branch.lower()
+        branch = self.physics_object.branch
         slices = self.physics_object.slices
 
-        if f"{branch}.tau[5]" in all_keys:
-            key = all_keys[f"{branch}.tau[5]"]
-            array = events[key].array()[:, slices[0]]
-            value = array[:, :, self.n - 1]
+        from_branch = self.beta is None and self.r0 is None and self.n <= 5
+        taus_key = find_branch(events, f"{branch}.tau[5]") if from_branch else None
+        if taus_key is not None:
+            array = events[taus_key].array()[:, :, self.n - 1]
+
+        elif (key := find_branch(events, f"{branch}.constituents")) is not None:
+            taus = constituents_to_n_subjettiness(
+                events,
+                key,
+                max(self.n, 5),
+                1.0 if self.beta is None else self.beta,
+                0.8 if self.r0 is None else self.r0,
+            )
+            array = taus[:, :, self.n - 1]
 
         else:
-            raise ValueError
-
-        for i, slice_ in enumerate(slices):
-            if slice_.stop is not None:
-                start = slice_.start if slice_.start is not None else 0
-                required_length = slice_.stop - start
-
-                if i + 1 == len(slices) and ak.any(
-                    ak.num(value, i + 1) < required_length
-                ):
-                    value = ak.pad_none(value, required_length, axis=i + 1)
+            # Subjets of Image.with_subjets, e.g. SubJet0, are not in the events
+            raise ValueError(
+                f"{self.name} needs the {branch}.Tau[5] or {branch}.Constituents "
+                "branch, only jets with their constituents are supported"
+            )
 
-                else:
-                    n_missing = required_length - ak.num(value, i + 1)
-                    if ak.sum(n_missing) > 0:
-                        pad = ak.unflatten(
-                            ak.Array([[]] * ak.sum(n_missing)), n_missing
-                        )
-                        value = ak.concatenate([value, pad], axis=i + 1)
+        # Bounded slices of numbers are filled into a masked array
+        if slices[0].stop is not None:
+            padded = slice_to_numpy(array, slices[0], masked=True)
+            if padded is not None:
+                self._value = ak.from_numpy(padded)
+                return self
 
-        self._value = value
+        self._value = pad_slices(array[:, slices[0]], slices)
 
         return self
 
     @property
     def config(self):
         config = super().config
-        config.update({"n": self.n})
+        config.update({"n": self.n, "beta": self.beta, "r0": self.r0})
         return config
 
 
@@ -75,7 +105,8 @@ class TauN(NSubjettiness):
             else:
                 n = kwargs["n"]
 
-        return cls(n, physics_object, class_name)
+        beta, r0 = kwargs.get("beta"), kwargs.get("r0")
+        return cls(n, physics_object, class_name, beta, r0)
 
 
 TauN.with_aliases("tau_n")
@@ -88,14 +119,18 @@ class NSubjettinessRatio(Observable):
         n: int,
         physics_object: str | PhysicsObject,
         class_name: str | None = None,
+        beta: float | None = None,
+        r0: float | None = None,
     ) -> None:
         supported_objects = ["single", "collective"]
         super().__init__(physics_object, class_name, supported_objects)
         self.m = m
         self.n = n
+        self.beta = beta
+        self.r0 = r0
 
-        self.tau_m = TauN(m, physics_object)
-        self.tau_n = TauN(n, physics_object)
+        self.tau_m = TauN(m, physics_object, beta=beta, r0=r0)
+        self.tau_n = TauN(n, physics_object, beta=beta, r0=r0)
 
     def read(self, events):
         self.tau_m.read(events)
@@ -108,7 +143,7 @@ class NSubjettinessRatio(Observable):
     @property
     def config(self):
         config = super().config
-        config.update({"m": self.m, "n": self.n})
+        config.update({"m": self.m, "n": self.n, "beta": self.beta, "r0": self.r0})
         return config
 
 
@@ -132,7 +167,8 @@ class TauMN(NSubjettinessRatio):
             else:
                 n = kwargs["n"]
 
-        return cls(m, n, physics_object, class_name)
+        beta, r0 = kwargs.get("beta"), kwargs.get("r0")
+        return cls(m, n, physics_object, class_name, beta, r0)
 
 
 TauMN.with_aliases("tau_mn")
@@ -2,13 +2,24 @@ from __future__ import annotations
 
 import awkward as ak
 
-from ..operations import branch_to_momentum4d, constituents_to_momentum4d
+from ..operations import (
+    branch_to_component,
+    branch_to_momentum4d,
+    constituents_to_component,
+    constituents_to_momentum4d,
+    find_branch,
+    pad_slices,
+    slice_to_numpy,
+)
 from ..physics_objects import PhysicsObject, is_collective, is_multiple, is_single
 from ..physics_objects import parse_physics_object as parse_object
 
 
 class Observable:
     aliases = {}
+    # Momentum component read from its own leaves, e.g. "pt" from Jet.PT. Other
+    # kinematics are derived from the four-momentum.
+    component = None
 
     def __init__(
         self,
@@ -20,6 +31,7 @@ class Observable:
         self._class_name = self._init_class_name(class_name)
         self._supported_objects = self._init_supported_objects(supported_objects)
         self._validate_physics_object()
+        self._value = None
 
     def __init_subclass__(cls, **kwargs):
         cls.aliases[cls.__name__] = cls
@@ -79,10 +91,13 @@ class Observable:
         if isinstance(other, str):
             other = self.from_name(other)
 
-        return (
-            self.physics_object == other.physics_object
-            and self.__class__ == other.__class__
-        )
+        if not isinstance(other, Observable):
+            return NotImplemented
+
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
 
     def __repr__(self) -> str:
         return f"{self.name}: {self.value.type!s}"
@@ -99,15 +114,29 @@ class Observable:
     def supported_objects(self) -> list[str] | None:
         return self._supported_objects
 
+    @property
+    def _value(self) -> ak.Array | None:
+        return self._raw_value
+
+    @_value.setter
+    def _value(self, value: ak.Array | None) -> None:
+        # Setting a new value invalidates the cached regular value and its type
+        self._raw_value = value
+        self._regular_value = None
+        self._shape = None
+        self._dtype = None
+
     @property
     def value(self) -> ak.Array:
-        if not hasattr(self, "_value"):
-            self._value = ak.Array([])
+        if self._regular_value is None:
+            value = self._raw_value if self._raw_value is not None else ak.Array([])
 
-        try:
-            return ak.to_regular(self._value, axis=None)
-        except Exception:
-            return self._value
+            try:
+                self._regular_value = ak.to_regular(value, axis=None)
+            except Exception:
+                self._regular_value = value
+
+        return self._regular_value
 
     @property
     def name(self) -> str:
@@ -116,6 +145,22 @@ class Observable:
         else:
             return self.class_name
 
+    @property
+    def key(self) -> tuple:
+        """Hashable identity of the observable
+
+        Two observables with the same class, physics object and extra
+        configurations (like `n` of `TauN`) read the same values, no matter
+        which alias they were created with.
+        """
+        extra = {
+            k: v
+            for k, v in self.config.items()
+            if k not in ["physics_object", "class_name"]
+        }
+
+        return (self.__class__, self.physics_object, tuple(sorted(extra.items())))
+
     @property
     def config(self) -> dict:
         return {
@@ -127,50 +172,44 @@ class Observable:
         if "multiple" in self.supported_objects:
             raise NotImplementedError
 
-        all_keys = {i.lower(): i for i in events.keys(full_paths=False)}
-        branch = self.physics_object.branch.lower()
+        branch = find_branch(events, self.physics_object.branch)
         slices = self.physics_object.slices
 
         if branch is None:
             raise ValueError(f"Branch {self.physics_object.branch} not found")
 
+        name = self.__class__.__name__.lower()
         if is_single(self.physics_object) or is_collective(self.physics_object):
-            if f"{branch}.{self.__class__.__name__.lower()}" in all_keys:
-                key = all_keys[f"{branch}.{self.__class__.__name__.lower()}"]
+            if self.component is not None:
+                value = branch_to_component(events, branch, self.component)
+
+            elif (key := find_branch(events, f"{branch}.{name}")) is not None:
                 value = events[key].array()
 
             else:
-                array = branch_to_momentum4d(events, all_keys[branch])
-                value = getattr(array, self.__class__.__name__.lower())
+                array = branch_to_momentum4d(events, branch)
+                value = getattr(array, name)
+
+            # Bounded slices of numbers are filled into a masked array
+            if slices[0].stop is not None:
+                padded = slice_to_numpy(value, slices[0], masked=True)
+                if padded is not None:
+                    self._value = ak.from_numpy(padded)
+                    return self
+
+        elif self.component is not None:
+            value = constituents_to_component(events, branch, self.component)
 
         else:
-            array = constituents_to_momentum4d(events, all_keys[branch])
-            value = getattr(array, self.__class__.__name__.lower())
+            array = constituents_to_momentum4d(events, branch)
+            value = getattr(array, name)
 
         if len(slices) == 1:
             value = value[:, slices[0]]
         else:
             value = value[:, slices[0], slices[1]]
 
-        for i, slice_ in enumerate(slices):
-            if slice_.stop is not None:
-                start = slice_.start if slice_.start is not None else 0
-                required_length = slice_.stop - start
-
-                if i + 1 == len(slices) and ak.any(
-                    ak.num(value, i + 1) < required_length
-                ):
-                    value = ak.pad_none(value, required_length, axis=i + 1)
-
-                else:
-                    n_missing = required_length - ak.num(value, i + 1)
-                    if ak.sum(n_missing) > 0:
-                        pad = ak.unflatten(
-                            ak.Array([[]] * ak.sum(n_missing)), n_missing
-                        )
-                        value = ak.concatenate([value, pad], axis=i + 1)
-
-        self._value = value
+        self._value = pad_slices(value, slices)
 
         return self
 
@@ -190,11 +229,36 @@ class Observable:
         return cls(**config)
 
     @property
-    def shape(self) -> str:
-        *parts, _ = str(self.value.type).split(" * ")
-        return tuple(parts)
+    def shape(self) -> tuple[int | None, ...]:
+        """Shape of the value, with `None` for variable-length dimensions."""
+        if self._shape is None:
+            self._shape, self._dtype = _parse_type(self.value.type)
+
+        return self._shape
 
     @property
-    def dtype(self) -> type:
-        *_, dtype = str(self.value.type).split(" * ")
-        return dtype
+    def dtype(self) -> str:
+        """Type of the innermost values, e.g. "float32"."""
+        if self._dtype is None:
+            self._shape, self._dtype = _parse_type(self.value.type)
+
+        return self._dtype
+
+
+def _parse_type(type_: ak.types.ArrayType) -> tuple[tuple[int | None, ...], str]:
+    shape = [type_.length]
+    content = type_.content
+
+    while True:
+        if isinstance(content, ak.types.OptionType):
+            content = content.content
+        elif isinstance(content, ak.types.RegularType):
+            shape.append(content.size)
+            content = content.content
+        elif isinstance(content, ak.types.ListType):
+            shape.append(None)
+            content = content.content
+        else:
+            break
+
+    return tuple(shape), str(content)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from ..operations import cache_events
+from .observable import Observable
+
+
+class Planner:
+    """Read observables together, evaluating their common parts only once.
+
+    Observables requested by a `Set`, `Cut` or `Image` often share branches
+    and intermediate arrays: `Jet0.Pt`, `Jet1.Pt` and `Jet0,Jet1.InvMass` all
+    need the jet momenta, and `FatJet0.TauMN` reads the same tau array twice.
+    The planner reads equal observables once on events wrapped in
+    `CachedEvents`, so each branch read and intermediate array is evaluated
+    once per chunk of events. The resulting DAG is available as `plan`, where
+    observables are keyed by their `key`, so observables of the same name but
+    different configurations, e.g. the `r` of `OverlapRemoval`, are read apart.
+
+    Parameters
+    ----------
+    observables: list[Observable]
+        Observables to read.
+    """
+
+    def __init__(self, observables: list[Observable]) -> None:
+        self.observables = observables
+        self.events = None
+
+    def read(self, events) -> Planner:
+        self.events = cache_events(events)
+
+        unique = {}
+        for obs in self.observables:
+            unique.setdefault(obs, []).append(obs)
+
+        # Values are cached rather than observables, so that later changes to
+        # an observable, like flattening in `Image`, do not leak to the others
+        for obs, equals in unique.items():
+            node = ("observable", obs.key)
+            value = self.events.evaluate(node, self._read, obs, self.events)
+
+            for other in equals:
+                other._value = value
+
+        return self
+
+    @staticmethod
+    def _read(obs: Observable, events):
+        return obs.read(events)._value
+
+    @property
+    def plan(self) -> dict[tuple, list[tuple]]:
+        """Dependencies of each node evaluated in the last `read`"""
+        return self.events.nodes if self.events is not None else {}
+
+    def summary(self) -> None:
+        """Print the plan as a tree under each observable.
+
+        Nodes used more than once are marked with the number of uses, and their
+        dependencies are only listed the first time.
+        """
+        expanded = set()
+        names = {("observable", obs.key): obs.name for obs in self.observables}
+
+        def _format(node, depth):
+            kind, name = node
+            name = names.get(node, name)
+            line = f"{'  ' * depth}- {kind}: {name}"
+            if self.events.hits[node] > 0:
+                line += f" (x{self.events.hits[node] + 1})"
+
+            lines = [line]
+            if node not in expanded:
+                expanded.add(node)
+                for child in self.plan[node]:
+                    lines += _format(child, depth + 1)
+
+            return lines
+
+        output = []
+        for node in self.plan:
+            if node[0] == "observable":
+                output += _format(node, 0)
+
+        print("\n".join(output))
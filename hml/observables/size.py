@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from ..operations import find_branch
 from ..physics_objects import PhysicsObject
 from .observable import Observable
 
@@ -14,11 +15,9 @@ class Size(Observable):
         super().__init__(physics_object, class_name, supported_objects)
 
     def read(self, events) -> Observable:
-        all_keys = {i.lower(): i for i in events.keys(full_paths=False)}
         branch = self.physics_object.branch.lower()
 
-        if f"{branch}_size" in all_keys:
-            key = all_keys[f"{branch}_size"]
+        if (key := find_branch(events, f"{branch}_size")) is not None:
             value = events[key].array()
         else:
             raise KeyError(f"Key {branch}_size not found in the events.")
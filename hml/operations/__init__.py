@@ -1,8 +1,69 @@
-from .fastjet_ops import get_jet_algorithm
-from .keras_ops import ops_histogram_fixed_width, ops_unique
-from .uproot_ops import (
-    branch_to_momentum4d,
-    constituents_to_momentum4d,
-    find_eflow_in_refs,
-    take_momentum4d,
-)
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .awkward_ops import delta_r, knn, n_subjettiness, pad_slices, slice_to_numpy
+    from .fastjet_ops import (
+        JetClustering,
+        constituents_to_jet_clustering,
+        get_jet_algorithm,
+        groom_constituents,
+    )
+    from .keras_ops import ops_histogram_fixed_width, ops_unique
+    from .uproot_ops import (
+        CachedEvents,
+        branch_to_component,
+        branch_to_momentum4d,
+        cache_events,
+        constituents_to_component,
+        constituents_to_indices,
+        constituents_to_momentum4d,
+        constituents_to_n_subjettiness,
+        find_branch,
+        find_eflow_in_refs,
+        take_momentum4d,
+    )
+
+# Operations are grouped by the library they rely on; each module is only
+# imported once one of its functions is used (PEP 562).
+OPERATIONS = {
+    "delta_r": "awkward_ops",
+    "knn": "awkward_ops",
+    "n_subjettiness": "awkward_ops",
+    "pad_slices": "awkward_ops",
+    "slice_to_numpy": "awkward_ops",
+    "JetClustering": "fastjet_ops",
+    "constituents_to_jet_clustering": "fastjet_ops",
+    "get_jet_algorithm": "fastjet_ops",
+    "groom_constituents": "fastjet_ops",
+    "ops_histogram_fixed_width": "keras_ops",
+    "ops_unique": "keras_ops",
+    "CachedEvents": "uproot_ops",
+    "cache_events": "uproot_ops",
+    "branch_to_component": "uproot_ops",
+    "branch_to_momentum4d": "uproot_ops",
+    "constituents_to_component": "uproot_ops",
+    "constituents_to_indices": "uproot_ops",
+    "constituents_to_momentum4d": "uproot_ops",
+    "constituents_to_n_subjettiness": "uproot_ops",
+    "find_branch": "uproot_ops",
+    "find_eflow_in_refs": "uproot_ops",
+    "take_momentum4d": "uproot_ops",
+}
+
+__all__ = list(OPERATIONS)
+
+
+def __getattr__(name):
+    if name in OPERATIONS:
+        value = getattr(import_module(f".{OPERATIONS[name]}", __name__), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(OPERATIONS))
@@ -0,0 +1,632 @@
+from __future__ import annotations
+
+import awkward as ak
+import numba as nb
+import numpy as np
+
+from ..config import floatx
+
+
+def pad_slices(array: ak.Array, slices: list[slice]) -> ak.Array:
+    """Pad lists sliced by `slices` to the length of their slices.
+
+    Each slice with a stop pads the lists on its axis, starting from axis 1,
+    to `stop - start`. Lists on the last sliced axis are padded with None and
+    lists on outer axes with empty lists, which the next axis then pads with
+    None. For example, `Jet:5.Constituents:100` gives a regular array of shape
+    `(n, 5, 100)`.
+
+    The padded layouts are built from the list offsets in one pass per axis,
+    and axes that are already long enough are left untouched.
+
+    Parameters
+    ----------
+    array: ak.Array
+        Array already sliced by `slices` on its inner axes.
+    slices: list[slice]
+        Slices of the physics object, one per axis after the first.
+
+    Return
+    ------
+    padded: ak.Array
+    """
+    lengths = []
+    for slice_ in slices:
+        if slice_.stop is None:
+            lengths.append(None)
+        else:
+            lengths.append(slice_.stop - (slice_.start or 0))
+
+    if all(i is None for i in lengths):
+        return array
+
+    layout = _pad_lists(ak.to_layout(array), lengths)
+    return ak.Array(layout, behavior=array.behavior)
+
+
+def _pad_lists(layout, lengths: list[int | None]):
+    if len(lengths) == 0:
+        return layout
+
+    layout, missing = _to_lists(layout)
+    if missing is not None:
+        # Missing lists stay missing, only the others are padded
+        content = _pad_lists(layout, lengths)
+        return ak.contents.IndexedOptionArray.simplified(
+            ak.index.Index64(missing), content
+        )
+
+    offsets = np.asarray(layout.offsets.data)
+    counts = np.diff(offsets)
+    length, *lengths = lengths
+
+    # Nothing to pad on this axis, continue with the inner ones
+    if length is None or np.all(counts >= length):
+        content = _pad_lists(layout.content, lengths)
+        return ak.contents.ListOffsetArray(layout.offsets, content)
+
+    # Position of each padded element in the content, -1 for the padding
+    positions = offsets[:-1, None] + np.arange(length)
+    is_padding = np.arange(length) >= counts[:, None]
+    index = np.where(is_padding, -1, positions).ravel()
+
+    if len(lengths) == 0:
+        content = ak.contents.IndexedOptionArray.simplified(
+            ak.index.Index64(index), layout.content
+        )
+
+    else:
+        # Outer axes are padded with empty lists, missing lists are kept
+        inner, missing = _to_lists(layout.content)
+        inner_offsets = np.asarray(inner.offsets.data)
+
+        source = index
+        if missing is not None:
+            is_valid = index >= 0
+            source = index.copy()
+            source[is_valid] = missing[index[is_valid]]
+            is_missing = is_valid & (source < 0)
+
+        # The padding and missing lists are empty ones at the end of the
+        # offsets, which also works when there are no lists at all, e.g. in a
+        # chunk of events without any jet
+        inner_offsets = np.append(inner_offsets, inner_offsets[-1])
+        source = np.where(source < 0, len(inner_offsets) - 2, source)
+        content = ak.contents.ListArray(
+            ak.index.Index64(inner_offsets[source]),
+            ak.index.Index64(inner_offsets[source + 1]),
+            inner.content,
+        )
+
+        if missing is not None:
+            option_index = np.where(is_missing, -1, np.arange(len(index)))
+            content = ak.contents.IndexedOptionArray.simplified(
+                ak.index.Index64(option_index), content
+            )
+
+        content = _pad_lists(content, lengths)
+
+    return ak.contents.RegularArray(content, length, zeros_length=len(counts))
+
+
+def _to_lists(layout):
+    # Lists of a layout as a ListOffsetArray, and the index of the missing
+    # ones if the lists are optional
+    missing = None
+    if layout.is_option:
+        layout = layout.to_IndexedOptionArray64()
+        missing = np.asarray(layout.index.data)
+        layout = layout.content
+
+    if layout.is_indexed:
+        layout = layout.project()
+
+    if isinstance(layout, ak.contents.EmptyArray):
+        # No lists at all, e.g. the jets of events without any jet
+        offsets = ak.index.Index64(np.zeros(1, dtype=np.int64))
+        layout = ak.contents.ListOffsetArray(offsets, layout)
+
+    if not layout.is_list:
+        raise TypeError(f"Expected lists to pad, got {layout.__class__.__name__}")
+
+    return layout.to_ListOffsetArray64(True), missing
+
+
+def slice_to_numpy(
+    array: ak.Array, slice_: slice, dtype: str | None = None, masked: bool = False
+) -> np.ndarray | None:
+    """Slice lists on axis 1 into a regular NumPy array padded with NaN.
+
+    It is the fixed-shape path of `array[:, slice_]` followed by `pad_slices`
+    and `ak.fill_none(..., np.nan)`: the output of shape `(n, stop - start)` is
+    filled straight from the list offsets and the flat content, without any
+    intermediate awkward array.
+
+    Parameters
+    ----------
+    array: ak.Array
+        Jagged array of shape `(n, var)` with numbers in the lists.
+    slice_: slice
+        Slice with non-negative start and stop, and no step.
+    dtype: str, optional
+        Data type of the output, defaults to `hml.config.floatx()`.
+    masked: bool
+        Return a masked array with the padding masked when some objects are
+        missing, so that they stay apart from NaN values in the lists.
+        `ak.from_numpy` turns it into an option type, as `pad_slices` does.
+
+    Return
+    ------
+    output: np.ndarray, np.ma.MaskedArray or None
+        None if the array is not made of lists of numbers, e.g. it has missing
+        values or records.
+    """
+    layout = ak.to_layout(array)
+    if not layout.is_list or not layout.content.is_numpy:
+        return
+
+    layout = layout.to_ListOffsetArray64(False)
+    content = layout.content.data
+    if content.ndim != 1 or content.dtype.kind not in "biuf":
+        return
+
+    start = slice_.start or 0
+    offsets = np.asarray(layout.offsets.data)
+    counts = np.diff(offsets)
+
+    columns = np.arange(start, slice_.stop)
+    is_valid = columns < counts[:, None]
+    dtype = dtype if dtype is not None else floatx()
+    output = np.full((len(counts), len(columns)), np.nan, dtype=dtype)
+    output[is_valid] = content[(offsets[:-1, None] + columns)[is_valid]]
+
+    if masked and not is_valid.all():
+        return np.ma.MaskedArray(output, mask=~is_valid)
+
+    return output
+
+
+def delta_r(
+    eta0: ak.Array,
+    phi0: ak.Array,
+    eta1: ak.Array,
+    phi1: ak.Array,
+    mode: str = "matrix",
+    r: float | None = None,
+    weights: ak.Array | None = None,
+    exclude_self: bool = False,
+    self_offset: int = 0,
+) -> ak.Array:
+    """Angular distance between two collections of objects in each event.
+
+    The distances are computed by numba kernels over the flat buffers, with
+    the difference in phi wrapped into [-pi, pi]. Missing objects, either None
+    or NaN, have NaN distances.
+
+    Parameters
+    ----------
+    eta0, phi0: ak.Array
+        Pseudorapidity and azimuth of the first objects, shape (n, var).
+    eta1, phi1: ak.Array
+        Pseudorapidity and azimuth of the second objects, shape (n, var).
+    mode: str
+        "matrix" for all pairs, shape (n, var, var); "min" for the distance to
+        the nearest second object, shape (n, var); "count" for the number of
+        second objects closer than `r`, shape (n, var); "sum" for the sum of
+        `weights` of these objects, shape (n, var). All but the first do not
+        allocate the pair matrix.
+    r: float, optional
+        Radius of the "count" and "sum" modes.
+    weights: ak.Array, optional
+        Weights of the second objects summed by the "sum" mode, e.g. their pt.
+    exclude_self: bool
+        Skip the pairs of the same object, for the nearest or close objects of
+        a collection in itself.
+    self_offset: int
+        Index of the first objects minus that of the second objects in their
+        common collection, e.g. 1 for `Jet1:` against `Jet`.
+
+    Return
+    ------
+    distances: ak.Array
+    """
+    (eta0, phi0), counts0, offsets0 = _flatten_lists(eta0, phi0)
+    (eta1, phi1), counts1, offsets1 = _flatten_lists(eta1, phi1)
+    dtype = np.result_type(eta0, phi0, eta1, phi1, np.float32)
+
+    if mode == "matrix":
+        pair_counts = counts0 * counts1
+        pair_offsets = np.zeros(len(pair_counts) + 1, dtype=np.int64)
+        np.cumsum(pair_counts, out=pair_offsets[1:])
+
+        out = np.empty(pair_offsets[-1], dtype=dtype)
+        delta_r_matrix(eta0, phi0, offsets0, eta1, phi1, offsets1, pair_offsets, out)
+        out = ak.unflatten(out, np.repeat(counts1, counts0))
+
+    elif mode == "min":
+        out = np.empty(len(eta0), dtype=dtype)
+        delta_r_min(
+            eta0, phi0, offsets0, eta1, phi1, offsets1, exclude_self, self_offset, out
+        )
+
+    elif mode in ["count", "sum"]:
+        if r is None:
+            raise ValueError(f'The radius "r" is required by the "{mode}" mode')
+
+        if mode == "count":
+            out = np.empty(len(eta0), dtype=np.int32)
+            args = (r, exclude_self, self_offset, out)
+            delta_r_count(eta0, phi0, offsets0, eta1, phi1, offsets1, *args)
+
+        else:
+            if weights is None:
+                raise ValueError('The "weights" are required by the "sum" mode')
+
+            (weights,), _, _ = _flatten_lists(weights)
+            out = np.empty(len(eta0), dtype=np.result_type(weights, np.float32))
+            args = (weights, r, exclude_self, self_offset, out)
+            delta_r_sum(eta0, phi0, offsets0, eta1, phi1, offsets1, *args)
+
+    else:
+        raise ValueError(f"Unknown mode: {mode}, expected matrix, min, count or sum")
+
+    return ak.unflatten(out, counts0)
+
+
+def _flatten_lists(*arrays):
+    flat = []
+    for array in arrays:
+        values = ak.to_numpy(ak.flatten(array, axis=1))
+        if isinstance(values, np.ma.MaskedArray):
+            values = values.filled(np.nan)
+        flat.append(np.ascontiguousarray(values))
+
+    counts = ak.to_numpy(ak.num(arrays[0], axis=1)).astype(np.int64)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    return flat, counts, offsets
+
+
+@nb.njit(cache=True)
+def _delta_r(eta0, phi0, eta1, phi1):  # pragma: no cover
+    delta_phi = (phi0 - phi1 + np.pi) % (2 * np.pi) - np.pi
+    return np.sqrt((eta0 - eta1) ** 2 + delta_phi**2)
+
+
+@nb.njit(cache=True)
+def delta_r_matrix(
+    eta0, phi0, offsets0, eta1, phi1, offsets1, pair_offsets, out
+):  # pragma: no cover
+    """Fill the distances of all pairs, event by event, row by row."""
+    for event in range(len(offsets0) - 1):
+        k = pair_offsets[event]
+        for i in range(offsets0[event], offsets0[event + 1]):
+            for j in range(offsets1[event], offsets1[event + 1]):
+                out[k] = _delta_r(eta0[i], phi0[i], eta1[j], phi1[j])
+                k += 1
+
+
+@nb.njit(cache=True)
+def delta_r_min(
+    eta0, phi0, offsets0, eta1, phi1, offsets1, exclude_self, self_offset, out
+):  # pragma: no cover
+    """Fill the distance to the nearest second object, NaN if there is none."""
+    for event in range(len(offsets0) - 1):
+        for i in range(offsets0[event], offsets0[event + 1]):
+            nearest = np.inf
+            for j in range(offsets1[event], offsets1[event + 1]):
+                if (
+                    exclude_self
+                    and i - offsets0[event] + self_offset == j - offsets1[event]
+                ):
+                    continue
+
+                distance = _delta_r(eta0[i], phi0[i], eta1[j], phi1[j])
+                nearest = min(nearest, distance)
+
+            out[i] = nearest if nearest < np.inf else np.nan
+
+
+@nb.njit(cache=True)
+def delta_r_count(
+    eta0, phi0, offsets0, eta1, phi1, offsets1, r, exclude_self, self_offset, out
+):  # pragma: no cover
+    """Fill the number of second objects closer than `r`."""
+    for event in range(len(offsets0) - 1):
+        for i in range(offsets0[event], offsets0[event + 1]):
+            count = 0
+            for j in range(offsets1[event], offsets1[event + 1]):
+                if (
+                    exclude_self
+                    and i - offsets0[event] + self_offset == j - offsets1[event]
+                ):
+                    continue
+
+                if _delta_r(eta0[i], phi0[i], eta1[j], phi1[j]) < r:
+                    count += 1
+
+            out[i] = count
+
+
+@nb.njit(cache=True)
+def delta_r_sum(
+    eta0,
+    phi0,
+    offsets0,
+    eta1,
+    phi1,
+    offsets1,
+    weights1,
+    r,
+    exclude_self,
+    self_offset,
+    out,
+):  # pragma: no cover
+    """Fill the sum of weights of second objects closer than `r`."""
+    for event in range(len(offsets0) - 1):
+        for i in range(offsets0[event], offsets0[event + 1]):
+            total = 0.0
+            for j in range(offsets1[event], offsets1[event + 1]):
+                if (
+                    exclude_self
+                    and i - offsets0[event] + self_offset == j - offsets1[event]
+                ):
+                    continue
+
+                if _delta_r(eta0[i], phi0[i], eta1[j], phi1[j]) < r:
+                    total += weights1[j]
+
+            out[i] = total
+
+
+def knn(eta: ak.Array, phi: ak.Array, k: int) -> ak.Array:
+    """Indices of the k nearest neighbours of each object in its event.
+
+    The neighbours are found by a numba kernel over the flat buffers, in
+    parallel over events, keeping a sorted list of the k nearest objects of
+    each object instead of sorting all distances. Distances are in the (eta,
+    phi) plane with the difference in phi wrapped into [-pi, pi], ties go to
+    the first object.
+
+    Parameters
+    ----------
+    eta, phi: ak.Array
+        Pseudorapidity and azimuth of the objects, shape (n, var), e.g. the
+        constituents of the leading jet.
+    k: int
+        Number of neighbours.
+
+    Return
+    ------
+    indices: ak.Array
+        Local indices of the neighbours from the nearest one, shape (n, var,
+        k) of int32. Missing neighbours, either because the event has no more
+        objects or because they are None or NaN, are the object itself.
+    """
+    (eta, phi), counts, offsets = _flatten_lists(eta, phi)
+
+    out = np.empty((len(eta), k), dtype=np.int32)
+    knn_indices(eta, phi, offsets, k, out)
+
+    return ak.unflatten(out, counts)
+
+
+@nb.njit(parallel=True, cache=True)
+def knn_indices(eta, phi, offsets, k, out):  # pragma: no cover
+    """Fill the local indices of the k nearest neighbours of each object."""
+    for event in nb.prange(len(offsets) - 1):
+        start, stop = offsets[event], offsets[event + 1]
+        distances = np.empty(stop - start, dtype=np.float32)
+        bits = distances.view(np.int32)
+        nearest = np.empty(k, dtype=np.int64)
+
+        for i in range(start, stop):
+            # Distances of a whole row first, which vectorizes
+            eta_i, phi_i = eta[i], phi[i]
+            for j in range(stop - start):
+                delta_phi = phi_i - phi[start + j]
+                if delta_phi > np.pi:
+                    delta_phi -= 2 * np.pi
+                elif delta_phi < -np.pi:
+                    delta_phi += 2 * np.pi
+                distances[j] = (eta_i - eta[start + j]) ** 2 + delta_phi**2
+            distances[i - start] = np.inf
+
+            # Non-negative floats sort as their bits, so the distance and index
+            # are packed in one key, with NaN and inf above the initial keys
+            for m in range(k):
+                nearest[m] = (np.int64(0x7F800000) << 32) | (i - start)
+
+            for j in range(stop - start):
+                key = (np.int64(bits[j]) << 32) | j
+                if not key < nearest[k - 1]:
+                    continue
+
+                # Insert into the sorted nearest neighbours
+                m = k - 1
+                while m > 0 and nearest[m - 1] > key:
+                    nearest[m] = nearest[m - 1]
+                    m -= 1
+                nearest[m] = key
+
+            for m in range(k):
+                out[i, m] = nearest[m] & 0xFFFFFFFF
+
+
+def n_subjettiness(
+    constituents: ak.Array, n_max: int = 5, beta: float = 1.0, r0: float = 0.8
+) -> ak.Array:
+    """N-subjettiness of jets from their constituents, from tau_1 to tau_n_max.
+
+    The axes are the exclusive kt jets of the constituents, in the E-scheme and
+    the rapidity-azimuth plane, as given by FastJet with a kt definition of a
+    large radius. Each jet is clustered once by a numba kernel and tau_N is
+    summed whenever N pseudo-jets are left, so all the values come from one
+    pass, in parallel over jets:
+
+        tau_N = sum_i pt_i min_k dR_ik^beta / sum_i pt_i r0^beta
+
+    Jets with at most N constituents have tau_N = 0.
+
+    Parameters
+    ----------
+    constituents: ak.Array
+        Momentum4D of constituents with "pt", "eta", "phi" and "mass" fields,
+        shape (n_jets, var) or (n, var, var).
+    n_max: int
+        Largest N to compute.
+    beta: float
+        Angular exponent.
+    r0: float
+        Characteristic jet radius of the normalization.
+
+    Return
+    ------
+    taus: ak.Array
+        Shape (n_jets, n_max) or (n, var, n_max), like the "Tau[5]" branches of
+        Delphes.
+    """
+    jets = ak.flatten(constituents, axis=1) if constituents.ndim == 3 else constituents
+    counts = ak.to_numpy(ak.num(jets, axis=1)).astype(np.int64)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    pt, eta, phi, mass = [
+        ak.to_numpy(ak.flatten(jets[i], axis=1)) for i in ["pt", "eta", "phi", "mass"]
+    ]
+    dtype = np.result_type(pt, np.float32)
+
+    # Clustering sums momenta, so it runs in double precision
+    pt, eta, phi, mass = [i.astype(np.float64) for i in [pt, eta, phi, mass]]
+    px, py, pz = pt * np.cos(phi), pt * np.sin(phi), pt * np.sinh(eta)
+    e = np.sqrt(px**2 + py**2 + pz**2 + mass**2)
+
+    out = np.zeros((len(counts), n_max), dtype=dtype)
+    exclusive_kt_n_subjettiness(px, py, pz, e, offsets, n_max, beta, r0, out)
+    taus = ak.from_numpy(out)
+
+    if constituents.ndim == 3:
+        taus = ak.unflatten(taus, ak.num(constituents, axis=1))
+
+    return taus
+
+
+@nb.njit(cache=True)
+def _rap_phi(px, py, pz, e):  # pragma: no cover
+    phi = np.arctan2(py, px)
+    if e > abs(pz):
+        rap = 0.5 * np.log((e + pz) / (e - pz))
+    else:
+        # Same cap as FastJet for objects along the beam
+        rap = 1e5 if pz >= 0 else -1e5
+
+    return rap, phi
+
+
+@nb.njit(cache=True)
+def _delta_r2(rap0, phi0, rap1, phi1):  # pragma: no cover
+    delta_phi = abs(phi0 - phi1)
+    if delta_phi > np.pi:
+        delta_phi = 2 * np.pi - delta_phi
+
+    return (rap0 - rap1) ** 2 + delta_phi**2
+
+
+@nb.njit(cache=True)
+def _nearest(i, m, rap, phi):  # pragma: no cover
+    nearest, distance = -1, np.inf
+    for j in range(m):
+        if j != i:
+            d = _delta_r2(rap[i], phi[i], rap[j], phi[j])
+            if d < distance:
+                nearest, distance = j, d
+
+    return nearest, distance
+
+
+@nb.njit(parallel=True, cache=True)
+def exclusive_kt_n_subjettiness(
+    px, py, pz, e, offsets, n_max, beta, r0, out
+):  # pragma: no cover
+    """Fill tau_1 to tau_n_max of each jet along its exclusive kt clustering.
+
+    The pseudo-jets are kept in the first `m` slots and each one tracks its
+    geometric nearest neighbour, as the closest kt pair is always made of the
+    softer object and its nearest neighbour (the N2Plain strategy of FastJet).
+    """
+    for jet in nb.prange(len(offsets) - 1):
+        start = offsets[jet]
+        n = offsets[jet + 1] - start
+
+        # Constituents, which also start as the pseudo-jets
+        jpx = px[start : start + n].copy()
+        jpy = py[start : start + n].copy()
+        jpz = pz[start : start + n].copy()
+        je = e[start : start + n].copy()
+        pt = np.sqrt(jpx**2 + jpy**2)
+        rap = np.empty(n)
+        phi = np.empty(n)
+        for i in range(n):
+            rap[i], phi[i] = _rap_phi(jpx[i], jpy[i], jpz[i], je[i])
+
+        norm = pt.sum() * r0**beta
+        if n <= 1 or norm <= 0:
+            continue
+
+        pt2 = pt**2
+        jrap = rap.copy()
+        jphi = phi.copy()
+        nearest = np.empty(n, dtype=np.int64)
+        distance = np.empty(n)
+        for i in range(n):
+            nearest[i], distance[i] = _nearest(i, n, jrap, jphi)
+
+        for m in range(n - 1, 0, -1):
+            # Merge the closest kt pair into its first pseudo-jet
+            i, d_min = 0, np.inf
+            for k in range(m + 1):
+                d = min(pt2[k], pt2[nearest[k]]) * distance[k]
+                if d < d_min:
+                    i, d_min = k, d
+            j = nearest[i]
+            if j < i:
+                i, j = j, i
+
+            jpx[i] += jpx[j]
+            jpy[i] += jpy[j]
+            jpz[i] += jpz[j]
+            je[i] += je[j]
+            pt2[i] = jpx[i] ** 2 + jpy[i] ** 2
+            jrap[i], jphi[i] = _rap_phi(jpx[i], jpy[i], jpz[i], je[i])
+
+            # Move the last pseudo-jet into the free slot
+            if j != m:
+                jpx[j], jpy[j], jpz[j], je[j] = jpx[m], jpy[m], jpz[m], je[m]
+                pt2[j], jrap[j], jphi[j] = pt2[m], jrap[m], jphi[m]
+                nearest[j], distance[j] = nearest[m], distance[m]
+
+            # Only the neighbours of the merged pseudo-jets change
+            for k in range(m):
+                if k == i or nearest[k] == i or nearest[k] == j:
+                    nearest[k], distance[k] = _nearest(k, m, jrap, jphi)
+                else:
+                    if nearest[k] == m:
+                        nearest[k] = j
+
+                    d = _delta_r2(jrap[k], jphi[k], jrap[i], jphi[i])
+                    if d < distance[k]:
+                        nearest[k], distance[k] = i, d
+
+            if m > n_max:
+                continue
+
+            # The pseudo-jets left are the axes of tau_m
+            tau = 0.0
+            for c in range(n):
+                r2 = np.inf
+                for k in range(m):
+                    r2 = min(r2, _delta_r2(rap[c], phi[c], jrap[k], jphi[k]))
+                tau += pt[c] * r2 ** (beta / 2)
+
+            out[jet, m - 1] = tau / norm
@@ -0,0 +1,272 @@
+"""Compile the numba kernels of hml ahead of time into a cache directory.
+
+Run it once before starting a pool of workers:
+
+    python -m hml.operations.compile --cache-dir /path/to/cache
+
+Workers then load the compiled kernels instead of JIT compiling them, as long
+as `NUMBA_CACHE_DIR` points to the same directory before hml is imported, or
+`set_cache_dir` is called in the worker initializer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from importlib import import_module
+from pathlib import Path
+
+import awkward as ak
+import numpy as np
+
+
+def set_cache_dir(cache_dir: str | Path) -> None:
+    """Direct the numba cache of this and child processes to `cache_dir`."""
+    import numba
+
+    cache_dir = str(Path(cache_dir).resolve())
+    os.environ["NUMBA_CACHE_DIR"] = cache_dir
+    numba.config.CACHE_DIR = cache_dir
+
+
+def _histogram_inputs():
+    bins = (2, 2)
+    ranges = (np.float64(0), np.float64(3))
+    for dtype in ["float32", "float64"]:
+        x = np.array([0.5, 1.5, 2.5], dtype=dtype)
+        yield x, x, bins, ranges, ranges
+
+
+def _weighted_histogram_inputs():
+    for x, y, bins, xrange, yrange in _histogram_inputs():
+        yield x, y, bins, xrange, yrange, x
+
+
+def _calculate_histograms_inputs():
+    # Images are filled from jagged constituents, or regular arrays when all
+    # events have the same number of them, in both float precisions.
+    bins = np.linspace(0, 3, 4)
+    for dtype in ["float32", "float64"]:
+        jagged = ak.values_astype([[0.5, 1.5, 2.5], [], [1.0]], dtype)
+        regular = ak.to_regular(ak.values_astype([[0.5, 1.5], [2.5, 1.0]], dtype))
+
+        for values in [jagged, regular]:
+            yield values, values, bins, bins, len(values)
+            yield values, values, bins, bins, len(values), values
+
+
+def _fill_histograms_inputs():
+    # Images are stored in float32 or float64 depending on `hml.config.floatx`
+    for args in _calculate_histograms_inputs():
+        values, _, bins, _, total, *weights = args
+        for dtype in ["float32", "float64"]:
+            hists = np.zeros((total, len(bins) - 1, len(bins) - 1), dtype=dtype)
+            yield (values, values, bins, bins, hists, *weights)
+
+
+def _eflow_inputs():
+    eflow = ak.values_astype(ak.Array([[1, 2, 3], [4]]), "uint32")
+    refs = ak.values_astype(ak.Array([[[1, 3], [2]], []]), "int32")
+
+    return eflow, refs
+
+
+def _find_eflow_in_refs_inputs():
+    yield _eflow_inputs()
+
+
+def _take_momentum4d_inputs():
+    import vector
+
+    vector.register_awkward()
+
+    eflow, _ = _eflow_inputs()
+    momenta = ak.zip(
+        {
+            "pt": ak.ones_like(eflow),
+            "eta": ak.zeros_like(eflow),
+            "phi": ak.zeros_like(eflow),
+            "mass": ak.zeros_like(eflow),
+        },
+        with_name="Momentum4D",
+    )
+    momenta = ak.values_astype(momenta, "float32")
+    momenta["id"] = eflow
+
+    yield momenta, ak.from_iter([[[0, 2], [1]], []])
+
+
+def _delta_r_inputs(*extra):
+    # Flat coordinates of two collections in two events
+    offsets0 = np.array([0, 2, 3])
+    offsets1 = np.array([0, 1, 3])
+    for dtype in ["float32", "float64"]:
+        x0 = np.zeros(3, dtype=dtype)
+        x1 = np.zeros(3, dtype=dtype)
+        yield (x0, x0, offsets0, x1, x1, offsets1, *extra)
+
+
+def _delta_r_matrix_inputs():
+    for args in _delta_r_inputs(np.array([0, 2, 4])):
+        yield (*args, np.empty(4, dtype=args[0].dtype))
+
+
+def _delta_r_min_inputs():
+    for args in _delta_r_inputs(False, 0):
+        yield (*args, np.empty(3, dtype=args[0].dtype))
+
+
+def _delta_r_count_inputs():
+    for args in _delta_r_inputs(0.4, False, 0):
+        yield (*args, np.empty(3, dtype=np.int32))
+
+
+def _delta_r_sum_inputs():
+    for args in _delta_r_inputs():
+        weights = np.zeros(3, dtype=args[0].dtype)
+        yield (*args, weights, 0.4, False, 0, np.empty(3, dtype=args[0].dtype))
+
+
+def _knn_indices_inputs():
+    offsets = np.array([0, 2, 3])
+    for dtype in ["float32", "float64"]:
+        x = np.zeros(3, dtype=dtype)
+        yield x, x, offsets, 2, np.empty((3, 2), dtype=np.int32)
+
+
+def _exclusive_kt_n_subjettiness_inputs():
+    # Momenta are always clustered in float64, taus are stored in either
+    momentum = np.ones(3)
+    offsets = np.array([0, 3])
+    for dtype in ["float32", "float64"]:
+        out = np.zeros((1, 5), dtype=dtype)
+        yield momentum, momentum, momentum, momentum, offsets, 5, 1.0, 0.8, out
+
+
+def _predict_tree_ensemble_inputs():
+    from hml.approaches.trees.tree_ensemble import NODE_DTYPE
+
+    nodes = np.zeros(3, dtype=NODE_DTYPE)
+    nodes[0]["left"], nodes[0]["right"] = 1, 2
+    roots = np.zeros(1, dtype=np.uint32)
+    init = np.zeros(1)
+
+    for dtype in ["float32", "float64"]:
+        x = np.zeros((2, 1), dtype=dtype)
+        for has_nan in [False, True]:
+            out = np.empty((2, 1))
+            yield x, nodes, roots, roots, init, 1.0, has_nan, out
+
+
+def _predict_complete_trees_inputs():
+    from hml.approaches.trees.tree_ensemble import _complete_trees
+
+    for (
+        x,
+        nodes,
+        roots,
+        tree_class,
+        init,
+        scale,
+        has_nan,
+        out,
+    ) in _predict_tree_ensemble_inputs():
+        yield (x, *_complete_trees(nodes, roots), tree_class, init, scale, has_nan, out)
+
+
+KERNELS = {
+    "hml.operations.awkward_ops": {
+        "delta_r_matrix": _delta_r_matrix_inputs,
+        "delta_r_min": _delta_r_min_inputs,
+        "delta_r_count": _delta_r_count_inputs,
+        "delta_r_sum": _delta_r_sum_inputs,
+        "knn_indices": _knn_indices_inputs,
+        "exclusive_kt_n_subjettiness": _exclusive_kt_n_subjettiness_inputs,
+    },
+    "hml.operations.uproot_ops": {
+        "find_eflow_in_refs": _find_eflow_in_refs_inputs,
+        "take_momentum4d": _take_momentum4d_inputs,
+    },
+    "hml.representations.image": {
+        "histogram2d_numba": _histogram_inputs,
+        "histogram2d_numba_weighted": _weighted_histogram_inputs,
+        "calculate_histograms": _calculate_histograms_inputs,
+        "fill_histograms": _fill_histograms_inputs,
+    },
+    "hml.approaches.trees.tree_ensemble": {
+        "predict_tree_ensemble": _predict_tree_ensemble_inputs,
+        "predict_complete_trees": _predict_complete_trees_inputs,
+    },
+}
+
+
+def precompile(cache_dir: str | Path | None = None) -> dict[str, dict]:
+    """Compile all kernels for their supported signatures.
+
+    Parameters
+    ----------
+    cache_dir: str or Path, optional
+        Directory to store the compiled kernels. Defaults to the numba cache
+        directory, i.e. `__pycache__` next to the source files.
+
+    Return
+    ------
+    report: dict
+        Time in seconds, number of signatures, cache hits and misses of each
+        kernel. Kernels loaded from the cache only have hits.
+    """
+    if cache_dir is not None:
+        set_cache_dir(cache_dir)
+
+    report = {}
+    for module, kernels in KERNELS.items():
+        module = import_module(module)
+
+        for name, make_inputs in kernels.items():
+            kernel = getattr(module, name)
+            # Point kernels imported before `set_cache_dir` to the new directory
+            kernel.enable_caching()
+
+            start = time.perf_counter()
+            for args in make_inputs():
+                kernel(*args)
+
+            report[f"{module.__name__}.{name}"] = {
+                "seconds": time.perf_counter() - start,
+                "signatures": len(kernel.signatures),
+                "cache_hits": sum(kernel.stats.cache_hits.values()),
+                "cache_misses": sum(kernel.stats.cache_misses.values()),
+            }
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m hml.operations.compile",
+        description="Compile the numba kernels of hml into a cache directory.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory to store the compiled kernels, also set NUMBA_CACHE_DIR "
+        "to it in the workers. Defaults to the numba cache directory.",
+    )
+    args = parser.parse_args(argv)
+
+    report = precompile(args.cache_dir)
+
+    width = max(len(i) for i in report)
+    print(f"{'Kernel':<{width}}  Signatures  Hits  Misses  Time (s)")
+    for name, stats in report.items():
+        print(
+            f"{name:<{width}}  {stats['signatures']:>10}  {stats['cache_hits']:>4}"
+            f"  {stats['cache_misses']:>6}  {stats['seconds']:>8.2f}"
+        )
+    print(f"Total: {sum(i['seconds'] for i in report.values()):.2f} s")
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
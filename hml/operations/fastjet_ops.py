@@ -1,6 +1,17 @@
 from __future__ import annotations
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import awkward as ak
 import fastjet as fj
+import numpy as np
+import vector
+
+from ..config import floatx, floatx_scope
+from .uproot_ops import cached, constituents_to_momentum4d
+
+vector.register_awkward()
 
 
 def get_jet_algorithm(name: str):
@@ -18,3 +29,347 @@ def get_jet_algorithm(name: str):
     }
 
     return JET_ALGORITHMS.get(name, fj.undefined_jet_algorithm)
+
+
+class JetClustering:
+    """Recluster the constituents of jets with FastJet, chunk by chunk.
+
+    Each jet is an "event" of the vectorized awkward interface of FastJet, so
+    a chunk of jets is reclustered by one `ClusterSequence`. All constituents
+    of a jet are merged into one jet, `r` is the radius of the original jets,
+    e.g. the R0 of soft drop. The sequences are
+    kept per chunk and per jet definition, which lets every groomer reuse the
+    same reclustering.
+
+    Chunks are processed in this process by default. With more than one
+    worker, chunks are pinned to worker processes that keep their sequences,
+    so later groomers are sent only the name of the groomer. The workers are
+    shut down by `close`, or at the end of a `with` block:
+
+        >>> with JetClustering(constituents, n_workers=4) as clustering:
+        ...     mass = clustering.groom("soft_drop").mass
+
+    Parameters
+    ----------
+    constituents: ak.Array
+        Momentum4D of constituents with "pt", "eta", "phi" and "mass" fields,
+        shape (n_jets, var) or (n, var, var).
+    algorithm: str
+        Name of the reclustering algorithm, e.g. "cambridge".
+    r: float
+        Radius of the jets.
+    chunk_size: int
+        Number of jets per chunk.
+    n_workers: int
+        Number of worker processes, at most one per chunk. With one worker,
+        chunks are processed in this process.
+    """
+
+    def __init__(
+        self,
+        constituents: ak.Array,
+        algorithm: str = "cambridge",
+        r: float = 0.8,
+        chunk_size: int = 10_000,
+        n_workers: int = 1,
+    ) -> None:
+        self.algorithm = algorithm
+        self.r = r
+        self.chunk_size = chunk_size
+
+        self._outer = ak.num(constituents, axis=1) if constituents.ndim == 3 else None
+        jets = (
+            ak.flatten(constituents, axis=1) if constituents.ndim == 3 else constituents
+        )
+
+        # Jets without constituents cannot be clustered, they are groomed to None
+        counts = ak.to_numpy(ak.num(jets, axis=1))
+        self._is_valid = counts > 0
+        jets = _to_cartesian(jets[self._is_valid])
+
+        self.chunks = [
+            jets[i : i + chunk_size] for i in range(0, len(jets), chunk_size)
+        ]
+        self._sequences = [{} for _ in self.chunks]
+
+        n_workers = min(n_workers, len(self.chunks))
+
+        # One single-process executor per worker pins each chunk to a process.
+        # Workers are spawned, as forking the threads of numba or keras hangs.
+        self._executors = []
+        if n_workers > 1:
+            context = multiprocessing.get_context("spawn")
+            self._executors = [
+                ProcessPoolExecutor(max_workers=1, mp_context=context)
+                for _ in range(n_workers)
+            ]
+            self._sent = [False] * len(self.chunks)
+
+    def groom(self, groomer: str, **kwargs) -> ak.Array:
+        """Groom each jet and return one value or Momentum4D per jet.
+
+        Parameters
+        ----------
+        groomer: str
+            One of "soft_drop", "trimming", "pruning" and "energy_correlator".
+        kwargs:
+            Parameters of the groomer.
+
+        Return
+        ------
+        groomed: ak.Array
+            Shape (n_jets,) or (n, var), None for jets without constituents.
+        """
+        if groomer not in GROOMERS:
+            raise ValueError(f"Unknown groomer: {groomer}, expected {list(GROOMERS)}")
+
+        if self._executors:
+            futures = []
+            for index, jets in enumerate(self.chunks):
+                executor = self._executors[index % len(self._executors)]
+                jets = None if self._sent[index] else jets
+                futures.append(
+                    executor.submit(
+                        _groom_in_worker,
+                        index,
+                        jets,
+                        self.algorithm,
+                        self.r,
+                        groomer,
+                        kwargs,
+                        floatx(),
+                    )
+                )
+                self._sent[index] = True
+            results = [future.result() for future in futures]
+
+        else:
+            results = [
+                _groom(sequences, jets, self.algorithm, self.r, groomer, kwargs)
+                for jets, sequences in zip(self.chunks, self._sequences)
+            ]
+
+        # Put the jets without constituents back as None
+        index = np.full(len(self._is_valid), -1, dtype=np.int64)
+        index[self._is_valid] = np.arange(self._is_valid.sum())
+        if results:
+            content = ak.to_layout(ak.concatenate(results))
+        else:
+            content = ak.to_layout(ak.Array(np.empty(0)))
+        groomed = ak.Array(
+            ak.contents.IndexedOptionArray.simplified(ak.index.Index64(index), content)
+        )
+
+        if self._outer is not None:
+            groomed = ak.unflatten(groomed, self._outer)
+
+        return groomed
+
+    def close(self) -> None:
+        """Shut down the worker processes.
+
+        The sequences of the workers are lost, later groomers recluster the
+        chunks in this process.
+        """
+        for executor in self._executors:
+            executor.shutdown(cancel_futures=True)
+        self._executors = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _to_cartesian(jets: ak.Array) -> ak.Array:
+    # FastJet needs px, py, pz and E, in double precision for the clustering
+    jets = ak.values_astype(jets, np.float64)
+    return ak.zip(
+        {"px": jets.px, "py": jets.py, "pz": jets.pz, "E": jets.E},
+        with_name="Momentum4D",
+    )
+
+
+def _momentum4d(px, py, pz, e) -> ak.Array:
+    return ak.zip({"px": px, "py": py, "pz": pz, "E": e}, with_name="Momentum4D")
+
+
+def _sequence(sequences, jets, algorithm, r=None):
+    # Without a radius, all constituents of a jet are reclustered into one jet
+    r = fj.JetDefinition.max_allowable_R if r is None else r
+    if (algorithm, r) not in sequences:
+        jet_definition = fj.JetDefinition(get_jet_algorithm(algorithm), r)
+        sequences[(algorithm, r)] = fj.ClusterSequence(jets, jet_definition)
+
+    return sequences[(algorithm, r)]
+
+
+def _groom(sequences, jets, algorithm, r, groomer, kwargs):
+    return GROOMERS[groomer](sequences, jets, algorithm, r, **kwargs)
+
+
+# Chunks and their cluster sequences in a worker process
+_WORKER_CHUNKS = {}
+_WORKER_SEQUENCES = {}
+
+
+def _groom_in_worker(index, jets, algorithm, r, groomer, kwargs, dtype):
+    if jets is not None:
+        _WORKER_CHUNKS[index] = jets
+        _WORKER_SEQUENCES[index] = {}
+
+    # Spawned workers do not inherit the float type of the caller
+    jets = _WORKER_CHUNKS[index]
+    with floatx_scope(dtype):
+        return _groom(_WORKER_SEQUENCES[index], jets, algorithm, r, groomer, kwargs)
+
+
+def _soft_drop(sequences, jets, algorithm, r, beta=0.0, z_cut=0.1):
+    sequence = _sequence(sequences, jets, algorithm)
+    groomed = sequence.exclusive_jets_softdrop_grooming(
+        njets=1, beta=beta, symmetry_cut=z_cut, R0=r
+    )
+
+    return ak.zip(
+        {
+            "pt": groomed.ptsoftdrop,
+            "eta": groomed.etasoftdrop,
+            "phi": groomed.phisoftdrop,
+            "mass": groomed.msoftdrop,
+        },
+        with_name="Momentum4D",
+    )
+
+
+def _trimming(sequences, jets, algorithm, r, r_trim=0.2, f_cut=0.03):
+    # The subjets of the reclustered jet are those of radius r_trim only when
+    # its distance is the angle, the same as FastJet's Filter does for C/A
+    if algorithm != "cambridge":
+        raise ValueError(f"Trimming needs the cambridge algorithm, got {algorithm}")
+
+    # Subjets with r_trim that carry at least f_cut of the jet pt
+    sequence = _sequence(sequences, jets, algorithm)
+    jet = sequence.exclusive_jets(1)
+    d_cut = (r_trim / fj.JetDefinition.max_allowable_R) ** 2
+    subjets = sequence.exclusive_subjets(jet, d_cut, -1)
+    subjets = subjets[subjets.pt >= f_cut * jet.pt[:, 0]]
+
+    return _momentum4d(
+        ak.sum(subjets.px, axis=1),
+        ak.sum(subjets.py, axis=1),
+        ak.sum(subjets.pz, axis=1),
+        ak.sum(subjets.E, axis=1),
+    )
+
+
+def _pruning(sequences, jets, algorithm, r, z_cut=0.1, r_cut_factor=0.5):
+    # The vectorized interface has no pruner, so jets are pruned one by one,
+    # each with its own reclustering and PseudoJet per constituent. It is the
+    # slowest groomer, its cost grows with the number of jets in Python.
+    jet_definition = fj.JetDefinition(
+        get_jet_algorithm(algorithm), fj.JetDefinition.max_allowable_R
+    )
+    pruner = fj.Pruner(jet_definition, z_cut, r_cut_factor)
+
+    offsets = np.asarray(ak.to_layout(jets).to_ListOffsetArray64(True).offsets)
+    px, py, pz, e = [
+        ak.to_numpy(ak.flatten(jets[i], axis=1)) for i in ["px", "py", "pz", "E"]
+    ]
+
+    pruned = np.empty((len(jets), 4))
+    for i in range(len(jets)):
+        start, stop = offsets[i], offsets[i + 1]
+        particles = [
+            fj.PseudoJet(*momentum)
+            for momentum in zip(
+                px[start:stop], py[start:stop], pz[start:stop], e[start:stop]
+            )
+        ]
+        sequence = fj.ClusterSequence(particles, jet_definition)
+        jet = pruner(sequence.exclusive_jets(1)[0])
+        pruned[i] = jet.px(), jet.py(), jet.pz(), jet.E()
+
+    return _momentum4d(*pruned.T)
+
+
+def _energy_correlator(sequences, jets, algorithm, r, ratio="d2", **kwargs):
+    sequence = _sequence(sequences, jets, algorithm)
+    return sequence.exclusive_jets_energy_correlator(njets=1, func=ratio, **kwargs)
+
+
+GROOMERS = {
+    "soft_drop": _soft_drop,
+    "trimming": _trimming,
+    "pruning": _pruning,
+    "energy_correlator": _energy_correlator,
+}
+
+
+@cached
+def constituents_to_jet_clustering(
+    events, branch, algorithm="cambridge", r=0.8, chunk_size=10_000, n_workers=1
+):
+    """Recluster the constituents of a jet branch once per chunk of events.
+
+    With more than one worker, the worker processes live as long as the
+    clustering in the cache of the events. They are shut down by `close` of
+    the returned clustering, or at the exit of the interpreter.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    branch: str
+        Constituents of the jets, e.g., "FatJet.Constituents"
+    algorithm: str
+        Name of the reclustering algorithm.
+    r: float
+        Radius of the jets.
+    chunk_size: int
+        Number of jets per chunk.
+    n_workers: int
+        Number of worker processes, 1 by default to recluster in this process.
+
+    Return
+    ------
+    clustering: JetClustering
+    """
+    constituents = constituents_to_momentum4d(events, branch)
+    return JetClustering(constituents, algorithm, r, chunk_size, n_workers)
+
+
+@cached
+def groom_constituents(
+    events, branch, algorithm, r, groomer, chunk_size=10_000, n_workers=1, **kwargs
+):
+    """Groom the jets of a branch, sharing their reclustering.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    branch: str
+        Constituents of the jets, e.g., "FatJet.Constituents"
+    algorithm: str
+        Name of the reclustering algorithm.
+    r: float
+        Radius of the jets.
+    groomer: str
+        One of "soft_drop", "trimming", "pruning" and "energy_correlator".
+    chunk_size: int
+        Number of jets per chunk.
+    n_workers: int
+        Number of worker processes, 1 by default to recluster in this process.
+    kwargs:
+        Parameters of the groomer.
+
+    Return
+    ------
+    groomed: ak.Array
+        One value or Momentum4D per jet, shape (n, var).
+    """
+    clustering = constituents_to_jet_clustering(
+        events, branch, algorithm, r, chunk_size, n_workers
+    )
+    return clustering.groom(groomer, **kwargs)
@@ -1,12 +1,148 @@
 from __future__ import annotations
 
+from functools import wraps
+
 import awkward as ak
 import numba as nb
+import numpy as np
 import vector
 
+from ..config import floatx
+from .awkward_ops import n_subjettiness
+
 vector.register_awkward()
 
 
+class CachedEvents:
+    """Events that evaluate each branch read and intermediate array only once.
+
+    It wraps events opened by uproot (usually one chunk of them) and memoizes
+    `events[key].array()` as well as the operations decorated by `cached`, like
+    `branch_to_momentum4d`. While evaluating, it records which nodes each node
+    depends on, which gives the DAG of the computation.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    entry_start: int, optional
+        First entry to read, defaults to the first one.
+    entry_stop: int, optional
+        Entry to stop reading at, defaults to the end of the events.
+
+    Attributes
+    ----------
+    nodes: dict
+        Dependencies of each evaluated node, in the order of evaluation. A node
+        is a tuple of its kind and name, e.g. ("branch", "Jet.PT").
+    hits: dict
+        Number of times each node is reused from the cache.
+    """
+
+    def __init__(
+        self,
+        events,
+        entry_start: int | None = None,
+        entry_stop: int | None = None,
+    ) -> None:
+        self.events = events
+        self.entry_start = entry_start
+        self.entry_stop = entry_stop
+        self.cache = {}
+        self.nodes = {}
+        self.hits = {}
+        self._keys = {}
+        self._stack = []
+
+    def evaluate(self, node: tuple[str, str], func, *args, **kwargs):
+        """Evaluate a node once and return its cached value afterwards."""
+        if self._stack and node not in self.nodes[self._stack[-1]]:
+            self.nodes[self._stack[-1]].append(node)
+
+        if node in self.cache:
+            self.hits[node] += 1
+            return self.cache[node]
+
+        self.nodes[node] = []
+        self.hits[node] = 0
+        self._stack.append(node)
+        try:
+            value = func(*args, **kwargs)
+        finally:
+            self._stack.pop()
+
+        self.cache[node] = value
+        return value
+
+    def keys(self, **kwargs):
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._keys:
+            self._keys[key] = self.events.keys(**kwargs)
+
+        return self._keys[key]
+
+    def __getitem__(self, key: str) -> CachedBranch:
+        return CachedBranch(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.events
+
+    def __getattr__(self, name: str):
+        return getattr(self.events, name)
+
+
+class CachedBranch:
+    def __init__(self, events: CachedEvents, key: str) -> None:
+        self.events = events
+        self.key = key
+
+    def array(self, **kwargs):
+        name = self.key
+        if kwargs:
+            name += f"({', '.join(f'{k}={v}' for k, v in kwargs.items())})"
+
+        entries = {}
+        if self.events.entry_start is not None:
+            entries["entry_start"] = self.events.entry_start
+        if self.events.entry_stop is not None:
+            entries["entry_stop"] = self.events.entry_stop
+
+        return self.events.evaluate(
+            ("branch", name), self.events.events[self.key].array, **entries, **kwargs
+        )
+
+    def __getattr__(self, name: str):
+        return getattr(self.events.events[self.key], name)
+
+
+def cache_events(
+    events, entry_start: int | None = None, entry_stop: int | None = None
+) -> CachedEvents:
+    """Wrap events in `CachedEvents` unless they are already wrapped.
+
+    With an entry range, a new `CachedEvents` of that range is returned.
+    """
+    if entry_start is None and entry_stop is None:
+        return events if isinstance(events, CachedEvents) else CachedEvents(events)
+
+    events = events.events if isinstance(events, CachedEvents) else events
+    return CachedEvents(events, entry_start, entry_stop)
+
+
+def cached(func):
+    """Evaluate an operation on `CachedEvents` only once per arguments."""
+
+    @wraps(func)
+    def wrapper(events, *args, **kwargs):
+        if not isinstance(events, CachedEvents):
+            return func(events, *args, **kwargs)
+
+        name = ", ".join([*map(str, args), *(f"{k}={v}" for k, v in kwargs.items())])
+        return events.evaluate((func.__name__, name), func, events, *args, **kwargs)
+
+    return wrapper
+
+
 @nb.njit(cache=True)
 def find_eflow_in_refs(eflow, refs):  # pragma: no cover
     """Find the constituent reference indices in an eflow branch.
@@ -89,12 +225,89 @@ def take_momentum4d(array, indices):  # pragma: no cover
     return pt, eta, phi, mass
 
 
+def _momentum_dtype() -> str:
+    # Momenta are computed by vector and numba kernels, which do not support
+    # float16, so it is only used to store the final values
+    return "float32" if floatx() == "float16" else floatx()
+
+
+# Leaves of each momentum component in Delphes branches, in order of preference
+MOMENTUM_LEAVES = {
+    "pt": ["PT", "ET", "MET"],
+    "eta": ["Eta"],
+    "phi": ["Phi"],
+    "mass": ["Mass"],
+}
+
+EFLOW_BRANCHES = ["EFlowTrack", "EFlowPhoton", "EFlowNeutralHadron"]
+
+
+def find_branch(events, name: str) -> str | None:
+    """Find a branch by its case-insensitive name, e.g. "Jet.PT" for "jet.pt".
+
+    Only the top-level branches and the sub-branches of the matching one are
+    listed, rather than all keys of the tree.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    name: str
+        Name of the branch, e.g. "jet", "jet_size" or "fatjet.tau[5]".
+
+    Return
+    ------
+    branch: str | None
+        Name of the branch in the events, None if it is not found.
+    """
+    parent, _, child = name.partition(".")
+    branches = {i.lower(): i for i in events.keys(recursive=False)}
+    parent = branches.get(parent.lower())
+    if parent is None or not child:
+        return parent
+
+    sub_branches = events[parent].keys(recursive=False, full_paths=False)
+    sub_branches = {i.lower(): i for i in sub_branches}
+    return sub_branches.get(f"{parent}.{child}".lower())
+
+
+def branch_to_component(events, branch, component):
+    """Read one momentum component of a Delphes branch from its own leaf.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    branch: str
+        Branch name, e.g., "Jet"
+    component: str
+        One of "pt", "eta", "phi" and "mass". The pt is read from PT, ET or MET,
+        and branches without Mass are massless.
+
+    Return
+    ------
+    values: ak.Array
+        Values of the component with the shape (n, var).
+    """
+    for leaf in MOMENTUM_LEAVES[component]:
+        if f"{branch}.{leaf}" in events:
+            return events[f"{branch}.{leaf}"].array()
+
+    if component == "mass":
+        return ak.zeros_like(branch_to_component(events, branch, "eta"))
+
+    raise ValueError(f"Cannot find the {component} branch for {branch}")
+
+
+@cached
 def branch_to_momentum4d(events, branch, with_id=False):
     """Convert a Delphes branch to a 4-momentum array.
 
     Some branches in the Delphes output do not have full 4-momentum information,
     e.g., "Jet" has PT, Eta, Phi, Mass but no Px, Py, Pz, E. This function converts
     the branch to the registered "Momentum4D" array supported by the vector library.
+    Components that have their own leaves are read by `branch_to_component`
+    instead.
 
     Parameters
     ----------
@@ -111,33 +324,11 @@ def branch_to_momentum4d(events, branch, with_id=False):
     momenta: Momentum4D
         4-momentum array with the shape (n, var).
     """
-    eta = events[f"{branch}.Eta"].array()
-    phi = events[f"{branch}.Phi"].array()
-
-    if f"{branch}.PT" in events:
-        pt = events[f"{branch}.PT"].array()
-    elif f"{branch}.ET" in events:
-        pt = events[f"{branch}.ET"].array()
-    elif f"{branch}.MET" in events:
-        pt = events[f"{branch}.MET"].array()
-    else:
-        raise ValueError(f"Cannot find the PT branch for {branch}")
-
-    if f"{branch}.Mass" in events:
-        mass = events[f"{branch}.Mass"].array()
-    else:
-        mass = ak.zeros_like(eta)
-
     momenta = ak.zip(
-        {
-            "pt": pt,
-            "eta": eta,
-            "phi": phi,
-            "mass": mass,
-        },
+        {i: branch_to_component(events, branch, i) for i in MOMENTUM_LEAVES},
         with_name="Momentum4D",
     )
-    momenta = ak.values_astype(momenta, "float32")
+    momenta = ak.values_astype(momenta, _momentum_dtype())
 
     if with_id:
         momenta["id"] = events[f"{branch}.fUniqueID"].array()
@@ -145,6 +336,73 @@ def branch_to_momentum4d(events, branch, with_id=False):
     return momenta
 
 
+@cached
+def constituents_to_indices(events, branch):
+    """Find the constituents of jets in each eflow branch.
+
+    Only the references of the jets and the "fUniqueID" of the eflow branches
+    are read, so the indices are shared by all momentum components.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    branch: str
+        Branch name of the constituents, e.g., "Jet.Constituents"
+
+    Return
+    ------
+    indices: list[ak.Array]
+        Indices of the constituents in the flattened EFlowTrack, EFlowPhoton and
+        EFlowNeutralHadron branches, each with the shape (n, var, var).
+    """
+    refs = events[branch].array()["refs"]
+
+    indices = []
+    for eflow in EFLOW_BRANCHES:
+        ids = events[f"{eflow}.fUniqueID"].array()
+        local = ak.from_iter(find_eflow_in_refs(ids, refs))
+        local = ak.enforce_type(local, "var * var * int64")
+
+        counts = ak.to_numpy(ak.num(ids, axis=1))
+        indices.append(local + (np.cumsum(counts) - counts))
+
+    return indices
+
+
+@cached
+def constituents_to_component(events, branch, component):
+    """Take one momentum component of the constituents of jets.
+
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    branch: str
+        Branch name of the constituents, e.g., "Jet.Constituents"
+    component: str
+        One of "pt", "eta", "phi" and "mass".
+
+    Return
+    ------
+    values: ak.Array
+        Values of the component with the shape (n, var, var), the constituents
+        of each jet ordered by eflow branch.
+    """
+    matches = []
+    for eflow, indices in zip(EFLOW_BRANCHES, constituents_to_indices(events, branch)):
+        values = branch_to_component(events, eflow, component)
+        values = ak.to_numpy(ak.flatten(values, axis=None))
+        taken = values[ak.to_numpy(ak.flatten(indices, axis=None))]
+
+        taken = ak.unflatten(taken, ak.flatten(ak.num(indices, axis=2)))
+        matches.append(ak.unflatten(taken, ak.num(indices, axis=1)))
+
+    constituents = ak.concatenate(matches, -1)
+    return ak.values_astype(constituents, _momentum_dtype())
+
+
+@cached
 def constituents_to_momentum4d(events, branch):
     """Convert the constituents in a Delphes branch to a 4-momentum array.
 
@@ -160,28 +418,38 @@ def constituents_to_momentum4d(events, branch):
     constituents: Momentum4D
         4-momentum array with the shape (n, var, var).
     """
-    refs = events[branch].array()["refs"]
-    tracks = branch_to_momentum4d(events, "EFlowTrack", with_id=True)
-    photons = branch_to_momentum4d(events, "EFlowPhoton", with_id=True)
-    neutrals = branch_to_momentum4d(events, "EFlowNeutralHadron", with_id=True)
+    # The components share the matching of constituents
+    events = cache_events(events)
+    return ak.zip(
+        {i: constituents_to_component(events, branch, i) for i in MOMENTUM_LEAVES},
+        with_name="Momentum4D",
+    )
 
-    matches = []
-    for i in [tracks, photons, neutrals]:
-        indices = ak.from_iter(find_eflow_in_refs(i.id, refs))
-        pt, eta, phi, mass = take_momentum4d(i, indices)
-        matches.append(
-            ak.zip(
-                {
-                    "pt": pt,
-                    "eta": eta,
-                    "phi": phi,
-                    "mass": mass,
-                },
-                with_name="Momentum4D",
-            )
-        )
 
-    constituents = ak.concatenate(matches, -1)
-    constituents = ak.values_astype(constituents, "float32")
+@cached
+def constituents_to_n_subjettiness(events, branch, n_max=5, beta=1.0, r0=0.8):
+    """Compute the N-subjettiness of jets from their constituents.
+
+    It is the fallback of the "Tau[5]" branches of Delphes, e.g. for jets
+    without them, and it is cached per jet collection, beta and r0.
 
-    return constituents
+    Parameters
+    ----------
+    events:
+        Events opened by uproot.
+    branch: str
+        Constituents of the jets, e.g., "Jet.Constituents"
+    n_max: int
+        Largest N to compute.
+    beta: float
+        Angular exponent.
+    r0: float
+        Characteristic jet radius of the normalization.
+
+    Return
+    ------
+    taus: ak.Array
+        tau_1 to tau_n_max with the shape (n, var, n_max).
+    """
+    constituents = constituents_to_momentum4d(events, branch)
+    return n_subjettiness(constituents, n_max, beta, r0)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+
 from .collective import Collective, is_collective
 from .multiple import Multiple, is_multiple
 from .nested import Nested, is_nested
@@ -16,19 +19,47 @@ def get(identifier: str) -> PhysicsObject | None:
     return ALL_OBJECTS_DICT.get(identifier)
 
 
+# A component is a single or collective object like "Jet0", "Jet" or "Jet1:3",
+# followed by "." for a nested object, "," for multiple objects or the end.
+TOKEN_PATTERN = re.compile(r"([a-zA-Z]+)(\d*)(:?)(\d*)([.,]|$)")
+
+
+@lru_cache(maxsize=4096)
 def parse_physics_object(name: str) -> PhysicsObject:
-    """Parse a name to create a physics object"""
-    if is_single(name):
-        return Single.from_name(name)
+    """Parse a name to create a physics object
+
+    The name is scanned once from left to right and the results are cached, so
+    the same physics object is returned for the same name.
+    """
+    objects = []
+    components = []
+    position = 0
+
+    while match_ := TOKEN_PATTERN.match(name, position):
+        branch, start, colon, stop, separator = match_.groups()
+        if start != "" and colon == "":
+            components.append(Single(branch, int(start)))
+        else:
+            start = int(start) if start != "" else None
+            stop = int(stop) if stop != "" else None
+            components.append(Collective(branch, start, stop))
+
+        position = match_.end()
+        if separator == ".":
+            continue
 
-    elif is_collective(name):
-        return Collective.from_name(name)
+        if len(components) == 1:
+            objects.append(components[0])
+        elif len(components) == 2:
+            objects.append(Nested(*components))
+        else:
+            break
 
-    elif is_nested(name):
-        return Nested.from_name(name)
+        components = []
+        if separator == "":
+            if len(objects) == 1:
+                return objects[0]
 
-    elif is_multiple(name):
-        return Multiple.from_name(name)
+            return Multiple(objects)
 
-    else:
-        raise ValueError(f"Invalid name '{name}' for a physics object")
+    raise ValueError(f"Invalid name '{name}' for a physics object")
@@ -4,18 +4,22 @@ import re
 
 from .physics_object import PhysicsObject
 
+COLLECTIVE_PATTERN = re.compile(r"^([a-zA-Z]+)$|^([a-zA-Z]+)(\d*):(\d*)$")
+
 
 def is_collective(object_: PhysicsObject | str) -> bool:
     """Check if an object is a collective physics object"""
     if isinstance(object_, PhysicsObject):
         return isinstance(object_, Collective)
 
-    return bool(re.match(r"^[a-zA-Z]+$|^[a-zA-Z]+\d*:\d*$", object_))
+    return bool(COLLECTIVE_PATTERN.match(object_))
 
 
 class Collective(PhysicsObject):
     """A collective physics object"""
 
+    __slots__ = ("_branch", "_start", "_stop")
+
     def __init__(
         self,
         branch: str,
@@ -25,16 +29,19 @@ class Collective(PhysicsObject):
         self._branch = branch
         self._start = start
         self._stop = stop
+        self._freeze()
 
     @classmethod
     def from_name(cls, name: str) -> Collective:
-        if re.match(r"^[a-zA-Z]+$|^[a-zA-Z]+\d*:\d*$", name.strip()):
-            match_ = re.match(r"^([a-zA-Z]+)(\d*):?(\d*)$", name)
-            branch, start, stop = match_.groups()
+        if match_ := COLLECTIVE_PATTERN.match(name.strip()):
+            branch, branch_with_slice, start, stop = match_.groups()
+            if branch is not None:
+                return cls(branch)
+
             start = int(start) if start != "" else None
             stop = int(stop) if stop != "" else None
 
-            return cls(branch, start, stop)
+            return cls(branch_with_slice, start, stop)
 
         raise ValueError(f"Invalid name '{name}' for a collective physics object")
 
@@ -54,8 +61,7 @@ class Collective(PhysicsObject):
     def slices(self) -> list[slice]:
         return [slice(self.start, self.stop)]
 
-    @property
-    def name(self) -> str:
+    def _build_name(self) -> str:
         if self.start is None and self.stop is None:
             return f"{self.branch}"
 
@@ -35,8 +35,11 @@ def is_multiple(
 class Multiple(PhysicsObject):
     """A multiple physics object"""
 
+    __slots__ = ("_all",)
+
     def __init__(self, all: list[PhysicsObject | str]) -> None:
-        self._all = self._init_all(all)
+        self._all = tuple(self._init_all(all))
+        self._freeze()
 
     def _init_all(self, objects: list[PhysicsObject | str]) -> list[PhysicsObject]:
         output = []
@@ -65,20 +68,19 @@ class Multiple(PhysicsObject):
 
     @property
     def all(self) -> list[PhysicsObject]:
-        return self._all
+        return list(self._all)
 
     @property
     def branch(self) -> list[str]:
-        return [obj.branch for obj in self.all]
+        return [obj.branch for obj in self._all]
 
     @property
     def slices(self) -> list[list[slice]]:
-        return [i.slices for i in self.all]
+        return [i.slices for i in self._all]
 
-    @property
-    def name(self) -> str:
-        return ",".join(obj.name for obj in self.all)
+    def _build_name(self) -> str:
+        return ",".join(obj.name for obj in self._all)
 
     @property
     def config(self) -> dict:
-        return {"all": [i.name for i in self.all]}
+        return {"all": [i.name for i in self._all]}
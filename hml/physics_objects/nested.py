@@ -6,18 +6,22 @@ from .collective import Collective
 from .physics_object import PhysicsObject
 from .single import Single, is_single
 
+NESTED_PATTERN = re.compile(r"^[a-zA-Z]+\d*:?\d*\.[a-zA-Z]+\d*:?\d*$")
+
 
 def is_nested(object_: PhysicsObject | str) -> bool:
     """Check if an object is a nested physics object"""
     if isinstance(object_, PhysicsObject):
         return isinstance(object_, Nested)
 
-    return bool(re.match(r"^[a-zA-Z]+\d*:?\d*\.[a-zA-Z]+\d*:?\d*$", object_))
+    return bool(NESTED_PATTERN.match(object_))
 
 
 class Nested(PhysicsObject):
     """A nested physics object"""
 
+    __slots__ = ("_main", "_sub")
+
     def __init__(
         self,
         main: PhysicsObject | str,
@@ -25,6 +29,7 @@ class Nested(PhysicsObject):
     ) -> None:
         self._main = self._init_object(main)
         self._sub = self._init_object(sub)
+        self._freeze()
 
     def _init_object(self, object_: PhysicsObject | str) -> PhysicsObject:
         if isinstance(object_, PhysicsObject):
@@ -60,8 +65,7 @@ class Nested(PhysicsObject):
     def slices(self) -> list[slice]:
         return [*self.main.slices, *self.sub.slices]
 
-    @property
-    def name(self) -> str:
+    def _build_name(self) -> str:
         return f"{self.main.name}.{self.sub.name}"
 
     @property
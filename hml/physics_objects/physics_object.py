@@ -4,11 +4,44 @@ from abc import ABC, abstractmethod
 
 
 class PhysicsObject(ABC):
+    """Base class of physics objects
+
+    Physics objects are immutable: subclasses set their attributes in `__init__`
+    and then call `_freeze`, which precomputes the canonical name and hash. This
+    makes them cheap to compare and usable as dict keys or in sets.
+    """
+
+    __slots__ = ("_hash", "_key", "_name")
+
+    def _freeze(self) -> None:
+        self._name = self._build_name()
+        self._key = self._name.lower()
+        # Setting the hash last marks the object as frozen
+        self._hash = hash(self._key)
+
+    def __setattr__(self, name: str, value) -> None:
+        if hasattr(self, "_hash"):
+            raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return self.__class__.from_config, (self.config,)
+
     def __eq__(self, other: PhysicsObject | str) -> bool:
         if isinstance(other, PhysicsObject):
-            return self.name.lower() == other.name.lower()
+            return self._key == other._key
+
+        if isinstance(other, str):
+            return self._key == other.lower()
 
-        return self.name.lower() == other.lower()
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
 
     def __str__(self) -> str:
         return self.name
@@ -33,8 +66,11 @@ class PhysicsObject(ABC):
     def slices(self) -> list[slice] | list[list[slice]]: ...
 
     @property
+    def name(self) -> str:
+        return self._name
+
     @abstractmethod
-    def name(self) -> str: ...
+    def _build_name(self) -> str: ...
 
     @property
     @abstractmethod
@@ -4,25 +4,30 @@ import re
 
 from .physics_object import PhysicsObject
 
+SINGLE_PATTERN = re.compile(r"^([a-zA-Z]+)(\d+)$")
+
 
 def is_single(object_: PhysicsObject | str) -> bool:
     """Check if an object is a single physics object"""
     if isinstance(object_, PhysicsObject):
         return isinstance(object_, Single)
 
-    return bool(re.match(r"^[a-zA-Z]+\d+$", object_))
+    return bool(SINGLE_PATTERN.match(object_))
 
 
 class Single(PhysicsObject):
     """A single physics object"""
 
+    __slots__ = ("_branch", "_index")
+
     def __init__(self, branch: str, index: int) -> None:
         self._branch = branch
         self._index = index
+        self._freeze()
 
     @classmethod
     def from_name(cls, name: str) -> Single:
-        if match_ := re.match(r"^([a-zA-Z]+)(\d+)$", name.strip()):
+        if match_ := SINGLE_PATTERN.match(name.strip()):
             branch, index = match_.groups()
             return cls(branch, int(index))
 
@@ -40,8 +45,7 @@ class Single(PhysicsObject):
     def slices(self) -> list[slice]:
         return [slice(self.index, self.index + 1)]
 
-    @property
-    def name(self) -> str:
+    def _build_name(self) -> str:
         return f"{self.branch}{self.index}"
 
     @property
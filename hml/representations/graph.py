@@ -1,2 +1,178 @@
+from __future__ import annotations
+
+from importlib import import_module
+
+import awkward as ak
+import numpy as np
+
+from hml.config import floatx
+from hml.observables import Observable, Planner, parse_observable
+from hml.observables.kinematics import Eta, Phi, Pt
+from hml.operations import knn, slice_to_numpy
+
+
 class Graph:
-    ...
+    """A point cloud of particles, e.g. the constituents of a jet.
+
+    Graph is a 2D representation of an event: each particle is a node with the
+    values of the observables as its features. The particles are padded or
+    truncated to `max_particles`, which gives dense tensors for networks like
+    SimpleGNN. Particles are sorted by decreasing pt, so the truncation keeps
+    the hardest ones. Nodes can be connected to their k nearest neighbours in the
+    (eta, phi) plane.
+
+    Parameters
+    ----------
+    observables : list[Observable | str]
+        Features of the particles, all of the same physics object, e.g.
+        "FatJet0.Constituents.Pt" or "Jet.Eta".
+    max_particles : int
+        Number of particles per event after padding and truncation.
+    k : int, optional
+        Number of neighbours of each particle. No edges by default.
+    """
+
+    def __init__(
+        self,
+        observables: list[str | Observable],
+        max_particles: int = 100,
+        k: int | None = None,
+    ):
+        self.observables = self._init_observables(observables)
+        self.max_particles = max_particles
+        self.k = k
+        self._values = None
+        self._masks = None
+        self._edges = None
+
+        physics_objects = {obs.physics_object for obs in self.observables}
+        if len(physics_objects) != 1:
+            raise ValueError("All features should be of the same physics object")
+        self.physics_object = physics_objects.pop()
+
+    def _init_observables(self, observables: list[str | Observable]):
+        output = []
+        for obs in observables:
+            if isinstance(obs, str):
+                output.append(parse_observable(obs))
+            else:
+                output.append(obs)
+
+        return output
+
+    def read(self, events):
+        observables = list(self.observables)
+        if self.k is not None:
+            eta, phi = Eta(self.physics_object), Phi(self.physics_object)
+            observables += [eta, phi]
+        observables.append(Pt(self.physics_object))
+
+        Planner(observables).read(events)
+
+        # The particles of each feature by decreasing pt, shape (n, var)
+        *particles, pt = [self._particles(obs) for obs in observables]
+        order = ak.argsort(pt, axis=1, ascending=False)
+        particles = [i[order] for i in particles]
+
+        padded = [self._pad(i) for i in particles[: len(self.observables)]]
+        is_valid = ~np.isnan(padded[0])
+        for i in padded[1:]:
+            is_valid &= ~np.isnan(i)
+
+        values = np.stack(padded, axis=-1)
+        values[~is_valid] = 0
+        self._values = values
+        self._masks = is_valid
+
+        if self.k is not None:
+            eta, phi = (i[:, : self.max_particles] for i in particles[-2:])
+            self._edges = self._pad_edges(knn(eta, phi, self.k))
+
+        return self
+
+    def _particles(self, obs: Observable) -> ak.Array:
+        if len(obs.shape) == 3:
+            # A single object with its particles, e.g. FatJet0.Constituents
+            if obs.shape[1] != 1:
+                raise ValueError(f"{obs.name} is not of a single object")
+            return ak.fill_none(obs.value[:, 0], [], axis=0)
+
+        return obs.value
+
+    def _pad(self, value: ak.Array) -> np.ndarray:
+        padded = slice_to_numpy(value, slice(0, self.max_particles))
+        if padded is not None:
+            return padded
+
+        value = ak.pad_none(value, self.max_particles, axis=1, clip=True)
+        value = ak.fill_none(value, np.nan, axis=-1)
+        return ak.to_numpy(value).astype(floatx(), copy=False)
+
+    def _pad_edges(self, indices: ak.Array) -> np.ndarray:
+        # Padded particles are their own neighbours
+        shape = (len(indices), self.max_particles, self.k)
+        edges = np.empty(shape, dtype=np.int32)
+        edges[:] = np.arange(self.max_particles, dtype=np.int32)[:, None]
+
+        counts = ak.to_numpy(ak.num(indices, axis=1))
+        events = np.repeat(np.arange(len(counts)), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        edges[events, np.arange(len(events)) - starts] = ak.to_numpy(
+            ak.flatten(indices, axis=1)
+        )
+
+        return edges
+
+    @property
+    def names(self):
+        return [i.name for i in self.observables]
+
+    @property
+    def values(self):
+        """Features of the particles, shape (n, max_particles, n_features).
+
+        Padded particles have zero features.
+        """
+        return self._values
+
+    @property
+    def masks(self):
+        """Whether each particle is a real one, shape (n, max_particles)."""
+        return self._masks
+
+    @property
+    def edges(self):
+        """Indices of the k nearest neighbours, shape (n, max_particles, k).
+
+        Missing neighbours and those of padded particles are the particle
+        itself, so the indices are always valid to gather.
+        """
+        return self._edges
+
+    @property
+    def config(self):
+        return {
+            "observable_configs": {
+                i: {
+                    "class_name": obs.__class__.__name__,
+                    "config": obs.config,
+                }
+                for i, obs in enumerate(self.observables)
+            },
+            "max_particles": self.max_particles,
+            "k": self.k,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        observables = []
+
+        for i_config in config["observable_configs"].values():
+            class_type = Observable.aliases[i_config["class_name"]]
+            class_name = class_type.__name__
+            module = import_module(class_type.__module__)
+            class_ = getattr(module, class_name)
+            class_config = i_config["config"]
+            observables.append(class_.from_config(class_config))
+
+        return cls(observables, config["max_particles"], config["k"])
@@ -3,17 +3,18 @@ from __future__ import annotations
 from importlib import import_module
 
 import awkward as ak
-import matplotlib.pyplot as plt
 import numba as nb
 import numpy as np
 import vector
-from fastjet import ClusterSequence, JetDefinition
 
-from hml.observables import parse_observable
-from hml.operations import get_jet_algorithm
+from hml.config import floatx
+from hml.observables import Planner, parse_observable
 
 vector.register_awkward()
 
+# Number of float16 images filled in float32 at a time
+FLOAT16_CHUNK_SIZE = 1024
+
 
 class Image:
     def __init__(self, height, width, channel=None):
@@ -38,15 +39,15 @@ class Image:
         self.been_read = False
         self.status = True
 
-        self.event = events
-        self.height.read(events)
-        self.height._value = ak.flatten(self.height._value, axis=-1)
-        self.width.read(events)
-        self.width._value = ak.flatten(self.width._value, axis=-1)
-
+        observables = [self.height, self.width]
         if self.channel is not None:
-            self.channel.read(events)
-            self.channel._value = ak.flatten(self.channel._value, axis=-1)
+            observables.append(self.channel)
+
+        # Keep the cached events for the constituents used by `with_subjets`
+        self.event = Planner(observables).read(events).events
+
+        for obs in observables:
+            obs._value = ak.flatten(obs._value, axis=-1)
         self.been_read = True
 
         for method, kwargs in self.registered_methods:
@@ -55,6 +56,10 @@ class Image:
         return self
 
     def with_subjets(self, constituents, algorithm, r, min_pt):
+        from fastjet import ClusterSequence, JetDefinition
+
+        from hml.operations import get_jet_algorithm
+
         if self.been_read:
             px = parse_observable(f"{constituents}.Px").read(self.event).value
             py = parse_observable(f"{constituents}.Py").read(self.event).value
@@ -201,7 +206,7 @@ class Image:
             #     [self.width.to_numpy(), self.height.to_numpy()]
             # )  # (2, n)
             # rotated_points = np.dot(rotation_matrix, points)  # (2, n)
-            angle = ak.values_astype(ak.fill_none(angle, np.nan), "float32")
+            angle = ak.values_astype(ak.fill_none(angle, np.nan), self.width.dtype)
             x = self.width.value
             y = self.height.value
             x_prime = np.cos(angle) * x - np.sin(angle) * y
@@ -263,15 +268,17 @@ class Image:
     def continuous_to_center(self, values, bins):
         def _transform_func(layout, **kwargs):
             if layout.is_numpy:
-                out_values = np.empty_like(layout.data)
-                bin_centers = (bins[:-1] + bins[1:]) / 2
+                # Integers are converted to floats to hold NaN out of the bins
+                dtype = np.result_type(layout.data.dtype, np.float32)
+                bin_centers = ((bins[:-1] + bins[1:]) / 2).astype(dtype)
                 bin_indices = np.digitize(layout.data, bins)
 
-                for i, index in enumerate(bin_indices):
-                    if index == 0 or index == len(bins):
-                        out_values[i] = np.nan
-                    else:
-                        out_values[i] = bin_centers[index - 1]
+                out_of_bins = (bin_indices == 0) | (bin_indices == len(bins))
+                out_values = np.where(
+                    out_of_bins,
+                    np.array(np.nan, dtype),
+                    bin_centers[np.clip(bin_indices - 1, 0, len(bin_centers) - 1)],
+                )
 
                 return ak.contents.NumpyArray(out_values)
 
@@ -284,19 +291,41 @@ class Image:
         total = len(widths)
 
         if self.been_pixelated is not None and self.been_read:
+            shape = (total, len(self.w_bins) - 1, len(self.h_bins) - 1)
+            weights = None
             if self.channel is not None:
                 weights = ak.fill_none(self.channel.value, np.nan)
-                hist = calculate_histograms(
-                    widths, heights, self.w_bins, self.h_bins, total, weights
-                )
-            else:
-                hist = calculate_histograms(
-                    widths, heights, self.w_bins, self.h_bins, total
+
+            # Images are filled in the float type of the policy directly
+            if floatx() != "float16":
+                hist = np.zeros(shape, dtype=floatx())
+                self._fill(widths, heights, weights, hist)
+                return hist
+
+            # numba does not support float16, so images are filled in float32
+            # by chunks of events and cast into the output chunk by chunk
+            hist = np.empty(shape, dtype="float16")
+            for start in range(0, total, FLOAT16_CHUNK_SIZE):
+                stop = min(start + FLOAT16_CHUNK_SIZE, total)
+                chunk = np.zeros((stop - start, *shape[1:]), dtype="float32")
+                self._fill(
+                    widths[start:stop],
+                    heights[start:stop],
+                    weights[start:stop] if weights is not None else None,
+                    chunk,
                 )
+                hist[start:stop] = chunk
+
             return hist
 
         return self.height.value, self.width.value
 
+    def _fill(self, widths, heights, weights, hist):
+        if weights is not None:
+            fill_histograms(widths, heights, self.w_bins, self.h_bins, hist, weights)
+        else:
+            fill_histograms(widths, heights, self.w_bins, self.h_bins, hist)
+
     def show(
         self,
         as_point=False,
@@ -305,6 +334,8 @@ class Image:
         grid=True,
         norm=None,
     ):
+        import matplotlib.pyplot as plt
+
         plt.figure()
 
         if not self.been_pixelated:
@@ -389,6 +420,23 @@ class Image:
             "h_bins": (self.h_bins.tolist() if self.been_pixelated else None),
         }
 
+    @property
+    def definition(self) -> dict:
+        """Config of the pipeline of the image, whether it has been read or not.
+
+        Unlike `config`, it does not change with reads, e.g. the operations
+        recorded by each of them, so it identifies the images of events.
+        """
+        config = self.config
+        return {
+            "height_config": config["height_config"],
+            "width_config": config["width_config"],
+            "channel_config": config["channel_config"],
+            "registered_methods": self.registered_methods,
+            "w_bins": self.w_bins.tolist() if self.been_pixelated else None,
+            "h_bins": self.h_bins.tolist() if self.been_pixelated else None,
+        }
+
     @classmethod
     def from_config(cls, config):
         module = import_module("hml.observables")
@@ -422,7 +470,7 @@ class Image:
         return instance
 
 
-@nb.njit
+@nb.njit(cache=True)
 def histogram2d_numba_weighted(x, y, bins, xrange, yrange, weights):
     hist = np.zeros((bins[0], bins[1]), dtype=np.float64)
 
@@ -443,7 +491,7 @@ def histogram2d_numba_weighted(x, y, bins, xrange, yrange, weights):
     return hist
 
 
-@nb.njit
+@nb.njit(cache=True)
 def histogram2d_numba(x, y, bins, xrange, yrange):
     """
     A simplified version of numpy.histogram2d compatible with Numba.
@@ -476,14 +524,20 @@ def histogram2d_numba(x, y, bins, xrange, yrange):
     return hist
 
 
-@nb.njit
+@nb.njit(cache=True)
 def calculate_histograms(widths, heights, w_bins, h_bins, total, weights=None):
-    # Assuming widths and heights are flat NumPy arrays of the same length
-    # and that missing data has been handled prior to this call.
+    hists = np.zeros((total, len(w_bins) - 1, len(h_bins) - 1))
+    fill_histograms(widths, heights, w_bins, h_bins, hists, weights)
 
-    hists = np.zeros(
-        (total, len(w_bins) - 1, len(h_bins) - 1)
-    )  # Pre-allocate based on expected sizes
+    return hists
+
+
+@nb.njit(cache=True)
+def fill_histograms(widths, heights, w_bins, h_bins, hists, weights=None):
+    # Assuming widths and heights are flat NumPy arrays of the same length
+    # and that missing data has been handled prior to this call. Each image is
+    # accumulated in float64 and then stored in the float type of `hists`.
+    total = len(hists)
     if weights is not None:
         for i in range(total):
             hist = histogram2d_numba_weighted(
@@ -505,5 +559,3 @@ def calculate_histograms(widths, heights, w_bins, h_bins, total, weights=None):
                 yrange=(h_bins[0], h_bins[-1]),
             )
             hists[i] = hist
-
-    return hists
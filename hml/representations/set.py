@@ -4,7 +4,8 @@ from importlib import import_module
 
 import awkward as ak
 
-from hml.observables import Observable, parse_observable
+from hml.config import floatx
+from hml.observables import Observable, Planner, parse_observable
 
 
 class Set:
@@ -35,25 +36,25 @@ class Set:
         return output
 
     def read(self, events):
+        Planner(self.observables).read(events)
+
         values = []
         for obs in self.observables:
-            obs.read(events)
-
             if len(obs.shape) == 2:
                 # Maybe a single or collective observable
-                if obs.shape[-1] != "1":
+                if obs.shape[-1] != 1:
                     raise ValueError
 
                 value = obs.value
 
             if len(obs.shape) == 3:
                 # Should be the delta_r observable
-                if obs.shape[1] == "1" and obs.shape[2] == "1":
+                if obs.shape[1:] == (1, 1):
                     value = obs.value[:, :, 0]
 
             values.append(value)
 
-        self._values = ak.concatenate(values, axis=1)
+        self._values = ak.values_astype(ak.concatenate(values, axis=1), floatx())
 
         return self
 
@@ -0,0 +1,150 @@
+import numpy as np
+import pytest
+from sklearn.metrics import log_loss
+
+from hml.approaches import GradientBoostedDecisionTree, TreeEnsemble, load_approach
+from hml.approaches.trees.tree_ensemble import MAX_COMPLETE_DEPTH
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(42)
+    x = rng.normal(size=(1000, 4))
+    y = (x[:, 0] + 0.5 * x[:, 1] + 0.5 * rng.normal(size=1000) > 0).astype("int32")
+    yield x[:800], y[:800], x[800:], y[800:]
+
+
+@pytest.mark.parametrize("backend", ["exact", "hist"])
+def test_fit_predict(data, backend):
+    x_train, y_train, x_val, y_val = data
+    model = GradientBoostedDecisionTree(n_estimators=10, backend=backend)
+    model.compile(metrics=["accuracy"])
+    history = model.fit(x_train, y_train, validation_data=(x_val, y_val), verbose=0)
+
+    assert set(history.history) == {"loss", "accuracy", "val_loss", "val_accuracy"}
+    assert all(len(i) == 10 for i in history.history.values())
+    assert history.history["loss"][-1] < history.history["loss"][0]
+    assert model.predict(x_val).shape == (200, 2)
+
+
+def test_hist_backend(data):
+    x_train, y_train, x_val, y_val = data
+
+    # Early stopping on the validation data
+    model = GradientBoostedDecisionTree(
+        n_estimators=500, backend="hist", n_iter_no_change=2, n_threads=1
+    )
+    model.compile()
+    history = model.fit(x_train, y_train, validation_data=(x_val, y_val), verbose=0)
+
+    assert len(history.history["loss"]) == model.estimator_.n_iter_ < 500
+    assert model.get_params()["backend"] == "hist"
+
+    # A fraction of samples per leaf is converted to a number of samples
+    model = GradientBoostedDecisionTree(
+        n_estimators=5, backend="hist", min_samples_leaf=0.05
+    )
+    model.fit(x_train, y_train, verbose=0)
+    assert model.estimator_.min_samples_leaf == 40
+
+    # Error cases ------------------------------------------------------------ #
+    with pytest.raises(ValueError):
+        model = GradientBoostedDecisionTree(backend="hist", loss="exponential")
+        model.fit(x_train, y_train, verbose=0)
+
+    with pytest.raises(ValueError):
+        model = GradientBoostedDecisionTree(backend="hist", min_samples_leaf=1.5)
+        model.fit(x_train, y_train, verbose=0)
+
+    with pytest.raises(ValueError):
+        GradientBoostedDecisionTree(backend="unknown").fit(x_train, y_train, verbose=0)
+
+
+def test_validation_history(data):
+    x_train, y_train, x_val, y_val = data
+    model = GradientBoostedDecisionTree(n_estimators=10)
+    model.compile(metrics=["accuracy"])
+    history = model.fit(x_train, y_train, validation_data=(x_val, y_val), verbose=0)
+
+    # Validation losses follow the current stage rather than the first one
+    expected = [log_loss(y_val, y_prob) for y_prob in model.staged_predict_proba(x_val)]
+    np.testing.assert_allclose(history.history["val_loss"], expected, rtol=1e-5)
+    np.testing.assert_allclose(
+        model._val_raw_predictions, model.decision_function(x_val)[:, None]
+    )
+
+
+@pytest.mark.parametrize("loss", ["log_loss", "exponential"])
+@pytest.mark.parametrize("init", [None, "zero"])
+def test_validation_history_public_api(data, loss, init):
+    x_train, _, x_val, _ = data
+
+    # Three classes unless the loss is only binary
+    n_classes = 2 if loss == "exponential" else 3
+    y_train = np.digitize(x_train[:, 0], [-0.5, 0.5]) % n_classes
+    y_val = np.digitize(x_val[:, 0], [-0.5, 0.5]) % n_classes
+
+    model = GradientBoostedDecisionTree(n_estimators=5, init=init)
+    model.compile(loss=loss)
+    history = model.fit(x_train, y_train, validation_data=(x_val, y_val), verbose=0)
+
+    # Initial and staged raw predictions match the public decision function
+    raw_predictions = model.decision_function(x_val)
+    raw_predictions = raw_predictions.reshape(len(x_val), -1)
+    np.testing.assert_allclose(model._val_raw_predictions, raw_predictions)
+
+    if loss == "log_loss":
+        expected = [log_loss(y_val, i) for i in model.staged_predict_proba(x_val)]
+    else:
+        expected = [
+            np.mean(np.exp(-(2 * y_val - 1) * i[:, 0]))
+            for i in model.staged_decision_function(x_val)
+        ]
+    np.testing.assert_allclose(history.history["val_loss"], expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize("backend", ["exact", "hist"])
+@pytest.mark.parametrize("n_classes", [2, 3])
+def test_export(data, backend, n_classes, tmp_path):
+    x_train, y_train, x_val, _ = data
+    if n_classes == 3:
+        y_train = np.digitize(x_train[:, 0], [-0.5, 0.5])
+
+    if backend == "hist":
+        x_val = x_val.copy()
+        x_val[::7, 1] = np.nan
+
+    model = GradientBoostedDecisionTree(n_estimators=10, backend=backend)
+    model.compile()
+    model.fit(x_train, y_train, verbose=0)
+
+    ensemble = model.export(tmp_path / "model")
+    assert ensemble.n_trees == 10 * (1 if n_classes == 2 else n_classes)
+    np.testing.assert_array_equal(ensemble.predict(x_val), model.predict(x_val))
+
+    loaded = load_approach(tmp_path / "model.npz")
+    assert isinstance(loaded, TreeEnsemble)
+    np.testing.assert_array_equal(loaded.predict(x_val), model.predict(x_val))
+
+
+@pytest.mark.parametrize("max_depth", [1, 3, MAX_COMPLETE_DEPTH + 2])
+def test_export_complete_trees(data, max_depth):
+    x_train, y_train, x_val, _ = data
+    x_val = x_val.copy()
+    x_val[::5, 0] = np.nan
+
+    # Few leaves give trees with leaves above their deepest level
+    is_shallow = max_depth <= MAX_COMPLETE_DEPTH
+    model = GradientBoostedDecisionTree(
+        n_estimators=10,
+        backend="hist",
+        max_depth=max_depth,
+        max_leaf_nodes=6 if is_shallow else None,
+        min_samples_leaf=20 if is_shallow else 1,
+    )
+    model.compile()
+    model.fit(x_train, y_train, verbose=0)
+
+    ensemble = model.export()
+    assert (ensemble._complete_trees is not None) == is_shallow
+    np.testing.assert_array_equal(ensemble.predict(x_val), model.predict(x_val))
@@ -0,0 +1,57 @@
+import keras
+import numpy as np
+
+from hml.approaches import SimpleGNN
+
+
+def make_inputs(n=64, n_particles=10, n_features=3, k=4):
+    rng = np.random.default_rng(42)
+    features = rng.normal(size=(n, n_particles, n_features)).astype("float32")
+    counts = rng.integers(1, n_particles, n)
+    masks = np.arange(n_particles) < counts[:, None]
+    features[~masks] = 0
+
+    # Neighbours among the real particles, padded particles are their own
+    edges = rng.integers(0, counts[:, None, None], (n, n_particles, k))
+    own = np.broadcast_to(np.arange(n_particles)[None, :, None], edges.shape)
+    edges = np.where(masks[:, :, None], edges, own).astype("int32")
+    targets = rng.integers(0, 2, n)
+
+    return [features, masks, edges], targets
+
+
+def test_fit_predict():
+    inputs, targets = make_inputs()
+    model = SimpleGNN(input_shape=(10, 3), k=4)
+    model.compile(optimizer="adam", loss="sparse_categorical_crossentropy")
+    model.fit(inputs, targets, epochs=1, batch_size=16, verbose=0)
+
+    outputs = model.predict(inputs, verbose=0)
+    assert outputs.shape == (64, 2)
+    np.testing.assert_allclose(outputs.sum(axis=1), 1, rtol=1e-5)
+
+    # Padded particles do not change the outputs
+    features, masks, edges = inputs
+    noisy = np.where(masks[:, :, None], features, 100.0).astype("float32")
+    np.testing.assert_allclose(
+        model.predict([noisy, masks, edges], verbose=0), outputs, rtol=1e-5
+    )
+
+
+def test_dynamic():
+    inputs, _ = make_inputs()
+    model = SimpleGNN(input_shape=(10, 3), k=4, dynamic=True)
+
+    assert model.predict(inputs, verbose=0).shape == (64, 2)
+    assert model.get_config()["dynamic"] is True
+
+
+def test_save_load(tmp_path):
+    inputs, _ = make_inputs()
+    model = SimpleGNN(input_shape=(10, 3), k=4)
+    model.save(f"{tmp_path}/model.keras")
+
+    loaded = keras.models.load_model(f"{tmp_path}/model.keras")
+    np.testing.assert_allclose(
+        loaded.predict(inputs, verbose=0), model.predict(inputs, verbose=0)
+    )
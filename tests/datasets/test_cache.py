@@ -0,0 +1,153 @@
+import os
+import time
+
+import numpy as np
+
+from hml.approaches import Cut
+from hml.datasets.cache import (
+    cache_dir,
+    cached_arrays,
+    clear,
+    cuts_config,
+    events_identity,
+    evict,
+    file_identity,
+    hash_config,
+    list_entries,
+    load_arrays,
+    save_arrays,
+)
+
+
+def test_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("HML_CACHE_DIR", str(tmp_path))
+    assert cache_dir() == tmp_path
+
+    monkeypatch.delenv("HML_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert cache_dir() == tmp_path / "hml"
+
+
+def test_hash_config(tmp_path):
+    assert hash_config({"a": 1, "b": [2, 3]}) == hash_config({"b": [2, 3], "a": 1})
+    assert hash_config({"a": 1}) != hash_config({"a": 2})
+
+    filepath = tmp_path / "events.root"
+    filepath.write_bytes(b"events")
+    identity = file_identity(filepath)
+    assert identity["path"] == str(filepath)
+    assert identity["size"] == 6
+
+    filepath.write_bytes(b"more events")
+    assert hash_config(file_identity(filepath)) != hash_config(identity)
+
+
+def test_save_and_load_arrays(tmp_path):
+    samples = np.random.rand(10, 3).astype(np.float32)
+    targets = np.arange(10, dtype=np.int32)
+    directory = save_arrays(
+        tmp_path / "entry", {"samples": samples, "targets": targets}, {"a": 1}
+    )
+
+    arrays, config = load_arrays(directory, verify=True)
+    assert config == {"a": 1}
+    assert isinstance(arrays["samples"], np.memmap)
+    np.testing.assert_array_equal(arrays["samples"], samples)
+    np.testing.assert_array_equal(arrays["targets"], targets)
+
+    # Saving again replaces the entry
+    save_arrays(directory, {"samples": samples[:5]})
+    arrays, config = load_arrays(directory)
+    assert config is None
+    assert list(arrays) == ["samples"]
+    assert arrays["samples"].shape == (5, 3)
+
+
+def test_load_corrupted_arrays(tmp_path):
+    samples = np.random.rand(10, 3)
+    directory = save_arrays(tmp_path / "entry", {"samples": samples})
+
+    # The same size but other values
+    filepath = directory / "samples.npy"
+    content = bytearray(filepath.read_bytes())
+    content[-1] ^= 0xFF
+    filepath.write_bytes(bytes(content))
+    assert load_arrays(directory) == (None, None)
+
+    os.remove(filepath)
+    assert load_arrays(directory) == (None, None)
+    assert load_arrays(tmp_path / "missing") == (None, None)
+
+
+def test_events_identity(events):
+    identity = events_identity(events)
+    assert identity["path"] == os.path.abspath(events.file.file_path)
+    assert identity["object_path"] == "/Delphes;1"
+    assert identity["entry_start"] is None
+
+    # Arrays in memory have no file
+    assert events_identity({"Jet.PT": None}) is None
+
+
+def test_cuts_config():
+    assert cuts_config(None) is None
+    assert cuts_config(["jet.size > 1", Cut("fatjet.size > 0")]) == [
+        "jet.size > 1",
+        "fatjet.size > 0",
+    ]
+
+
+def test_cached_arrays(tmp_path):
+    n_builds = []
+
+    def build():
+        n_builds.append(1)
+        return {"samples": np.arange(10.0)}
+
+    arrays = cached_arrays("tests", {"a": 1}, build, root=tmp_path)
+    assert isinstance(arrays["samples"], np.memmap)
+
+    arrays = cached_arrays("tests", {"a": 1}, build, root=tmp_path)
+    np.testing.assert_array_equal(arrays["samples"], np.arange(10.0))
+    assert len(n_builds) == 1
+
+    cached_arrays("tests", {"a": 2}, build, root=tmp_path)
+    assert len(n_builds) == 2
+
+    # The built arrays are returned when the cache is not writable
+    root = tmp_path / "file"
+    root.write_text("")
+    arrays = cached_arrays("tests", {"a": 1}, build, root=root)
+    np.testing.assert_array_equal(arrays["samples"], np.arange(10.0))
+    assert len(n_builds) == 3
+
+
+def test_list_evict_and_clear(tmp_path):
+    for i in range(3):
+        save_arrays(tmp_path / "tests" / str(i), {"samples": np.zeros(1000)}, i)
+        # Entries are ordered by their last use
+        os.utime(tmp_path / "tests" / str(i) / "manifest.json", (i, i))
+    save_arrays(tmp_path / "others" / "0", {"samples": np.zeros(10)})
+
+    entries = list_entries("tests", root=tmp_path)
+    assert [i["key"] for i in entries] == ["0", "1", "2"]
+    assert [i["config"] for i in entries] == [0, 1, 2]
+    assert all(i["size"] > 8000 for i in entries)
+    assert len(list_entries(root=tmp_path)) == 4
+
+    # The least recently used entries are evicted first
+    total = sum(i["size"] for i in list_entries(root=tmp_path))
+    evicted = evict(total - 1, root=tmp_path)
+    assert [i["key"] for i in evicted] == ["0"]
+
+    # A cache hit makes an entry the most recently used
+    os.utime(tmp_path / "tests" / "1" / "manifest.json", (time.time(),) * 2)
+    evicted = evict(entries[1]["size"] + 10, root=tmp_path)
+    assert [(i["namespace"], i["key"]) for i in evicted] == [
+        ("tests", "2"),
+        ("others", "0"),
+    ]
+
+    assert clear("others", root=tmp_path) == 0
+    assert clear(root=tmp_path) == 1
+    assert list_entries(root=tmp_path) == []
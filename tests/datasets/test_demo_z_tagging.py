@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from hml.datasets import ImageDataset, SetDataset
+from hml.datasets.demo_z_tagging import load_data
+
+FILEPATH = "tests/data/pp2zz/Events/run_01/tag_1_delphes_events.root"
+
+
+def test_load_data(tmp_path, monkeypatch):
+    ds = load_data(FILEPATH, FILEPATH, cache_dir=tmp_path)
+
+    assert isinstance(ds, SetDataset)
+    assert isinstance(ds._samples, np.memmap)
+    assert ds.samples.shape == (150, 3)
+    assert ds.targets.tolist() == [1] * 75 + [0] * 75
+
+    # Later calls load the cached arrays without reading events
+    def read(*args, **kwargs):
+        raise AssertionError("events should not be read again")
+
+    monkeypatch.setattr(SetDataset, "read", read)
+    cached = load_data(FILEPATH, FILEPATH, cache_dir=tmp_path)
+    np.testing.assert_array_equal(cached.samples, ds.samples)
+    np.testing.assert_array_equal(cached.targets, ds.targets)
+
+    ds.split(0.7, 0.3, seed=42)
+    assert ds.train.samples.shape == (105, 3)
+
+
+def test_load_data_from_madgraph_output(tmp_path):
+    ds = load_data("tests/data/pp2zz", [FILEPATH], "image", cache_dir=tmp_path)
+
+    assert isinstance(ds, ImageDataset)
+    assert ds.samples.shape == (150, 33, 33)
+    assert ds.targets.shape == (150,)
+
+
+def test_load_data_without_writable_cache(tmp_path):
+    cache_dir = tmp_path / "file"
+    cache_dir.write_text("")
+
+    ds = load_data(FILEPATH, FILEPATH, cache_dir=cache_dir)
+    assert not isinstance(ds.samples, np.memmap)
+    assert ds.samples.shape == (150, 3)
+    assert ds.targets.tolist() == [1] * 75 + [0] * 75
+
+
+def test_load_data_rebuilds_corrupted_cache(tmp_path):
+    ds = load_data(FILEPATH, FILEPATH, cache_dir=tmp_path)
+    samples = np.array(ds.samples)
+
+    (filepath,) = tmp_path.glob("datasets/*/samples.npy")
+    content = bytearray(filepath.read_bytes())
+    content[-1] ^= 0xFF
+    filepath.write_bytes(bytes(content))
+
+    ds = load_data(FILEPATH, FILEPATH, cache_dir=tmp_path)
+    np.testing.assert_array_equal(ds.samples, samples)
+
+
+def test_load_data_with_invalid_inputs(tmp_path):
+    with pytest.raises(ValueError):
+        load_data(FILEPATH, FILEPATH, "graph", cache_dir=tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        load_data("tests/data/pp2tt", FILEPATH, cache_dir=tmp_path)
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from hml.datasets import GraphDataset, load_dataset
+from hml.representations import Graph
+
+FEATURES = [
+    "FatJet0.Constituents.Pt",
+    "FatJet0.Constituents.Eta",
+    "FatJet0.Constituents.Phi",
+]
+CUTS = ["fatjet.size > 0 and jet.size > 1"]
+
+
+def test_init():
+    ds = GraphDataset(Graph(FEATURES, max_particles=50, k=8))
+
+    # Attributes ------------------------------------------------------------- #
+    assert ds.graph.config == Graph(FEATURES, max_particles=50, k=8).config
+    assert ds.been_split is False
+    assert ds.seed is None
+    assert ds.train is None
+    assert ds.test is None
+    assert ds.val is None
+
+    assert ds.samples.shape == (0,)
+    assert ds.masks.shape == (0,)
+    assert ds.edges.shape == (0,)
+    assert ds.targets.shape == (0,)
+    assert ds.feature_names == FEATURES
+    assert ds.config["class_name"] == "GraphDataset"
+
+    assert GraphDataset.from_config(ds.config).config == ds.config
+
+
+def test_read(events):
+    ds = GraphDataset(Graph(FEATURES, max_particles=50, k=8))
+    ds.read(events, 1, CUTS)
+
+    assert ds.samples.shape == (75, 50, 3)
+    assert ds.masks.shape == (75, 50)
+    assert ds.edges.shape == (75, 50, 8)
+    assert ds.targets.shape == (75,)
+
+    # Reading a chunk of events at a time gives the same arrays
+    chunked = GraphDataset(Graph(FEATURES, max_particles=50, k=8))
+    chunked.read(events, 1, CUTS, step_size=30)
+    np.testing.assert_array_equal(chunked.samples, ds.samples)
+    np.testing.assert_array_equal(chunked.masks, ds.masks)
+    np.testing.assert_array_equal(chunked.edges, ds.edges)
+
+    ds.read(events, 0)
+    assert ds.samples.shape == (175, 50, 3)
+    assert ds.targets.sum() == 75
+
+
+def test_split(events):
+    ds = GraphDataset(Graph(FEATURES, max_particles=50, k=8))
+    ds.read(events, 1, CUTS)
+
+    ds.split(0.7, 0.2, 0.1)
+    assert ds.train.samples.shape == (52, 50, 3)
+    assert ds.test.masks.shape == (15, 50)
+    assert ds.val.edges.shape == (8, 50, 8)
+
+    # Error cases ------------------------------------------------------------ #
+    with pytest.raises(ValueError):
+        ds.split(0.7, 0.5)
+
+    with pytest.raises(ValueError):
+        ds.split(0.7, 0.2, 0.5)
+
+
+def test_save_load(events, tmp_path):
+    ds = GraphDataset(Graph(FEATURES, max_particles=50, k=8))
+    ds.read(events, 1, CUTS)
+    ds.split(0.7, 0.2, 0.1)
+    ds.save(f"{tmp_path}/mock.ds")
+
+    # Lazy loading ----------------------------------------------------------- #
+    loaded_ds = load_dataset(f"{tmp_path}/mock.ds")
+    assert isinstance(loaded_ds, GraphDataset)
+    assert len(loaded_ds._samples) == 0
+    assert loaded_ds.config == ds.config
+    np.testing.assert_array_equal(loaded_ds.samples, ds.samples)
+    np.testing.assert_array_equal(loaded_ds.train.edges, ds.train.edges)
+    np.testing.assert_array_equal(loaded_ds.val.masks, ds.val.masks)
+
+    # Eager loading ---------------------------------------------------------- #
+    loaded_ds = GraphDataset.load(f"{tmp_path}/mock.ds", lazy=False)
+    assert len(loaded_ds._samples) != 0
+    assert loaded_ds.test.targets.shape == (15,)
+
+    # Without edges
+    ds = GraphDataset(Graph(["Jet.Pt"], max_particles=4))
+    ds.read(events, 0)
+    ds.save(f"{tmp_path}/jets.ds")
+    assert load_dataset(f"{tmp_path}/jets.ds").edges is None
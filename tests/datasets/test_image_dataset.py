@@ -1,7 +1,11 @@
+import shutil
+
 import numpy as np
 import pytest
+import uproot
 
 from hml.datasets import ImageDataset
+from hml.datasets.cache import list_entries
 from hml.representations import Image
 
 
@@ -89,6 +93,74 @@ def test_read(events):
     assert ds.targets.shape == (99,)
 
 
+def test_read_with_cache(events, monkeypatch, tmp_path):
+    monkeypatch.setenv("HML_CACHE_DIR", str(tmp_path))
+    image = (
+        Image(
+            height="FatJet0.Constituents.Phi",
+            width="FatJet0.Constituents.Eta",
+            channel="FatJet0.Constituents.Pt",
+        )
+        .with_subjets("FatJet0.Constituents", "kt", 0.3, 0)
+        .translate(origin="SubJet0")
+        .rotate(axis="SubJet1", orientation=-90)
+        .pixelate(size=(33, 33), range=[(-1.6, 1.6), (-1.6, 1.6)])
+    )
+    cuts = ["fatjet.size > 0"]
+    ds = ImageDataset(image)
+    ds.read(events, 1, cuts, cache=True)
+    assert len(list_entries("images")) == 1
+
+    # A cache hit reads no events
+    def read(*args, **kwargs):
+        raise AssertionError("events should not be read again")
+
+    monkeypatch.setattr(Image, "read", read)
+    cached = ImageDataset(image)
+    cached.read(events, 1, cuts, cache=True)
+
+    np.testing.assert_array_equal(cached.samples, ds.samples)
+    np.testing.assert_array_equal(cached.targets, ds.targets)
+
+
+def test_read_files_with_cache(events, monkeypatch, tmp_path):
+    monkeypatch.setenv("HML_CACHE_DIR", str(tmp_path / "cache"))
+    filepaths = []
+    for i in range(3):
+        filepaths.append(tmp_path / f"events_{i}.root")
+        shutil.copy(events.file.file_path, filepaths[-1])
+
+    def make_image():
+        return (
+            Image(
+                height="FatJet0.Constituents.Phi",
+                width="FatJet0.Constituents.Eta",
+            )
+            .with_subjets("FatJet0.Constituents", "kt", 0.3, 0)
+            .translate(origin="SubJet0")
+            .pixelate(size=(33, 33), range=[(-1.6, 1.6), (-1.6, 1.6)])
+        )
+
+    ds = ImageDataset(make_image())
+    for filepath in filepaths:
+        with uproot.open(filepath) as f:
+            ds.read(f["Delphes"], 1, cache=True)
+    assert len(list_entries("images")) == 3
+
+    # The key does not depend on earlier reads, every file hits the cache
+    def read(*args, **kwargs):
+        raise AssertionError("events should not be read again")
+
+    monkeypatch.setattr(Image, "read", read)
+    cached = ImageDataset(make_image())
+    for filepath in filepaths:
+        with uproot.open(filepath) as f:
+            cached.read(f["Delphes"], 1, cache=True)
+
+    assert len(list_entries("images")) == 3
+    np.testing.assert_array_equal(cached.samples, ds.samples)
+
+
 def test_split():
     image = Image(
         height="FatJet0.Constituents:.Phi",
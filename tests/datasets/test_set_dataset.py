@@ -1,6 +1,8 @@
+import numpy as np
 import pytest
 
 from hml.datasets import SetDataset
+from hml.datasets.cache import list_entries
 from hml.representations import Set
 
 
@@ -34,6 +36,8 @@ def test_init():
                     "physics_object": "FatJet0",
                     "m": 2,
                     "n": 1,
+                    "beta": None,
+                    "r0": None,
                 },
             },
             2: {
@@ -56,6 +60,31 @@ def test_read(events):
     assert ds.targets.shape == (75,)
 
 
+def test_read_with_cache(events, monkeypatch, tmp_path):
+    monkeypatch.setenv("HML_CACHE_DIR", str(tmp_path))
+    cuts = ["fatjet.size > 0 and jet.size > 1"]
+    ds = SetDataset(["FatJet0.Mass", "FatJet0.Tau21", "Jet0,Jet1.DeltaR"])
+    ds.read(events, 1, cuts, cache=True)
+    assert len(list_entries("sets")) == 1
+
+    # A cache hit reads no events
+    def read(*args, **kwargs):
+        raise AssertionError("events should not be read again")
+
+    monkeypatch.setattr(Set, "read", read)
+    cached = SetDataset(["FatJet0.Mass", "FatJet0.Tau21", "Jet0,Jet1.DeltaR"])
+    cached.read(events, 1, cuts, cache=True)
+    cached.read(events, 0, cuts, cache=True)
+
+    assert cached.samples.shape == (150, 3)
+    np.testing.assert_array_equal(cached.samples[:75], ds.samples)
+    assert cached.targets.tolist() == [1] * 75 + [0] * 75
+
+    # Other cuts are another entry
+    with pytest.raises(AssertionError):
+        cached.read(events, 1, ["fatjet.size > 0"], cache=True)
+
+
 def test_from_config():
     ds = SetDataset(["FatJet0.Mass", "FatJet0.Tau21", "Jet0,Jet1.DeltaR"])
 
@@ -5,7 +5,7 @@ from keras.metrics import FalseNegatives, FalsePositives, TrueNegatives, TruePos
 from keras.ops import convert_to_numpy
 from sklearn.metrics import roc_curve
 
-from hml.metrics.max_significance import calculate_thresholds
+from hml.metrics.max_significance import calculate_thresholds, max_significance
 
 
 def test_thresholds():
@@ -35,3 +35,54 @@ def test_thresholds():
     np.testing.assert_allclose(tpr, hml_tpr)
     np.testing.assert_allclose(fpr, hml_fpr)
     np.testing.assert_allclose(thresholds[1:], keras_thresholds[1:], rtol=1e-5)
+
+
+def test_max_significance():
+    np.random.seed(0)
+    y_true = np.random.choice([0, 1], (200,))
+    y_prob = np.random.uniform(0, 1, (200,))
+    y_prob[:20] = 0.5  # Tied scores
+
+    # Efficiencies should match the ROC curve
+    scan = max_significance(y_true, y_prob)
+    fpr, tpr, _thresholds = roc_curve(y_true, y_prob, drop_intermediate=False)
+    np.testing.assert_allclose(np.unique(scan.signal_efficiency[0]), np.unique(tpr[1:]))
+    np.testing.assert_allclose(
+        np.unique(scan.background_efficiency[0]), np.unique(fpr[1:])
+    )
+
+    # Without cross sections, the significance is calculated from counts
+    s = np.array([np.sum(y_true[y_prob >= i] == 1) for i in scan.thresholds[0]])
+    b = np.array([np.sum(y_true[y_prob >= i] == 0) for i in scan.thresholds[0]])
+    np.testing.assert_allclose(scan.significance[0, 0, 0], s / np.sqrt(s + b))
+    np.testing.assert_allclose(
+        scan.max_significance[0, 0, 0], np.max(s / np.sqrt(s + b))
+    )
+
+    # Many models over a grid of luminosities and cross sections
+    y_probs = [
+        y_prob,
+        np.random.uniform(0, 1, (200,)),
+        np.stack([1 - y_prob, y_prob], 1),
+    ]
+    luminosity = [1, 10, 100]
+    cross_sections = [[10, 1], [100, 1]]
+    scan = max_significance(y_true, y_probs, cross_sections, luminosity)
+
+    assert scan.significance.shape == (3, 3, 2, 200)
+    assert scan.max_significance.shape == (3, 3, 2)
+    assert scan.best_thresholds.shape == (3, 3, 2)
+    np.testing.assert_allclose(scan.max_significance[0], scan.max_significance[2])
+
+    # Significance scales with the square root of the luminosity
+    np.testing.assert_allclose(
+        scan.max_significance[:, 1] / scan.max_significance[:, 0], np.sqrt(10)
+    )
+
+    tpr = scan.signal_efficiency[0]
+    fpr = scan.background_efficiency[0]
+    s = 1 * tpr  # signal is the class 1
+    b = 100 * fpr
+    expected = np.where(fpr > 0, s / np.sqrt(s + b), np.nan)
+    np.testing.assert_allclose(scan.significance[0, 0, 1], expected)
+    np.testing.assert_allclose(scan.max_significance[0, 0, 1], np.nanmax(expected))
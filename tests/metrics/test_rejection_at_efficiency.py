@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from sklearn.metrics import roc_curve
+
+from hml.metrics import ROCAccumulator, rejection_at_efficiency
+
+
+def test_rejection_at_efficiency():
+    np.random.seed(0)
+    y_true = np.random.choice([0, 1], (1000,))
+    y_prob = np.clip(np.random.normal(0.3 + 0.4 * y_true, 0.2), 0, 1)
+
+    # Compare with the exact ROC curve with thresholds on the bin edges
+    fpr, tpr, _thresholds = roc_curve(y_true, np.floor(y_prob * 100) / 100)
+    for efficiency in [0.3, 0.5, 0.8]:
+        expected = 1 / np.min(fpr[tpr >= efficiency])
+        result = rejection_at_efficiency(y_true, y_prob, efficiency, num_thresholds=100)
+        np.testing.assert_allclose(result, expected)
+
+    # Several efficiencies at once
+    result = rejection_at_efficiency(y_true, y_prob, [0.3, 0.5, 0.8])
+    assert result.shape == (3,)
+    assert np.all(np.diff(result) < 0)
+
+    # Multi-class probabilities and one-hot labels
+    y_prob_2d = np.stack([1 - y_prob, y_prob], 1)
+    y_true_2d = np.eye(2)[y_true]
+    result = rejection_at_efficiency(y_true_2d, y_prob_2d, [0.3, 0.5])
+    assert result.shape == (2, 2)
+    np.testing.assert_allclose(
+        result[1], rejection_at_efficiency(y_true, y_prob, [0.3, 0.5])
+    )
+
+
+def test_roc_accumulator():
+    np.random.seed(0)
+    y_true = np.random.choice([0, 1, 2], (900,))
+    y_prob = np.random.dirichlet([1, 1, 1], (900,))
+    weights = np.random.uniform(0.5, 1.5, (900,))
+
+    # Merging partial states equals accumulating all samples at once
+    full = ROCAccumulator().update(y_true, y_prob, weights)
+    parts = [
+        ROCAccumulator().update(
+            y_true[i : i + 300], y_prob[i : i + 300], weights[i : i + 300]
+        )
+        for i in range(0, 900, 300)
+    ]
+    merged = ROCAccumulator().merge(*parts)
+    np.testing.assert_allclose(merged.histograms, full.histograms)
+    np.testing.assert_allclose(merged.result([0.5, 0.9]), full.result([0.5, 0.9]))
+    assert full.result([0.5, 0.9]).shape == (3, 2)
+    assert full.result(0.5, class_id=2).shape == ()
+
+    # Integer weights are the same as repeated samples
+    repeated = ROCAccumulator().update(np.repeat(y_true, 2), np.repeat(y_prob, 2, 0))
+    weighted = ROCAccumulator().update(y_true, y_prob, np.full(900, 2.0))
+    np.testing.assert_allclose(repeated.histograms, weighted.histograms)
+
+    # Error cases ------------------------------------------------------------ #
+    with pytest.raises(ValueError):
+        ROCAccumulator().result(0.5)
+
+    with pytest.raises(ValueError):
+        ROCAccumulator(100).merge(ROCAccumulator(200))
+
+    with pytest.raises(ValueError):
+        full.update(y_true, np.stack([1 - y_prob[:, 0], y_prob[:, 0]], 1))
@@ -1,6 +1,7 @@
 import pytest
 
 from hml.observables.angular_distance import AngularDistance
+from hml.operations import cache_events
 
 
 def test_attributes():
@@ -39,3 +40,8 @@ def test_read(events):
 
     obj = AngularDistance("Jet0.Constituents:10,Jet1.Constituents:10").read(events)
     assert str(obj.value.type) == "100 * 10 * 10 * ?float32"
+
+    # Both objects share the branch reads and the constituent matching
+    cached = cache_events(events)
+    AngularDistance("Jet0.Constituents:10,Jet1.Constituents:10").read(cached)
+    assert cached.hits[("constituents_to_momentum4d", "Jet.Constituents")] == 3
@@ -0,0 +1,147 @@
+import awkward as ak
+import numpy as np
+import pytest
+
+from hml.observables import parse_observable
+from hml.observables.grooming import (
+    EnergyCorrelation,
+    PrunedMass,
+    SoftDropMass,
+    TrimmedMass,
+)
+
+
+def test_attributes():
+    obs = SoftDropMass(physics_object="FatJet0.Constituents")
+    assert obs.name == "FatJet0.Constituents.SoftDropMass"
+    assert len(obs.value) == 0
+    assert obs.config == {
+        "physics_object": "FatJet0.Constituents",
+        "class_name": "SoftDropMass",
+        "algorithm": "cambridge",
+        "r": 0.8,
+        "chunk_size": 10_000,
+        "n_workers": 1,
+        "beta": 0.0,
+        "z_cut": 0.1,
+    }
+
+    obs = TrimmedMass(physics_object="FatJet:2.Constituents", f_cut=0.05)
+    assert obs.params == {"f_cut": 0.05, "r_trim": 0.2}
+
+    obs = PrunedMass(physics_object="FatJet.Constituents", algorithm="kt")
+    assert obs.config["algorithm"] == "kt"
+
+    # Trimming takes the subjets of the cambridge reclustering
+    with pytest.raises(ValueError):
+        TrimmedMass(physics_object="FatJet0.Constituents", algorithm="kt")
+
+
+def test_class_methods():
+    obs = SoftDropMass(physics_object="FatJet0.Constituents", beta=1.0)
+
+    assert obs == SoftDropMass.from_config(obs.config)
+    assert obs == parse_observable("FatJet0.Constituents.m_sd", beta=1.0)
+    assert obs != SoftDropMass.from_name("FatJet0.Constituents.SoftDropMass")
+
+    # The ratio of energy correlation functions is given by the name
+    obs = parse_observable("FatJet0.Constituents.C2")
+    assert isinstance(obs, EnergyCorrelation)
+    assert obs.ratio == "c2"
+    assert parse_observable("FatJet0.Constituents.ECF").ratio == "d2"
+
+    with pytest.raises(ValueError):
+        SoftDropMass(physics_object="FatJet0")
+
+    with pytest.raises(ValueError):
+        SoftDropMass(physics_object="FatJet0.Constituents:10")
+
+
+def test_read(events):
+    from hml.operations import cache_events, constituents_to_jet_clustering
+
+    events = cache_events(events)
+
+    obs = SoftDropMass("FatJet0.Constituents").read(events)
+    assert str(obs.value.type) == "100 * 1 * ?float64"
+
+    # Groomed masses are not larger than the mass of the whole jet
+    mass = SoftDropMass("FatJet0.Constituents", z_cut=0.0).read(events).value
+    for name in ["m_sd", "TrimmedMass", "PrunedMass"]:
+        groomed = parse_observable(f"FatJet0.Constituents.{name}").read(events).value
+        is_lighter = groomed <= mass * (1 + 1e-6) + 1e-3
+        assert ak.all(ak.fill_none(is_lighter, True))
+
+    obs = parse_observable("FatJet:2.Constituents.D2").read(events)
+    assert obs.shape == (100, 2)
+
+    # All groomers share one reclustering of the constituents
+    key = (
+        "constituents_to_jet_clustering",
+        "FatJet.Constituents, cambridge, 0.8, 10000, 1",
+    )
+    assert events.hits[key] >= 4
+
+    # The same values with the jets reclustered in worker processes
+    obs = SoftDropMass("FatJet:2.Constituents", chunk_size=16, n_workers=2)
+    assert obs == SoftDropMass.from_config(obs.config)
+    in_workers = obs.read(events).value
+    in_process = SoftDropMass("FatJet:2.Constituents").read(events).value
+    assert in_workers.to_list() == in_process.to_list()
+
+    # The workers live with the cached clustering until it is closed
+    branch = "FatJet.Constituents"
+    constituents_to_jet_clustering(events, branch, "cambridge", 0.8, 16, 2).close()
+
+
+def test_jet_clustering():
+    vector = pytest.importorskip("vector")
+    vector.register_awkward()
+
+    from hml.operations import JetClustering
+
+    rng = np.random.default_rng(42)
+    counts = np.array([20, 0, 1, 30, 10])
+    size = counts.sum()
+    constituents = ak.zip(
+        {
+            "pt": rng.exponential(10, size) + 1,
+            "eta": rng.normal(0, 0.3, size),
+            "phi": rng.normal(0, 0.3, size),
+            "mass": np.zeros(size),
+        },
+        with_name="Momentum4D",
+    )
+    constituents = ak.unflatten(ak.unflatten(constituents, counts), [2, 0, 3])
+
+    clustering = JetClustering(constituents, chunk_size=2)
+    assert len(clustering.chunks) == 2
+
+    groomed = clustering.groom("soft_drop")
+    assert str(ak.type(groomed.mass)) == "3 * var * ?float64"
+    assert ak.num(groomed).to_list() == [2, 0, 3]
+    assert groomed[0, 1] is None
+
+    # Without grooming, the jet is its constituents
+    groomed = clustering.groom("soft_drop", z_cut=0.0)
+    mass = ak.mask(ak.sum(constituents, axis=2).mass, ak.num(constituents, axis=2) > 0)
+    np.testing.assert_allclose(
+        ak.flatten(ak.fill_none(groomed.mass, np.nan)),
+        ak.flatten(ak.fill_none(mass, np.nan)),
+        rtol=1e-6,
+        atol=1e-3,
+    )
+
+    with pytest.raises(ValueError):
+        clustering.groom("unknown")
+
+    with pytest.raises(ValueError):
+        JetClustering(constituents, "kt").groom("trimming")
+
+    # Worker processes are opt-in and shut down at the end of the block
+    assert clustering._executors == []
+    with JetClustering(constituents, chunk_size=2, n_workers=2) as in_workers:
+        trimmed = in_workers.groom("trimming")
+        assert len(in_workers._executors) == 2
+    assert in_workers._executors == []
+    assert trimmed.to_list() == clustering.groom("trimming").to_list()
@@ -1,6 +1,7 @@
 import pytest
 
 from hml.observables import InvariantMass
+from hml.operations import cache_events
 
 
 def test_init():
@@ -46,3 +47,8 @@ def test_read(events):
 
     obs = InvariantMass("jet0,jet1,jet100").read(events)
     assert str(obs.value.type) == "100 * 1 * ?float32"
+
+    # The jet momenta are built once for all jets
+    cached = cache_events(events)
+    InvariantMass("jet0,jet1,jet2").read(cached)
+    assert cached.hits[("branch_to_momentum4d", "Jet")] == 0
@@ -3,6 +3,7 @@ import pytest
 
 from hml import physics_objects
 from hml.observables import kinematics
+from hml.operations import branch_to_momentum4d, cache_events
 
 
 def test_init():
@@ -41,6 +42,24 @@ def test_special_methods():
     assert repr(obs) == "jet0.Pt: 0 * unknown"
 
 
+def test_shape_and_dtype():
+    obs = kinematics.Pt(physics_object="jet:")
+    assert obs.shape == (0,)
+    assert obs.dtype == "unknown"
+
+    obs._value = ak.values_astype(ak.Array([[1], [2], [3]]), "float32")
+    value = obs.value
+    assert value is obs.value
+    assert obs.shape == (3, 1)
+    assert obs.dtype == "float32"
+
+    # A new value replaces the cached one
+    obs._value = ak.Array([[1.0, None], [2.0]])
+    assert obs.shape == (2, None)
+    assert obs.dtype == "float64"
+    assert obs.value.to_list() == [[1.0, None], [2.0]]
+
+
 def test_class_methods():
     obs = kinematics.Pt(physics_object="jet0")
 
@@ -65,3 +84,36 @@ def test_read(events):
 
     obs = kinematics.Px(physics_object="jet0").read(events)
     assert str(obs.value.type) == f"{ak.sum(cut)} * 1 * float32"
+
+
+def test_read_partial_branches(events):
+    def read_branches(obs):
+        cached = cache_events(events)
+        obs.read(cached)
+        return {name for kind, name in cached.nodes if kind == "branch"}
+
+    # Components with their own leaves only read them
+    assert read_branches(kinematics.Eta("jet0")) == {"Jet.Eta"}
+    assert read_branches(kinematics.M("jet0")) == {"Jet.Mass"}
+    assert read_branches(kinematics.Pt("jet.constituents")) == {
+        "Jet.Constituents",
+        "EFlowTrack.fUniqueID",
+        "EFlowTrack.PT",
+        "EFlowPhoton.fUniqueID",
+        "EFlowPhoton.ET",
+        "EFlowNeutralHadron.fUniqueID",
+        "EFlowNeutralHadron.ET",
+    }
+
+    # Other kinematics need the four-momentum
+    assert read_branches(kinematics.Px("jet0")) == {
+        "Jet.PT",
+        "Jet.Eta",
+        "Jet.Phi",
+        "Jet.Mass",
+    }
+
+    # The values are those of the four-momentum
+    value = kinematics.M("jet:").read(events).value
+    momenta = branch_to_momentum4d(events, "Jet")
+    assert ak.all(value == momenta.mass)
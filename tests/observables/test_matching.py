@@ -0,0 +1,72 @@
+import awkward as ak
+import numpy as np
+import pytest
+
+from hml.observables import parse_observable
+from hml.observables.angular_distance import AngularDistance
+from hml.observables.matching import IsolationSum, MinDeltaR, OverlapRemoval
+
+
+def test_attributes():
+    obs = MinDeltaR(physics_object="Jet,Electron")
+    assert obs.name == "Jet,Electron.MinDeltaR"
+    assert len(obs.value) == 0
+    assert obs.config == {"physics_object": "Jet,Electron", "class_name": "MinDeltaR"}
+
+    obs = IsolationSum(physics_object="Muon,Jet", r=0.3)
+    assert obs.config == {
+        "physics_object": "Muon,Jet",
+        "class_name": "IsolationSum",
+        "r": 0.3,
+    }
+
+    obs = OverlapRemoval(physics_object="Jet,Electron")
+    assert obs.r == 0.4
+
+
+def test_class_methods():
+    obs = OverlapRemoval(physics_object="Jet,Electron", r=0.2)
+
+    assert obs == OverlapRemoval.from_config(obs.config)
+    assert obs == parse_observable("Jet,Electron.overlap_removal", r=0.2)
+    assert obs != OverlapRemoval.from_name("Jet,Electron.OverlapRemoval")
+    assert isinstance(parse_observable("Jet0,Electron.MinDR"), MinDeltaR)
+
+    for cls in [MinDeltaR, IsolationSum, OverlapRemoval]:
+        with pytest.raises(AssertionError):
+            cls(physics_object="Jet0,Jet1,Jet2")
+
+        with pytest.raises(ValueError):
+            cls(physics_object="Jet0.Constituents,Jet1")
+
+
+def test_read(events):
+    distances = AngularDistance("Jet:3,Electron").read(events).value
+
+    obs = MinDeltaR("Jet:3,Electron").read(events)
+    assert str(obs.value.type) == "100 * 3 * ?float32"
+    np.testing.assert_allclose(
+        ak.to_numpy(ak.fill_none(obs.value, np.nan)),
+        ak.to_numpy(ak.fill_none(ak.min(distances, axis=-1), np.nan)),
+    )
+
+    obs = OverlapRemoval("Jet:3,Electron").read(events)
+    assert str(obs.value.type) == "100 * 3 * ?bool"
+    is_isolated = ak.sum(distances < 0.4, axis=-1) == 0
+    assert ak.all(ak.fill_none(obs.value == is_isolated, True))
+
+    # Objects of the same branch are not matched to themselves
+    distances = AngularDistance("Jet:3,Jet:3").read(events).value
+    rows = ak.local_index(distances, axis=1)[:, :, None]
+    is_other = rows != ak.local_index(distances, axis=2)
+    nearest = ak.min(ak.mask(distances, is_other), axis=-1)
+
+    obs = MinDeltaR("Jet1,Jet:3").read(events)
+    np.testing.assert_allclose(
+        ak.to_numpy(ak.fill_none(obs.value[:, 0], np.nan)),
+        ak.to_numpy(ak.fill_none(nearest[:, 1], np.nan)),
+    )
+
+    obs = IsolationSum("Jet0,Jet").read(events)
+    assert obs.shape == (100, 1)
+    assert ak.all(ak.fill_none(obs.value >= 0, True))
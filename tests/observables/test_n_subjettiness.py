@@ -2,6 +2,7 @@ import awkward as ak
 import pytest
 
 from hml.observables import TauMN, TauN
+from hml.operations import cache_events
 
 
 def test_init():
@@ -12,7 +13,13 @@ def test_init():
 
     assert obs.name == "jet0.TauN"
     assert len(obs.value) == 0
-    assert obs.config == {"n": 1, "physics_object": "jet0", "class_name": "TauN"}
+    assert obs.config == {
+        "n": 1,
+        "beta": None,
+        "r0": None,
+        "physics_object": "jet0",
+        "class_name": "TauN",
+    }
 
     # Other init
     assert TauMN(2, 1, physics_object="jet0").name == "jet0.TauMN"
@@ -26,6 +33,7 @@ def test_class_methods():
 
     assert TauN.from_name("jet0.tau1").name == "jet0.tau1"
     assert TauN.from_config(obs.config).name == "jet0.TauN"
+    assert TauN.from_name("jet0.tau1", beta=2.0).beta == 2.0
 
     obs = TauMN(2, 1, physics_object="jet0")
 
@@ -46,12 +54,32 @@ def test_read(events):
     obs = TauN(n=1, physics_object="fatjet:10").read(events)
     assert str(obs.value.type) == f"{len(obs.value)} * 10 * ?float32"
 
-    with pytest.raises(ValueError):
+    with pytest.raises(ValueError, match="Constituents"):
         TauN(n=1, physics_object="unknown").read(events)
 
+    # Subjets only exist in images, not in the events
+    with pytest.raises(ValueError, match="subjet.Tau"):
+        TauN(n=1, physics_object="subjet0").read(events)
+
     obs = TauMN(m=2, n=1, physics_object="fatjet0").read(events)
     assert ak.all(
         TauN(2, physics_object="fatjet0").read(events).value
         / TauN(1, physics_object="fatjet0").read(events).value
         == obs.value
     )
+
+
+def test_read_from_constituents(events):
+    events = cache_events(events)
+
+    # Computed from the constituents when the parameters differ from Delphes
+    tau1 = TauN(n=1, physics_object="fatjet:2", beta=1.0).read(events)
+    assert str(tau1.value.type) == f"{len(tau1.value)} * 2 * ?float32"
+
+    tau2 = TauN(n=2, physics_object="fatjet:2", beta=1.0).read(events)
+    is_jet = ~ak.is_none(tau1.value, axis=1)
+    assert ak.all(tau2.value[is_jet] <= tau1.value[is_jet])
+
+    # All taus of a jet collection share one clustering
+    node = ("constituents_to_n_subjettiness", "FatJet.Constituents, 5, 1.0, 0.8")
+    assert events.hits[node] == 1
@@ -13,3 +13,22 @@ def test_parse():
 
     with pytest.raises(ValueError):
         parse_observable("unknown_observable")
+
+
+def test_hash():
+    # Observables are identified by class, physics object and extra configs
+    assert parse_observable("Jet0.Pt") == parse_observable("jet0.pt")
+    assert hash(parse_observable("Jet0.Pt")) == hash(parse_observable("jet0.PT"))
+    assert parse_observable("FatJet0.tau1") != parse_observable("FatJet0.tau2")
+    assert parse_observable("FatJet0.tau21") == parse_observable(
+        "FatJet0.TauMN", m=2, n=1
+    )
+
+    observables = [
+        parse_observable("Jet0.Pt"),
+        parse_observable("jet0.pt"),
+        parse_observable("Jet0.Eta"),
+        parse_observable("FatJet0.tau1"),
+        parse_observable("FatJet0.TauN", n=1),
+    ]
+    assert len(set(observables)) == 3
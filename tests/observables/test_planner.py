@@ -0,0 +1,55 @@
+import awkward as ak
+
+from hml.observables import OverlapRemoval, Planner, TauN, parse_observable
+from hml.operations import CachedEvents, cache_events
+
+
+def test_planner(events):
+    observables = [
+        parse_observable(i)
+        for i in ["Jet0.Pt", "Jet1.Pt", "Jet0,Jet1.InvMass", "FatJet0.tau21"]
+    ]
+    planner = Planner([*observables, parse_observable("jet0.pt")]).read(events)
+    plan = planner.plan
+
+    # Branches are read once but used by every observable that needs them
+    assert planner.events.hits[("branch", "Jet.PT")] == 2
+    assert planner.events.hits[("branch", "FatJet.Tau[5]")] == 1
+
+    # Pt only reads its own leaf, the momenta are built for the mass
+    assert plan[("observable", observables[0].key)] == [("branch", "Jet.PT")]
+    assert ("branch", "Jet.PT") in plan[("branch_to_momentum4d", "Jet")]
+    assert len([i for i in plan if i[0] == "observable"]) == 4
+
+    # Values are the same as reading each observable on its own
+    for obs in planner.observables:
+        expected = parse_observable(obs.name).read(events).value
+        assert ak.array_equal(obs.value, expected, equal_nan=True)
+
+    planner.summary()
+
+
+def test_planner_configs(events):
+    # Observables of the same name but different configurations
+    observables = [
+        OverlapRemoval("Jet,Electron", r=0.4),
+        OverlapRemoval("Jet,Electron", r=3.0),
+        TauN(1, "FatJet0"),
+        TauN(1, "FatJet0", beta=2.0),
+    ]
+    planner = Planner(observables).read(events)
+
+    assert len([i for i in planner.plan if i[0] == "observable"]) == 4
+    for obs in observables:
+        expected = obs.from_config(obs.config).read(events).value
+        assert ak.array_equal(obs.value, expected, equal_nan=True)
+
+
+def test_cache_events(events):
+    cached = cache_events(events)
+
+    assert isinstance(cached, CachedEvents)
+    assert cache_events(cached) is cached
+    assert cached["Jet.PT"].array() is cached["Jet.PT"].array()
+    assert cached.keys() == events.keys()
+    assert "Jet.PT" in cached
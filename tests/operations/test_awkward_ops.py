@@ -0,0 +1,223 @@
+import awkward as ak
+import numpy as np
+import pytest
+
+from hml.config import floatx_scope
+from hml.operations import delta_r, knn, n_subjettiness, pad_slices, slice_to_numpy
+
+
+def test_pad_slices():
+    jets = ak.Array([[1.0, 2.0, 3.0], [4.0], []])
+
+    padded = pad_slices(jets[:, 1:2], [slice(1, 2)])
+    assert str(padded.type) == "3 * 1 * ?float64"
+    assert padded.to_list() == [[2.0], [None], [None]]
+
+    padded = pad_slices(jets[:, :2], [slice(None, 2)])
+    assert padded.to_list() == [[1.0, 2.0], [4.0, None], [None, None]]
+
+    # Missing values are kept
+    padded = pad_slices(ak.Array([[1.0, None], [3.0]]), [slice(None, 2)])
+    assert padded.to_list() == [[1.0, None], [3.0, None]]
+
+    # Lists that are long enough or not limited are left as they are
+    padded = pad_slices(jets[:2, :1], [slice(None, 1)])
+    assert str(padded.type) == "2 * var * float64"
+    assert pad_slices(jets, [slice(1, None)]) is jets
+
+    constituents = ak.Array([[[1, 2, 3], [4]], [[5]], []])
+
+    padded = pad_slices(constituents[:, :2, :2], [slice(None, 2), slice(None, 2)])
+    assert str(padded.type) == "3 * 2 * 2 * ?int64"
+    assert padded.to_list() == [
+        [[1, 2], [4, None]],
+        [[5, None], [None, None]],
+        [[None, None], [None, None]],
+    ]
+
+    padded = pad_slices(constituents[:, :2], [slice(None, 2), slice(None, None)])
+    assert str(padded.type) == "3 * 2 * var * int64"
+    assert padded.to_list() == [[[1, 2, 3], [4]], [[5], []], [[], []]]
+
+    # Chunks without any constituent or any jet are padded all the same
+    slices = [slice(None, 2), slice(None, 3)]
+    padded = pad_slices(ak.Array([[[1.0]], []])[1:], slices)
+    assert str(padded.type) == "1 * 2 * 3 * ?float64"
+    assert padded.to_list() == [[[None] * 3] * 2]
+
+    padded = pad_slices(ak.Array([[], []]), slices)
+    assert padded.to_list() == [[[None] * 3] * 2] * 2
+
+    # Missing lists stay missing, the others are padded
+    padded = pad_slices(ak.Array([[None, [1.0]], [None]]), slices)
+    assert str(padded.type) == "2 * 2 * option[3 * ?float64]"
+    assert padded.to_list() == [
+        [None, [1.0, None, None]],
+        [None, [None, None, None]],
+    ]
+
+
+def test_slice_to_numpy():
+    jets = ak.Array([[1.0, 2.0, 3.0], [4.0], []])
+
+    output = slice_to_numpy(jets, slice(1, 3))
+    assert output.dtype == np.float32
+    assert output.flags.c_contiguous
+    np.testing.assert_array_equal(output, [[2, 3], [np.nan, np.nan], [np.nan, np.nan]])
+
+    # Same as slicing and padding with awkward
+    padded = pad_slices(jets[:, :2], [slice(None, 2)])
+    expected = ak.to_numpy(ak.fill_none(padded, np.nan))
+    np.testing.assert_array_equal(slice_to_numpy(jets, slice(None, 2)), expected)
+
+    # Offsets not starting at zero
+    np.testing.assert_array_equal(
+        slice_to_numpy(jets[1:], slice(0, 1)), [[4], [np.nan]]
+    )
+
+    # Missing objects are masked, NaN values are not
+    output = slice_to_numpy(ak.Array([[np.nan], []]), slice(0, 1), masked=True)
+    np.testing.assert_array_equal(output.mask, [[False], [True]])
+    assert ak.to_list(ak.from_numpy(output) != 1) == [[True], [None]]
+
+    # The output follows the float type policy
+    with floatx_scope("float64"):
+        assert slice_to_numpy(jets, slice(0, 1)).dtype == np.float64
+
+    # Only lists of numbers are supported
+    assert slice_to_numpy(ak.Array([[1.0, None], []]), slice(0, 1)) is None
+    assert slice_to_numpy(ak.Array([[{"x": 1}], []]), slice(0, 1)) is None
+
+
+def test_delta_r():
+    eta0 = ak.Array([[0.0, 1.0], [], [0.5]])
+    phi0 = ak.Array([[3.0, 0.0], [], [None]])
+    eta1 = ak.Array([[0.0, 1.0, 5.0], [1.0], []])
+    phi1 = ak.Array([[-3.0, 0.1, 0.0], [0.0], []])
+
+    # The difference in phi is wrapped into [-pi, pi]
+    matrix = delta_r(eta0, phi0, eta1, phi1)
+    assert ak.num(matrix, axis=2).to_list() == [[3, 3], [], [0]]
+    np.testing.assert_allclose(matrix[0, 0, 0], 2 * np.pi - 6, rtol=1e-6)
+    np.testing.assert_allclose(matrix[0, 1], [np.sqrt(10), 0.1, 4], rtol=1e-6)
+
+    nearest = delta_r(eta0, phi0, eta1, phi1, mode="min")
+    np.testing.assert_allclose(
+        ak.flatten(nearest), [2 * np.pi - 6, 0.1, np.nan], rtol=1e-6
+    )
+
+    counts = delta_r(eta0, phi0, eta1, phi1, mode="count", r=0.4)
+    assert counts.to_list() == [[1, 1], [], [0]]
+
+    # A collection in itself
+    nearest = delta_r(eta1, phi1, eta1, phi1, mode="min", exclude_self=True)
+    assert np.isnan(nearest[1, 0])
+    assert delta_r(eta1, phi1, eta1, phi1, "count", r=0.1).to_list() == [
+        [1, 1, 1],
+        [1],
+        [],
+    ]
+
+    with pytest.raises(ValueError):
+        delta_r(eta0, phi0, eta1, phi1, mode="count")
+
+    with pytest.raises(ValueError):
+        delta_r(eta0, phi0, eta1, phi1, mode="sum", r=0.4)
+
+
+def test_delta_r_sum():
+    eta = ak.Array([[0.0, 0.1, 3.0], [0.0]])
+    phi = ak.Array([[0.0, 0.0, 0.0], [0.0]])
+    pt = ak.Array([[10.0, 20.0, 30.0], [40.0]])
+
+    total = delta_r(eta, phi, eta, phi, "sum", 0.4, pt)
+    assert total.to_list() == [[30.0, 30.0, 30.0], [40.0]]
+
+    total = delta_r(eta, phi, eta, phi, "sum", 0.4, pt, exclude_self=True)
+    assert total.to_list() == [[20.0, 10.0, 0.0], [0.0]]
+
+    # The first objects start from the second one of the collection
+    total = delta_r(
+        eta[:, 1:], phi[:, 1:], eta, phi, "sum", 0.4, pt, True, self_offset=1
+    )
+    assert total.to_list() == [[10.0, 0.0], []]
+
+
+def test_knn():
+    eta = ak.Array([[0.0, 1.0, 0.2, 5.0, None], [0.0, 1.0], []])
+    phi = ak.Array([[3.1, 0.0, -3.1, 0.0, 0.0], [0.0, 0.0], []])
+
+    # The difference in phi is wrapped into [-pi, pi]
+    indices = knn(eta, phi, k=2)
+    assert str(indices.type) == "3 * var * 2 * int32"
+    assert indices[0].to_list() == [[2, 1], [2, 0], [0, 1], [1, 2], [4, 4]]
+
+    # Missing neighbours are the object itself
+    assert knn(eta, phi, k=3)[1].to_list() == [[1, 0, 0], [0, 1, 1]]
+
+    # Same as sorting all distances
+    rng = np.random.default_rng(42)
+    counts = np.array([30, 5, 0, 50])
+    eta = ak.unflatten(rng.normal(0, 1, counts.sum()), counts)
+    phi = ak.unflatten(rng.uniform(-np.pi, np.pi, counts.sum()), counts)
+    distances = delta_r(eta, phi, eta, phi)
+    distances = ak.where(
+        ak.local_index(distances, axis=1) == ak.local_index(distances, axis=2),
+        np.inf,
+        distances,
+    )
+    expected = ak.argsort(distances, axis=2, stable=True)[:, :, :4]
+    assert knn(eta, phi, k=4)[[0, 3]].to_list() == expected[[0, 3]].to_list()
+
+
+def test_n_subjettiness():
+    fastjet = pytest.importorskip("fastjet")
+    vector = pytest.importorskip("vector")
+    vector.register_awkward()
+
+    rng = np.random.default_rng(42)
+    counts = np.array([0, 1, 2, 6, 30])
+    size = counts.sum()
+    constituents = ak.zip(
+        {
+            "pt": rng.exponential(10, size) + 1,
+            "eta": rng.normal(0, 0.3, size),
+            "phi": rng.normal(3, 0.3, size),
+            "mass": np.zeros(size),
+        },
+        with_name="Momentum4D",
+    )
+    constituents = ak.unflatten(constituents, counts)
+
+    taus = n_subjettiness(constituents)
+    assert str(taus.type) == "5 * 5 * float64"
+
+    # Jets with at most N constituents have tau_N = 0
+    assert ak.all(taus[:2] == 0)
+    assert taus[2].to_list()[1:] == [0, 0, 0, 0]
+    assert taus[3, 5:].to_list() == []
+    assert ak.all(taus[3:, :-1] >= taus[3:, 1:])
+
+    # Same axes as the exclusive kt jets of FastJet
+    jet = ak.zip({i: getattr(constituents[4], i) for i in ["px", "py", "pz", "E"]})
+    sequence = fastjet.ClusterSequence(
+        jet, fastjet.JetDefinition(fastjet.kt_algorithm, 1000.0)
+    )
+    for n in range(1, 6):
+        axes = sequence.exclusive_jets(n_jets=n)
+        axes = ak.zip(
+            {i: axes[i] for i in ["px", "py", "pz", "E"]}, with_name="Momentum4D"
+        )
+        # Distances in rapidity, which differs from eta for the massive axes
+        particles, axes = constituents[4][:, None], axes[None, :]
+        distances = np.hypot(
+            particles.rapidity - axes.rapidity, particles.deltaphi(axes)
+        )
+        tau = ak.sum(constituents[4].pt * ak.min(distances, axis=1)) / (
+            ak.sum(constituents[4].pt) * 0.8
+        )
+        np.testing.assert_allclose(taus[4, n - 1], tau, rtol=1e-6)
+
+    # Jets of each event are kept together
+    taus = n_subjettiness(ak.unflatten(constituents, [2, 0, 3]), n_max=2, beta=2.0)
+    assert str(taus.type) == "3 * var * 2 * float64"
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+
+from hml.operations.compile import KERNELS
+
+
+def test_compile(tmp_path):
+    output = subprocess.run(
+        [sys.executable, "-m", "hml.operations.compile", "--cache-dir", tmp_path],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    for kernels in KERNELS.values():
+        for name in kernels:
+            assert name in output
+            assert list(tmp_path.glob(f"**/*.{name}-*.nbi"))
+
+    # Workers reuse the compiled kernels through NUMBA_CACHE_DIR
+    code = (
+        "import numpy as np\n"
+        "from hml.representations.image import histogram2d_numba\n"
+        "x = np.array([0.5, 1.5])\n"
+        "histogram2d_numba(x, x, (2, 2), (0.0, 3.0), (0.0, 3.0))\n"
+        "print(sum(histogram2d_numba.stats.cache_hits.values()))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "NUMBA_CACHE_DIR": str(tmp_path)},
+    ).stdout
+
+    assert int(output) == 1
@@ -0,0 +1,48 @@
+import awkward as ak
+
+from hml.operations import (
+    branch_to_component,
+    cache_events,
+    constituents_to_component,
+    constituents_to_momentum4d,
+    find_branch,
+)
+
+
+def test_find_branch(events):
+    assert find_branch(events, "jet") == "Jet"
+    assert find_branch(events, "jet_size") == "Jet_size"
+    assert find_branch(events, "jet.pt") == "Jet.PT"
+    assert find_branch(events, "FATJET.tau[5]") == "FatJet.Tau[5]"
+    assert find_branch(events, "jet.constituents") == "Jet.Constituents"
+
+    assert find_branch(events, "jets") is None
+    assert find_branch(events, "jet.et") is None
+
+
+def test_branch_to_component(events):
+    assert ak.all(branch_to_component(events, "Jet", "pt") == events["Jet.PT"].array())
+    assert ak.all(
+        branch_to_component(events, "EFlowPhoton", "pt")
+        == events["EFlowPhoton.ET"].array()
+    )
+
+    # Branches without Mass are massless
+    mass = branch_to_component(events, "EFlowPhoton", "mass")
+    assert ak.all(ak.num(mass) == ak.num(events["EFlowPhoton.Eta"].array()))
+    assert ak.all(ak.flatten(mass) == 0)
+
+
+def test_constituents_to_component(events):
+    cached = cache_events(events)
+    momenta = constituents_to_momentum4d(cached, "FatJet.Constituents")
+
+    for component in ["pt", "eta", "phi", "mass"]:
+        values = constituents_to_component(cached, "FatJet.Constituents", component)
+        assert str(values.type) == str(momenta[component].type)
+        assert ak.all(
+            ak.flatten(values, axis=None) == ak.flatten(momenta[component], axis=None)
+        )
+
+    # The matching of constituents is shared by the components
+    assert cached.hits[("constituents_to_indices", "FatJet.Constituents")] == 3
@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 from hml.physics_objects import (
@@ -35,3 +37,37 @@ def test_parse(
 
     with pytest.raises(ValueError):
         parse_physics_object("jet0_jet1")
+
+
+def test_parse_cache(multiple_names):
+    # The same name is only parsed once and gives the same hashable object
+    for case in multiple_names:
+        assert parse_physics_object(case) is parse_physics_object(case)
+
+    objects = {parse_physics_object("jet0"): 0, parse_physics_object("Jet0"): 1}
+    assert objects == {Single("jet", 0): 1}
+    assert len({parse_physics_object(i) for i in ["jet:3", "jet:3", "jet1:3"]}) == 2
+
+    with pytest.raises(AttributeError):
+        parse_physics_object("jet0").extra = 1
+
+    for case in ["", "jet0.", "jet0,", "jet0..constituents", "jet.jet.jet", "0jet"]:
+        with pytest.raises(ValueError):
+            parse_physics_object(case)
+
+
+def test_immutable(single_names, collective_names, nested_names, multiple_names):
+    for case in single_names + collective_names + nested_names + multiple_names:
+        obj = parse_physics_object(case)
+        assert pickle.loads(pickle.dumps(obj)) == obj
+
+        with pytest.raises(AttributeError):
+            obj._branch = "muon"
+
+        with pytest.raises(AttributeError):
+            del obj._name
+
+    obj = parse_physics_object("jet0,jet1")
+    obj.all.append(Single("jet", 2))
+    assert obj.name == "jet0,jet1"
+    assert obj != 0
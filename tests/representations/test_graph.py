@@ -0,0 +1,70 @@
+import awkward as ak
+import numpy as np
+import pytest
+
+from hml.observables import parse_observable
+from hml.representations import Graph
+
+FEATURES = [
+    "FatJet0.Constituents.Pt",
+    "FatJet0.Constituents.Eta",
+    "FatJet0.Constituents.Phi",
+]
+
+
+def test_init():
+    r = Graph(FEATURES, max_particles=50, k=8)
+
+    # Attributes ------------------------------------------------------------- #
+    assert r.observables == [parse_observable(i) for i in FEATURES]
+    assert r.names == FEATURES
+    assert r.physics_object == parse_observable(FEATURES[0]).physics_object
+    assert r.values is None
+    assert r.masks is None
+    assert r.edges is None
+    assert r.config["max_particles"] == 50
+    assert r.config["k"] == 8
+    assert r.config["observable_configs"][0] == {
+        "class_name": "Pt",
+        "config": {"physics_object": "FatJet0.Constituents", "class_name": "Pt"},
+    }
+
+    assert Graph.from_config(r.config).config == r.config
+
+    # Error cases ------------------------------------------------------------ #
+    with pytest.raises(ValueError):
+        Graph(["FatJet0.Constituents.Pt", "Jet.Eta"])
+
+
+def test_read(events):
+    r = Graph(FEATURES, max_particles=50, k=8).read(events)
+
+    assert r.values.shape == (100, 50, 3)
+    assert r.values.dtype == np.float32
+    assert r.masks.shape == (100, 50)
+    assert r.edges.shape == (100, 50, 8)
+    assert r.edges.dtype == np.int32
+
+    # Padded particles have zero features and are their own neighbours
+    assert np.all(r.values[~r.masks] == 0)
+    own = np.broadcast_to(np.arange(50)[None, :, None], r.edges.shape)
+    assert np.all(r.edges[~r.masks] == own[~r.masks])
+
+    # Particles are truncated by decreasing pt, not in the order of the branch
+    pt = parse_observable("FatJet0.Constituents.Pt").read(events).value[:, 0]
+    pt = ak.fill_none(pt, [], axis=0)
+    assert not ak.all(ak.sort(pt, ascending=False) == pt)
+
+    r = Graph(FEATURES, max_particles=5, k=2).read(events)
+    hardest = ak.pad_none(ak.sort(pt, ascending=False)[:, :5], 5, clip=True)
+    expected = ak.to_numpy(ak.fill_none(hardest, 0.0))
+    np.testing.assert_array_equal(r.values[:, :, 0], expected)
+
+    # Without edges
+    r = Graph(["Jet.Pt", "Jet.Eta"], max_particles=4).read(events)
+    assert r.values.shape == (100, 4, 2)
+    assert r.edges is None
+
+    # Constituents of more than one jet are not a point cloud
+    with pytest.raises(ValueError):
+        Graph(["FatJet.Constituents.Pt"]).read(events)
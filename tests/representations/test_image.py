@@ -212,3 +212,15 @@ def test_values(events):
         .pixelate(size=(33, 33), range=[(-1.6, 1.6), (-1.6, 1.6)])
     )
     assert r.values.shape[1:] == (33, 33)
+
+    # float16 images are filled by chunks, the same as cast float32 images
+    from hml import config
+    from hml.representations import image
+
+    images = r.values
+    with config.floatx_scope("float16"), pytest.MonkeyPatch.context() as m:
+        m.setattr(image, "FLOAT16_CHUNK_SIZE", 7)
+        half = r.values
+
+    assert half.dtype == np.float16
+    np.testing.assert_array_equal(half, images.astype(np.float16))
@@ -34,6 +34,8 @@ def test_init():
                     "physics_object": "FatJet0",
                     "m": 2,
                     "n": 1,
+                    "beta": None,
+                    "r0": None,
                 },
             },
             2: {
@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+
+from hml import config
+
+
+def test_floatx():
+    assert config.floatx() == "float32"
+
+    config.set_floatx("float64")
+    assert config.floatx() == "float64"
+    config.set_floatx("float32")
+
+    with pytest.raises(ValueError):
+        config.set_floatx("int32")
+
+
+def test_floatx_scope():
+    with config.floatx_scope("float16"):
+        assert config.floatx() == "float16"
+
+        # Other threads keep the default float type
+        result = []
+        thread = threading.Thread(target=lambda: result.append(config.floatx()))
+        thread.start()
+        thread.join()
+        assert result == ["float32"]
+
+        with config.floatx_scope("float64"):
+            assert config.floatx() == "float64"
+
+        assert config.floatx() == "float16"
+
+    assert config.floatx() == "float32"
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["fastjet", "keras", "matplotlib", "pandas", "seaborn", "sklearn"]
+
+
+def import_in_subprocess(statement):
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"print(elapsed, *[i for i in {HEAVY_MODULES!r} if i in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    return float(output[0]), output[1:]
+
+
+@pytest.mark.parametrize(
+    "statement, budget",
+    [
+        ("import hml", 0.5),
+        ("import hml.generators", 2),
+        ("import hml.observables", 5),
+        ("import hml.datasets", 0.5),
+        ("from hml.datasets import ImageDataset, SetDataset", 5),
+    ],
+)
+def test_import_time(statement, budget):
+    # Warm up the bytecode and numba caches so only the import itself is timed
+    import_in_subprocess(statement)
+    elapsed, heavy_modules = import_in_subprocess(statement)
+
+    assert heavy_modules == []
+    assert elapsed < budget
+
+
+def test_lazy_attributes():
+    import hml
+
+    assert "observables" in dir(hml)
+    assert hml.physics_objects.__name__ == "hml.physics_objects"
+    assert callable(hml.operations.branch_to_momentum4d)
+
+    with pytest.raises(AttributeError):
+        hml.unknown  # noqa: B018
+
+    with pytest.raises(AttributeError):
+        hml.operations.unknown  # noqa: B018
+
+    assert hml.datasets.SetDataset.__module__ == "hml.datasets.set_dataset"
+    with pytest.raises(AttributeError):
+        hml.datasets.unknown  # noqa: B018